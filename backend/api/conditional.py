@@ -0,0 +1,42 @@
+import hashlib
+
+from fastapi.responses import Response
+
+from backend.api.fast_json import EncodedJSONResponse
+
+# Clients may store tagged responses but must revalidate them on every use;
+# data behind authentication must not be stored by shared caches.
+PUBLIC_REVALIDATE = "no-cache"
+PRIVATE_REVALIDATE = "private, no-cache"
+
+
+def make_etag(*parts: object) -> str:
+    return '"' + "-".join(str(part) for part in parts) + '"'
+
+
+def query_digest(query: str) -> str:
+    return hashlib.blake2b(query.encode(), digest_size=8).hexdigest()
+
+
+def etag_matches(if_none_match: str | None, etag: str) -> bool:
+    # If-None-Match uses the weak comparison, so a W/ prefix still matches.
+    if if_none_match is None:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    return any(
+        candidate.strip().removeprefix("W/") == etag
+        for candidate in if_none_match.split(",")
+    )
+
+
+def not_modified(etag: str, cache_control: str) -> Response:
+    return Response(
+        status_code=304, headers={"ETag": etag, "Cache-Control": cache_control}
+    )
+
+
+def tagged_json(content: bytes, etag: str, cache_control: str) -> EncodedJSONResponse:
+    return EncodedJSONResponse(
+        content, headers={"ETag": etag, "Cache-Control": cache_control}
+    )
@@ -1,72 +1,297 @@
-from fastapi import APIRouter, Depends, HTTPException
+from datetime import date, datetime
+
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, Request
+from fastapi.responses import Response, StreamingResponse
+
+from backend.api.conditional import (
+    PRIVATE_REVALIDATE,
+    etag_matches,
+    make_etag,
+    not_modified,
+    query_digest,
+    tagged_json,
+)
 
 from backend.api.dependencies.auth_dependency import CurrentUser, RoleRequired
-from backend.business.services.appointment_service import AppointmentService
+from backend.api.dependencies.rate_limit import (
+    ROUTE_LIMITS,
+    AdmissionControl,
+    database_writes_overloaded,
+)
+from backend.api.fast_json import (
+    EncodedJSONResponse,
+    encode_appointment,
+    encode_appointment_page,
+)
+from backend.api.responses import PydanticJSONRoute
+from backend.business.services.appointment_service import (
+    DEFAULT_PAGE_SIZE,
+    MAX_PAGE_SIZE,
+    AppointmentService,
+)
+from backend.business.services.change_service import (
+    CHANGES_DEFAULT_PAGE_SIZE,
+    CHANGES_MAX_PAGE_SIZE,
+    ChangeService,
+)
+from backend.data_access.exceptions import (
+    BookingConflictError,
+    IdempotencyKeyMismatchError,
+)
 from backend.models.dtos.appointment_dto import (
+    AppointmentFilter,
+    AppointmentPageResponse,
     AppointmentResponse,
+    AppointmentStatsResponse,
+    BatchStatusUpdateRequest,
+    BatchStatusUpdateResponse,
+    BulkCreateAppointmentsRequest,
+    BulkCreateAppointmentsResponse,
     CreateAppointmentRequest,
     UpdateAppointmentRequest,
 )
+from backend.models.dtos.change_dto import ChangeFeedResponse
+from backend.models.enums.appointment_status import AppointmentStatus
+from backend.models.enums.export_format import ExportFormat
 from backend.models.enums.role import Role
 
-router = APIRouter(prefix="/api/appointments", tags=["Appointments"])
+router = APIRouter(
+    prefix="/api/appointments", tags=["Appointments"], route_class=PydanticJSONRoute
+)
 
 _service = AppointmentService()
+_change_service = ChangeService()
 
 _admin_only = RoleRequired(Role.ADMIN)
 _admin_or_company = RoleRequired(Role.ADMIN, Role.COMPANY)
+_booking_admission = AdmissionControl(
+    "create_appointment",
+    ROUTE_LIMITS["create_appointment"],
+    database_writes_overloaded,
+)
+
+_EXPORT_MEDIA_TYPES = {
+    ExportFormat.NDJSON: "application/x-ndjson",
+    ExportFormat.CSV: "text/csv",
+}
 
 
 @router.post("/", response_model=AppointmentResponse, status_code=201)
-def create_appointment(
+async def create_appointment(
     request: CreateAppointmentRequest,
+    idempotency_key: str | None = Header(default=None, alias="Idempotency-Key"),
+    admission: AdmissionControl = Depends(_booking_admission),
 ) -> AppointmentResponse:
+    admission.check_company(request.company_id)
     try:
-        return _service.create_appointment(request)
+        return await _service.create_appointment(request, idempotency_key)
+    except BookingConflictError as e:
+        raise HTTPException(status_code=409, detail=str(e))
+    except IdempotencyKeyMismatchError as e:
+        raise HTTPException(status_code=422, detail=str(e))
     except ValueError as e:
         raise HTTPException(status_code=400, detail=str(e))
 
 
-@router.get("/", response_model=list[AppointmentResponse])
-def get_all_appointments(
+@router.post("/bulk", response_model=BulkCreateAppointmentsResponse)
+async def create_appointments_bulk(
+    request: BulkCreateAppointmentsRequest,
     current_user: CurrentUser = Depends(_admin_or_company),
-) -> list[AppointmentResponse]:
+) -> BulkCreateAppointmentsResponse:
     if current_user.role == Role.ADMIN:
-        return _service.get_all_appointments()
-    return _service.get_all_appointments(company_id=current_user.company_id)
+        return await _service.create_appointments_bulk(request.items)
+    return await _service.create_appointments_bulk(
+        request.items, company_id=current_user.company_id
+    )
+
+
+@router.post("/status", response_model=BatchStatusUpdateResponse)
+async def update_appointment_statuses(
+    request: BatchStatusUpdateRequest,
+    current_user: CurrentUser = Depends(_admin_or_company),
+) -> BatchStatusUpdateResponse:
+    try:
+        if current_user.role == Role.ADMIN:
+            return await _service.update_status_batch(request)
+        return await _service.update_status_batch(
+            request, company_id=current_user.company_id
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+
+@router.get("/", response_model=AppointmentPageResponse)
+async def get_all_appointments(
+    request: Request,
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    cursor: str | None = None,
+    date_from: datetime | None = None,
+    date_to: datetime | None = None,
+    status: AppointmentStatus | None = None,
+    offering_id: int | None = None,
+    customer_email: str | None = None,
+    if_none_match: str | None = Header(default=None),
+    current_user: CurrentUser = Depends(_admin_or_company),
+) -> Response:
+    # Only company-scoped pages are tagged: an admin listing spans every
+    # company and has no single version to tag it with.
+    etag = None
+    if current_user.role != Role.ADMIN:
+        version = await _service.get_appointments_version(current_user.company_id)
+        etag = make_etag(
+            "appointments",
+            current_user.company_id,
+            version,
+            query_digest(request.url.query),
+        )
+        if etag_matches(if_none_match, etag):
+            return not_modified(etag, PRIVATE_REVALIDATE)
+    filters = AppointmentFilter(
+        company_id=None if current_user.role == Role.ADMIN else current_user.company_id,
+        offering_id=offering_id,
+        status=status,
+        customer_email=customer_email,
+        date_from=date_from,
+        date_to=date_to,
+    )
+    try:
+        rows, next_cursor = await _service.list_appointment_rows(
+            filters, limit=limit, cursor=cursor
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    content = encode_appointment_page(rows, next_cursor)
+    if etag is None:
+        return EncodedJSONResponse(content)
+    return tagged_json(content, etag, PRIVATE_REVALIDATE)
+
+
+@router.get("/export")
+async def export_appointments(
+    export_format: ExportFormat = Query(ExportFormat.NDJSON, alias="format"),
+    date_from: datetime | None = None,
+    date_to: datetime | None = None,
+    status: AppointmentStatus | None = None,
+    offering_id: int | None = None,
+    customer_email: str | None = None,
+    current_user: CurrentUser = Depends(_admin_or_company),
+) -> StreamingResponse:
+    filters = AppointmentFilter(
+        company_id=None if current_user.role == Role.ADMIN else current_user.company_id,
+        offering_id=offering_id,
+        status=status,
+        customer_email=customer_email,
+        date_from=date_from,
+        date_to=date_to,
+    )
+    return StreamingResponse(
+        _service.export_appointments(filters, export_format),
+        media_type=_EXPORT_MEDIA_TYPES[export_format],
+        headers={
+            "Content-Disposition": f'attachment; filename="appointments.{export_format.value}"'
+        },
+    )
+
+
+@router.get("/stats", response_model=AppointmentStatsResponse)
+async def get_appointment_stats(
+    date_from: date | None = None,
+    date_to: date | None = None,
+    offering_id: int | None = None,
+    company_id: int | None = None,
+    current_user: CurrentUser = Depends(_admin_or_company),
+) -> AppointmentStatsResponse:
+    if current_user.role != Role.ADMIN:
+        company_id = current_user.company_id
+    try:
+        return await _service.get_appointment_stats(
+            company_id, offering_id, date_from, date_to
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+
+def _change_feed_company(current_user: CurrentUser, company_id: int | None) -> int:
+    if current_user.role != Role.ADMIN:
+        return current_user.company_id
+    if company_id is None:
+        raise HTTPException(status_code=400, detail="company_id is required")
+    return company_id
+
+
+@router.get("/changes", response_model=ChangeFeedResponse)
+async def get_changes(
+    since: int = Query(0, ge=0),
+    limit: int = Query(CHANGES_DEFAULT_PAGE_SIZE, ge=1, le=CHANGES_MAX_PAGE_SIZE),
+    company_id: int | None = None,
+    current_user: CurrentUser = Depends(_admin_or_company),
+) -> ChangeFeedResponse:
+    return await _change_service.list_changes(
+        _change_feed_company(current_user, company_id), since, limit
+    )
+
+
+@router.get("/changes/stream")
+async def stream_changes(
+    since: int | None = Query(None, ge=0),
+    company_id: int | None = None,
+    last_event_id: str | None = Header(default=None, alias="Last-Event-ID"),
+    current_user: CurrentUser = Depends(_admin_or_company),
+) -> StreamingResponse:
+    company_id = _change_feed_company(current_user, company_id)
+    # Browsers resend the last seen id when an EventSource reconnects.
+    if since is None and last_event_id is not None:
+        if not last_event_id.isdigit():
+            raise HTTPException(status_code=400, detail="Invalid Last-Event-ID")
+        since = int(last_event_id)
+    return StreamingResponse(
+        _change_service.stream_changes(company_id, since),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
 
 
 @router.get("/{appointment_id}", response_model=AppointmentResponse)
-def get_appointment(
+async def get_appointment(
     appointment_id: int,
+    if_none_match: str | None = Header(default=None),
     current_user: CurrentUser = Depends(_admin_or_company),
-) -> AppointmentResponse:
-    if current_user.role == Role.ADMIN:
-        appointment = _service.get_appointment(appointment_id)
-    else:
-        appointment = _service.get_appointment(
-            appointment_id, company_id=current_user.company_id
-        )
-    if appointment is None:
+) -> Response:
+    company_id = None if current_user.role == Role.ADMIN else current_user.company_id
+    if if_none_match is not None:
+        version = await _service.get_appointment_version(appointment_id, company_id)
+        if version is None:
+            raise HTTPException(status_code=404, detail="Appointment not found")
+        etag = make_etag("appointment", appointment_id, version)
+        if etag_matches(if_none_match, etag):
+            return not_modified(etag, PRIVATE_REVALIDATE)
+    row = await _service.get_appointment_row(appointment_id, company_id=company_id)
+    if row is None:
         raise HTTPException(status_code=404, detail="Appointment not found")
-    return appointment
+    return tagged_json(
+        encode_appointment(row),
+        make_etag("appointment", row.id, row.version),
+        PRIVATE_REVALIDATE,
+    )
 
 
 @router.put("/{appointment_id}", response_model=AppointmentResponse)
-def update_appointment(
+async def update_appointment(
     appointment_id: int,
     request: UpdateAppointmentRequest,
     current_user: CurrentUser = Depends(_admin_or_company),
 ) -> AppointmentResponse:
     try:
         if current_user.role == Role.ADMIN:
-            appointment = _service.update_appointment(appointment_id, request)
+            appointment = await _service.update_appointment(appointment_id, request)
         else:
-            appointment = _service.update_appointment(
+            appointment = await _service.update_appointment(
                 appointment_id, request, company_id=current_user.company_id
             )
         if appointment is None:
             raise HTTPException(status_code=404, detail="Appointment not found")
         return appointment
+    except BookingConflictError as e:
+        raise HTTPException(status_code=409, detail=str(e))
     except ValueError as e:
         raise HTTPException(status_code=400, detail=str(e))
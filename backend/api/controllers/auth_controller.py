@@ -1,12 +1,20 @@
 from fastapi import APIRouter, Depends, HTTPException
+from fastapi.responses import Response
 
 from backend.api.dependencies.auth_dependency import (
     CurrentUser,
     RoleRequired,
     get_current_user,
 )
+from backend.api.dependencies.rate_limit import (
+    ROUTE_LIMITS,
+    AdmissionControl,
+    password_hashing_overloaded,
+)
+from backend.api.fast_json import EncodedJSONResponse, encode_user
+from backend.api.responses import PydanticJSONRoute
 from backend.business.services.auth_service import AuthService
-from backend.data_access.repositories.user_repository import UserRepository
+from backend.data_access.repositories.async_user_repository import AsyncUserRepository
 from backend.models.dtos.auth_dto import (
     LoginRequest,
     RegisterRequest,
@@ -15,44 +23,47 @@ from backend.models.dtos.auth_dto import (
 )
 from backend.models.enums.role import Role
 
-router = APIRouter(prefix="/api/auth", tags=["Authentication"])
+router = APIRouter(
+    prefix="/api/auth", tags=["Authentication"], route_class=PydanticJSONRoute
+)
 
 _service = AuthService()
-_user_repository = UserRepository()
+_user_repository = AsyncUserRepository()
 _admin_only = RoleRequired(Role.ADMIN)
+_login_admission = AdmissionControl(
+    "login", ROUTE_LIMITS["login"], password_hashing_overloaded
+)
 
 
 @router.post("/register", response_model=UserResponse, status_code=201)
-def register(
+async def register(
     request: RegisterRequest,
     current_user: CurrentUser = Depends(_admin_only),
 ) -> UserResponse:
     try:
-        return _service.register(request)
+        return await _service.register(request)
     except ValueError as e:
         raise HTTPException(status_code=400, detail=str(e))
 
 
 @router.post("/login", response_model=TokenResponse)
-def login(request: LoginRequest) -> TokenResponse:
+async def login(
+    request: LoginRequest,
+    admission: AdmissionControl = Depends(_login_admission),
+) -> TokenResponse:
+    admission.check_username(request.username)
     try:
-        return _service.login(request)
+        return await _service.login(request)
     except ValueError as e:
+        admission.charge_username(request.username)
         raise HTTPException(status_code=401, detail=str(e))
 
 
 @router.get("/me", response_model=UserResponse)
-def get_current_user_info(
+async def get_current_user_info(
     current_user: CurrentUser = Depends(get_current_user),
-) -> UserResponse:
-    user = _user_repository.get_by_id(current_user.id)
-    if user is None:
+) -> Response:
+    row = await _user_repository.get_row_by_id(current_user.id)
+    if row is None:
         raise HTTPException(status_code=404, detail="User not found")
-    return UserResponse(
-        id=user.id,
-        username=user.username,
-        email=user.email,
-        role=user.role,
-        company_id=user.company_id,
-        created_date=user.created_date,
-    )
+    return EncodedJSONResponse(encode_user(row))
@@ -0,0 +1,31 @@
+from fastapi import APIRouter
+from fastapi.responses import PlainTextResponse
+
+from backend.business.security.password_hasher import password_hasher
+from backend.business.security.token_cache import verified_tokens
+from backend.data_access.booking_commit_queue import booking_commits
+from backend.data_access.change_notifier import change_notifier
+from backend.data_access.db_context import get_reader_pool, get_writer
+from backend.data_access.db_executor import db_executor
+from backend.data_access.idempotency_cache import idempotency_cache
+from backend.data_access.offering_cache import offering_cache
+from backend.instrumentation.metrics import registry
+
+router = APIRouter(tags=["Monitoring"])
+
+registry.register_stats("sqlite_reader_pool", "Reader connection pool", lambda: get_reader_pool().stats())
+registry.register_stats("sqlite_writer", "Single writer connection", lambda: get_writer().stats())
+registry.register_stats("db_executor", "Database executor threads", db_executor.stats)
+registry.register_stats("booking_commits", "Group-commit booking queue", booking_commits.stats)
+registry.register_stats("password_hasher", "bcrypt thread pool", password_hasher.stats)
+registry.register_stats("token_cache", "Verified JWT cache", verified_tokens.stats)
+registry.register_stats("offering_cache", "Offering cache", offering_cache.stats)
+registry.register_stats("idempotency_cache", "Idempotency-Key front cache", idempotency_cache.stats)
+registry.register_stats("change_notifier", "Change feed stream subscriptions", change_notifier.stats)
+
+
+@router.get("/metrics", response_class=PlainTextResponse, include_in_schema=False)
+async def metrics() -> PlainTextResponse:
+    return PlainTextResponse(
+        registry.render(), media_type="text/plain; version=0.0.4; charset=utf-8"
+    )
@@ -1,15 +1,31 @@
-from fastapi import APIRouter, Depends, HTTPException
+from datetime import datetime
 
+from fastapi import APIRouter, Depends, Header, HTTPException, Query
+from fastapi.responses import Response
+
+from backend.api.conditional import (
+    PRIVATE_REVALIDATE,
+    PUBLIC_REVALIDATE,
+    etag_matches,
+    make_etag,
+    not_modified,
+    tagged_json,
+)
 from backend.api.dependencies.auth_dependency import CurrentUser, RoleRequired
+from backend.api.fast_json import encode_offering, encode_offerings
+from backend.api.responses import PydanticJSONRoute
 from backend.business.services.offering_service import OfferingService
 from backend.models.dtos.offering_dto import (
+    AvailabilityResponse,
     CreateOfferingRequest,
     OfferingResponse,
     UpdateOfferingRequest,
 )
 from backend.models.enums.role import Role
 
-router = APIRouter(prefix="/api/offerings", tags=["Offerings"])
+router = APIRouter(
+    prefix="/api/offerings", tags=["Offerings"], route_class=PydanticJSONRoute
+)
 
 _service = OfferingService()
 
@@ -17,12 +33,12 @@ _admin_or_company = RoleRequired(Role.ADMIN, Role.COMPANY)
 
 
 @router.post("/", response_model=OfferingResponse, status_code=201)
-def create_offering(
+async def create_offering(
     request: CreateOfferingRequest,
     current_user: CurrentUser = Depends(_admin_or_company),
 ) -> OfferingResponse:
     if current_user.role == Role.COMPANY:
-        return _service.create_offering(request, company_id=current_user.company_id)
+        return await _service.create_offering(request, company_id=current_user.company_id)
     raise HTTPException(
         status_code=400,
         detail="Admin cannot create offerings without a company context. Use a company account.",
@@ -30,18 +46,53 @@ def create_offering(
 
 
 @router.get("/company/{company_id}", response_model=list[OfferingResponse])
-def get_open_offerings_for_company(
+async def get_open_offerings_for_company(
     company_id: int,
-) -> list[OfferingResponse]:
-    return _service.get_open_offerings_by_company(company_id)
+    if_none_match: str | None = Header(default=None),
+) -> Response:
+    # The version is read before the rows, so the tag is never newer than
+    # the data sent with it.
+    etag = make_etag(
+        "offerings-open", company_id, await _service.get_offerings_version(company_id)
+    )
+    if etag_matches(if_none_match, etag):
+        return not_modified(etag, PUBLIC_REVALIDATE)
+    offerings = await _service.list_open_company_offerings(company_id)
+    return tagged_json(encode_offerings(offerings), etag, PUBLIC_REVALIDATE)
+
+
+@router.get("/{offering_id}/availability", response_model=AvailabilityResponse)
+async def get_offering_availability(
+    offering_id: int,
+    date_from: datetime = Query(alias="from"),
+    date_to: datetime = Query(alias="to"),
+    slot: int = Query(60, ge=1, description="Slot length in minutes"),
+) -> AvailabilityResponse:
+    try:
+        availability = await _service.get_availability(
+            offering_id, date_from, date_to, slot
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    if availability is None:
+        raise HTTPException(status_code=404, detail="Offering not found")
+    return availability
 
 
 @router.get("/", response_model=list[OfferingResponse])
-def get_my_offerings(
+async def get_my_offerings(
+    if_none_match: str | None = Header(default=None),
     current_user: CurrentUser = Depends(_admin_or_company),
-) -> list[OfferingResponse]:
+) -> Response:
     if current_user.role == Role.COMPANY:
-        return _service.get_offerings_by_company(current_user.company_id)
+        company_id = current_user.company_id
+        etag = make_etag(
+            "offerings", company_id, await _service.get_offerings_version(company_id)
+        )
+        if etag_matches(if_none_match, etag):
+            return not_modified(etag, PRIVATE_REVALIDATE)
+        offerings = await _service.list_company_offerings(company_id)
+        return tagged_json(encode_offerings(offerings), etag, PRIVATE_REVALIDATE)
     raise HTTPException(
         status_code=400,
         detail="Use GET /api/offerings/company/{company_id} to view a specific company's offerings.",
@@ -49,31 +100,35 @@ def get_my_offerings(
 
 
 @router.get("/{offering_id}", response_model=OfferingResponse)
-def get_offering(
+async def get_offering(
     offering_id: int,
+    if_none_match: str | None = Header(default=None),
     current_user: CurrentUser = Depends(_admin_or_company),
-) -> OfferingResponse:
+) -> Response:
     if current_user.role == Role.ADMIN:
-        offering = _service.get_offering(offering_id)
+        offering = await _service.find_offering(offering_id)
     else:
-        offering = _service.get_offering(
+        offering = await _service.find_offering(
             offering_id, company_id=current_user.company_id
         )
     if offering is None:
         raise HTTPException(status_code=404, detail="Offering not found")
-    return offering
+    etag = make_etag("offering", offering.id, offering.version)
+    if etag_matches(if_none_match, etag):
+        return not_modified(etag, PRIVATE_REVALIDATE)
+    return tagged_json(encode_offering(offering), etag, PRIVATE_REVALIDATE)
 
 
 @router.put("/{offering_id}", response_model=OfferingResponse)
-def update_offering(
+async def update_offering(
     offering_id: int,
     request: UpdateOfferingRequest,
     current_user: CurrentUser = Depends(_admin_or_company),
 ) -> OfferingResponse:
     if current_user.role == Role.ADMIN:
-        offering = _service.update_offering(offering_id, request)
+        offering = await _service.update_offering(offering_id, request)
     else:
-        offering = _service.update_offering(
+        offering = await _service.update_offering(
             offering_id, request, company_id=current_user.company_id
         )
     if offering is None:
@@ -3,6 +3,7 @@ from dataclasses import dataclass
 from fastapi import Depends, HTTPException, status
 from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer
 
+from backend.business.security.token_cache import verified_tokens
 from backend.business.services.auth_service import AuthService
 from backend.models.enums.role import Role
 
@@ -10,7 +11,7 @@ _bearer_scheme = HTTPBearer()
 _auth_service = AuthService()
 
 
-@dataclass
+@dataclass(frozen=True)
 class CurrentUser:
     id: int
     username: str
@@ -18,29 +19,37 @@ class CurrentUser:
     company_id: int | None
 
 
-def get_current_user(
+async def get_current_user(
     credentials: HTTPAuthorizationCredentials = Depends(_bearer_scheme),
 ) -> CurrentUser:
+    token = credentials.credentials
+    cached = verified_tokens.get(token)
+    if cached is not None:
+        return cached
+
     try:
-        payload = _auth_service.decode_token(credentials.credentials)
-        return CurrentUser(
+        payload = _auth_service.decode_token(token)
+        current_user = CurrentUser(
             id=int(payload["sub"]),
             username=payload["username"],
             role=Role(payload["role"]),
             company_id=payload.get("company_id"),
         )
+        expires_at = payload["exp"]
     except Exception:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Invalid or expired token",
         )
+    verified_tokens.put(token, current_user, expires_at)
+    return current_user
 
 
 class RoleRequired:
     def __init__(self, *allowed_roles: Role) -> None:
         self._allowed_roles = allowed_roles
 
-    def __call__(
+    async def __call__(
         self, current_user: CurrentUser = Depends(get_current_user)
     ) -> CurrentUser:
         if current_user.role not in self._allowed_roles:
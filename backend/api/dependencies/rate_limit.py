@@ -0,0 +1,194 @@
+import math
+import os
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import AsyncIterator, Callable
+
+from fastapi import HTTPException, Request, status
+
+from backend.business.security.password_hasher import password_hasher
+from backend.data_access.booking_commit_queue import booking_commits
+from backend.data_access.db_executor import db_executor
+from backend.instrumentation.metrics import rejected_requests
+
+# Read once at startup; RATE_LIMITING=off serves benchmark servers, which
+# send every request from a single client address.
+RATE_LIMITING_ENABLED = os.environ.get("RATE_LIMITING", "on").lower() not in (
+    "0",
+    "off",
+    "false",
+)
+BUCKET_KEYS_LIMIT = 100_000
+SHED_RETRY_AFTER_SECONDS = 1
+
+# Shed load before queues grow into timeouts: login waits on the bcrypt pool,
+# bookings on the group-commit queue and the database write lanes.
+PASSWORD_HASH_QUEUE_LIMIT = 64
+DB_WRITE_QUEUE_LIMIT = 2_000
+
+
+@dataclass(frozen=True)
+class BucketLimit:
+    rate: float
+    burst: int
+
+
+@dataclass(frozen=True)
+class RouteLimits:
+    per_ip: BucketLimit | None = None
+    per_username: BucketLimit | None = None
+    per_company: BucketLimit | None = None
+    max_in_flight: int | None = None
+
+
+ROUTE_LIMITS = {
+    "login": RouteLimits(
+        per_ip=BucketLimit(rate=2.0, burst=20),
+        per_username=BucketLimit(rate=0.2, burst=5),
+        max_in_flight=128,
+    ),
+    "create_appointment": RouteLimits(
+        per_ip=BucketLimit(rate=5.0, burst=30),
+        per_company=BucketLimit(rate=200.0, burst=400),
+        max_in_flight=1_000,
+    ),
+}
+
+
+class TokenBuckets:
+    # One bucket per key, refilled lazily when the key is next seen. Least
+    # recently used keys are dropped past max_keys; a dropped key starts again
+    # with a full bucket.
+
+    def __init__(self, limit: BucketLimit, max_keys: int = BUCKET_KEYS_LIMIT) -> None:
+        self._rate = limit.rate
+        self._burst = limit.burst
+        self._max_keys = max_keys
+        self._buckets: OrderedDict[object, list[float]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def take(self, key: object) -> float:
+        now = time.monotonic()
+        with self._lock:
+            bucket = self._buckets.get(key)
+            if bucket is None:
+                bucket = self._buckets[key] = [float(self._burst), now]
+                if len(self._buckets) > self._max_keys:
+                    self._buckets.popitem(last=False)
+            else:
+                self._buckets.move_to_end(key)
+                self._refill(bucket, now)
+            if bucket[0] >= 1:
+                bucket[0] -= 1
+                return 0.0
+            return (1 - bucket[0]) / self._rate
+
+    def peek(self, key: object) -> float:
+        # Like take, but leaves the bucket as it is; unseen keys are full.
+        with self._lock:
+            bucket = self._buckets.get(key)
+            if bucket is None:
+                return 0.0
+            self._refill(bucket, time.monotonic())
+            if bucket[0] >= 1:
+                return 0.0
+            return (1 - bucket[0]) / self._rate
+
+    def _refill(self, bucket: list[float], now: float) -> None:
+        bucket[0] = min(self._burst, bucket[0] + (now - bucket[1]) * self._rate)
+        bucket[1] = now
+
+
+def _reject(status_code: int, detail: str, retry_after: float) -> HTTPException:
+    return HTTPException(
+        status_code=status_code,
+        detail=detail,
+        headers={"Retry-After": str(max(1, math.ceil(retry_after)))},
+    )
+
+
+class AdmissionControl:
+    # Route dependency: sheds load while `overloaded` reports a backed-up
+    # queue or the route is at max_in_flight (503), and applies the per-IP
+    # bucket (429). The handler calls check_username / check_company once the
+    # body is parsed. Every check is a counter or a single dict lookup.
+    # Usernames are only charged for failed logins (charge_username), so
+    # nobody can lock an account out by sending its name with a bad password
+    # ahead of the owner's correct one.
+
+    def __init__(
+        self,
+        route: str,
+        limits: RouteLimits,
+        overloaded: Callable[[], bool] = lambda: False,
+    ) -> None:
+        self._route = route
+        self._limits = limits
+        self._overloaded = overloaded
+        self._per_ip = TokenBuckets(limits.per_ip) if limits.per_ip else None
+        self._per_username = (
+            TokenBuckets(limits.per_username) if limits.per_username else None
+        )
+        self._per_company = (
+            TokenBuckets(limits.per_company) if limits.per_company else None
+        )
+        self._in_flight = 0
+
+    def _take(
+        self,
+        buckets: TokenBuckets | None,
+        key: object,
+        reason: str,
+        consume: bool = True,
+    ) -> None:
+        if buckets is None or not RATE_LIMITING_ENABLED:
+            return
+        retry_after = buckets.take(key) if consume else buckets.peek(key)
+        if retry_after:
+            rejected_requests.inc(self._route, reason)
+            raise _reject(
+                status.HTTP_429_TOO_MANY_REQUESTS, "Too many requests", retry_after
+            )
+
+    def check_username(self, username: str) -> None:
+        self._take(self._per_username, username.lower(), "username", consume=False)
+
+    def charge_username(self, username: str) -> None:
+        if self._per_username is not None and RATE_LIMITING_ENABLED:
+            self._per_username.take(username.lower())
+
+    def check_company(self, company_id: int) -> None:
+        self._take(self._per_company, company_id, "company")
+
+    async def __call__(self, request: Request) -> AsyncIterator["AdmissionControl"]:
+        max_in_flight = self._limits.max_in_flight
+        if RATE_LIMITING_ENABLED and (
+            self._overloaded()
+            or (max_in_flight is not None and self._in_flight >= max_in_flight)
+        ):
+            rejected_requests.inc(self._route, "overloaded")
+            raise _reject(
+                status.HTTP_503_SERVICE_UNAVAILABLE,
+                "Server is busy, retry shortly",
+                SHED_RETRY_AFTER_SECONDS,
+            )
+        client = request.client
+        self._take(self._per_ip, client.host if client else None, "ip")
+        self._in_flight += 1
+        try:
+            yield self
+        finally:
+            self._in_flight -= 1
+
+
+def password_hashing_overloaded() -> bool:
+    return password_hasher.queue_depth() > PASSWORD_HASH_QUEUE_LIMIT
+
+
+def database_writes_overloaded() -> bool:
+    return (
+        booking_commits.queue_depth() + db_executor.write_queue_depth()
+        > DB_WRITE_QUEUE_LIMIT
+    )
@@ -0,0 +1,87 @@
+import json
+
+from fastapi.responses import Response
+
+from backend.data_access.row_types import AppointmentRow, UserRow
+from backend.data_access.timestamps import format_epoch_us
+from backend.models.entities.offering import Offering
+
+# Same settings as starlette's JSONResponse, so the bytes match what the
+# response_model path would produce.
+_encoder = json.JSONEncoder(
+    ensure_ascii=False, allow_nan=False, separators=(",", ":")
+)
+
+
+class EncodedJSONResponse(Response):
+    media_type = "application/json"
+
+
+def _iso_text(value: str) -> str:
+    # Pydantic renders a UTC offset as "Z".
+    if value.endswith("+00:00"):
+        return value[:-6] + "Z"
+    return value
+
+
+def _appointment_record(row: AppointmentRow) -> dict:
+    return {
+        "id": row.id,
+        "company_id": row.company_id,
+        "offering_id": row.offering_id,
+        "customer_name": row.customer_name,
+        "customer_phone": row.customer_phone,
+        "customer_email": row.customer_email,
+        "start_date": format_epoch_us(row.start_date),
+        "end_date": format_epoch_us(row.end_date),
+        "created_date": format_epoch_us(row.created_date),
+        "status": row.status,
+    }
+
+
+def _offering_record(offering: Offering) -> dict:
+    return {
+        "id": offering.id,
+        "company_id": offering.company_id,
+        "description": offering.description,
+        "is_open": offering.is_open,
+        "created_date": _iso_text(offering.created_date.isoformat()),
+    }
+
+
+def encode_appointment(row: AppointmentRow) -> bytes:
+    return _encoder.encode(_appointment_record(row)).encode("utf-8")
+
+
+def encode_appointment_page(
+    rows: list[AppointmentRow], next_cursor: str | None
+) -> bytes:
+    return _encoder.encode(
+        {
+            "items": [_appointment_record(row) for row in rows],
+            "next_cursor": next_cursor,
+        }
+    ).encode("utf-8")
+
+
+def encode_offering(offering: Offering) -> bytes:
+    return _encoder.encode(_offering_record(offering)).encode("utf-8")
+
+
+def encode_offerings(offerings: list[Offering]) -> bytes:
+    return _encoder.encode(
+        [_offering_record(offering) for offering in offerings]
+    ).encode("utf-8")
+
+
+def encode_user(row: UserRow) -> bytes:
+    return _encoder.encode(
+        {
+            "id": row.id,
+            "username": row.username,
+            "email": row.email,
+            "role": row.role,
+            "company_id": row.company_id,
+            "created_date": _iso_text(row.created_date),
+        }
+    ).encode("utf-8")
@@ -0,0 +1,92 @@
+import dataclasses
+import inspect
+from typing import Any, Callable, Coroutine
+
+from fastapi.datastructures import DefaultPlaceholder
+from fastapi.exceptions import ResponseValidationError
+from fastapi.responses import JSONResponse, Response
+from fastapi.routing import APIRoute, get_request_handler
+from pydantic import TypeAdapter, ValidationError
+from starlette.background import BackgroundTask
+from starlette.concurrency import run_in_threadpool
+from starlette.requests import Request
+
+_ANY_ADAPTER = TypeAdapter(Any)
+
+
+class PydanticJSONResponse(JSONResponse):
+
+    def __init__(
+        self,
+        content: Any,
+        status_code: int = 200,
+        headers: dict[str, str] | None = None,
+        media_type: str | None = None,
+        background: BackgroundTask | None = None,
+        adapter: TypeAdapter | None = None,
+    ) -> None:
+        self._adapter = adapter or _ANY_ADAPTER
+        super().__init__(content, status_code, headers, media_type, background)
+
+    def render(self, content: Any) -> bytes:
+        return self._adapter.dump_json(content)
+
+
+class PydanticJSONRoute(APIRoute):
+    # FastAPI normally validates an endpoint's return value against
+    # response_model, dumps it to Python data and then json.dumps it. When a
+    # route's response class is PydanticJSONResponse, hand the returned
+    # models straight to a TypeAdapter for response_model instead, so they
+    # are serialized to JSON bytes in a single pass. Anything that is not
+    # already a response_model instance is validated first, as FastAPI
+    # would; routes using response_model_* filtering options keep FastAPI's
+    # own handler.
+
+    def get_route_handler(self) -> Callable[[Request], Coroutine[Any, Any, Response]]:
+        response_class = self.response_class
+        if isinstance(response_class, DefaultPlaceholder):
+            response_class = response_class.value
+        if (
+            not issubclass(response_class, PydanticJSONResponse)
+            or self._filters_response()
+        ):
+            return super().get_route_handler()
+
+        endpoint = self.dependant.call
+        is_coroutine = inspect.iscoroutinefunction(endpoint)
+        response_model = self.response_model
+        adapter = TypeAdapter(response_model) if response_model is not None else None
+        status_code = self.status_code or 200
+
+        async def call(**values: Any) -> Any:
+            if is_coroutine:
+                content = await endpoint(**values)
+            else:
+                content = await run_in_threadpool(endpoint, **values)
+            if isinstance(content, Response):
+                return content
+            if adapter is not None and type(content) is not response_model:
+                try:
+                    content = adapter.validate_python(content, from_attributes=True)
+                except ValidationError as e:
+                    raise ResponseValidationError(errors=e.errors(), body=content)
+            return response_class(content, status_code=status_code, adapter=adapter)
+
+        return get_request_handler(
+            dependant=dataclasses.replace(self.dependant, call=call),
+            body_field=self.body_field,
+            status_code=self.status_code,
+            response_class=self.response_class,
+            dependency_overrides_provider=self.dependency_overrides_provider,
+            embed_body_fields=self._embed_body_fields,
+        )
+
+    def _filters_response(self) -> bool:
+        return (
+            self.response_model_include is not None
+            or self.response_model_exclude is not None
+            or not self.response_model_by_alias
+            or self.response_model_exclude_unset
+            or self.response_model_exclude_defaults
+            or self.response_model_exclude_none
+        )
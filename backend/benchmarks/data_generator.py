@@ -0,0 +1,253 @@
+import argparse
+import random
+import sqlite3
+import time
+from contextlib import ExitStack
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from typing import Callable, Iterator
+
+import bcrypt
+
+from backend.business.security.password_hasher import BCRYPT_ROUNDS
+from backend.data_access import db_context
+from backend.data_access.repositories.appointment_repository import (
+    rebuild_daily_counts,
+)
+from backend.data_access.timestamps import to_epoch_us
+from backend.models.enums.appointment_status import AppointmentStatus
+from backend.models.enums.role import Role
+
+BENCHMARK_PASSWORD = "benchmark"
+DEFAULT_SEED = 42
+INSERT_BATCH_SIZE = 50_000
+
+# Appointments start here and are laid out forward in time, one offering
+# after another, so no two active bookings on an offering overlap.
+TIMELINE_START = datetime(2024, 1, 1, tzinfo=timezone.utc)
+SLOT_MINUTES = (15, 30, 45, 60, 90)
+GAP_MINUTES = (0, 0, 15, 30, 60, 120)
+STATUS_WEIGHTS = (
+    (AppointmentStatus.APPROVED, 55),
+    (AppointmentStatus.PENDING, 25),
+    (AppointmentStatus.CANCELLED, 10),
+    (AppointmentStatus.DENIED, 7),
+    (AppointmentStatus.DELETED, 3),
+)
+OPEN_OFFERING_RATIO = 0.9
+
+_FIRST_NAMES = ("Ada", "Alan", "Grace", "Linus", "Barbara", "Ken", "Edsger", "Frances")
+_LAST_NAMES = ("Lovelace", "Turing", "Hopper", "Torvalds", "Liskov", "Thompson", "Dijkstra")
+
+
+@dataclass
+class GeneratedDataset:
+    companies: int
+    offerings: int
+    appointments: int
+    seconds: float
+
+
+def company_username(company_id: int) -> str:
+    return f"company{company_id}"
+
+
+def _users(companies: int, password_hash: str, created: str) -> Iterator[tuple]:
+    for company_id in range(1, companies + 1):
+        username = company_username(company_id)
+        yield (
+            username,
+            password_hash,
+            f"{username}@example.com",
+            Role.COMPANY.value,
+            company_id,
+            created,
+        )
+
+
+def _offerings(
+    rng: random.Random, companies: int, per_company: int, created: str
+) -> Iterator[tuple]:
+    for company_id in range(1, companies + 1):
+        for number in range(per_company):
+            yield (
+                company_id,
+                f"Offering {number + 1} of company {company_id}",
+                int(rng.random() < OPEN_OFFERING_RATIO),
+                created,
+            )
+
+
+def _appointments(
+    rng: random.Random, offering_ids: list[int], per_company: int, total: int
+) -> Iterator[tuple]:
+    statuses = [status.value for status, _ in STATUS_WEIGHTS]
+    weights = [weight for _, weight in STATUS_WEIGHTS]
+    offerings = len(offering_ids)
+    clocks = [to_epoch_us(TIMELINE_START)] * offerings
+    for number in range(total):
+        index = number % offerings
+        start = clocks[index] + rng.choice(GAP_MINUTES) * 60_000_000
+        end = start + rng.choice(SLOT_MINUTES) * 60_000_000
+        clocks[index] = end
+        first = rng.choice(_FIRST_NAMES)
+        last = rng.choice(_LAST_NAMES)
+        yield (
+            index // per_company + 1,
+            offering_ids[index],
+            f"{first} {last}",
+            f"+1-555-{rng.randrange(10_000):04d}",
+            f"{first.lower()}.{last.lower()}{number}@example.com",
+            start,
+            end,
+            start - rng.randrange(1, 60) * 86_400_000_000,
+            rng.choices(statuses, weights)[0],
+        )
+
+
+def _insert_batches(
+    connection_for: Callable[[int], sqlite3.Connection],
+    sql: str,
+    rows: Iterator[tuple],
+) -> int:
+    # Rows start with their company_id; each database gets its own batches.
+    batches: dict[sqlite3.Connection, list[tuple]] = {}
+    count = 0
+    for row in rows:
+        connection = connection_for(row[0])
+        batch = batches.setdefault(connection, [])
+        batch.append(row)
+        if len(batch) == INSERT_BATCH_SIZE:
+            connection.executemany(sql, batch)
+            batch.clear()
+        count += 1
+    for connection, batch in batches.items():
+        if batch:
+            connection.executemany(sql, batch)
+    return count
+
+
+def _ensure_empty(connection: sqlite3.Connection) -> None:
+    if connection.execute("SELECT 1 FROM appointments LIMIT 1").fetchone():
+        raise ValueError("The database already has appointments; use an empty one")
+
+
+def generate(
+    companies: int,
+    offerings_per_company: int,
+    appointments: int,
+    seed: int = DEFAULT_SEED,
+) -> GeneratedDataset:
+    if companies < 1 or offerings_per_company < 1:
+        raise ValueError("companies and offerings_per_company must be at least 1")
+    started = time.perf_counter()
+    rng = random.Random(seed)
+    db_context.initialize_database()
+    # One hash for every company user: the login benchmark still pays the
+    # full bcrypt cost, but seeding does not.
+    password_hash = bcrypt.hashpw(
+        BENCHMARK_PASSWORD.encode("utf-8"), bcrypt.gensalt(BCRYPT_ROUNDS)
+    ).decode("utf-8")
+    created = (TIMELINE_START - timedelta(days=90)).isoformat()
+
+    with ExitStack() as stack:
+        connection = stack.enter_context(db_context.write_connection())
+        _ensure_empty(connection)
+        connection.execute("BEGIN IMMEDIATE")
+        # With sharding enabled, offerings and appointments go to each
+        # company's shard, each filled in its own transaction.
+        connections = {None: connection}
+
+        def connection_for(company_id: int) -> sqlite3.Connection:
+            shard = db_context.shard_for_company(company_id)
+            shard_connection = connections.get(shard)
+            if shard_connection is None:
+                shard_connection = stack.enter_context(
+                    db_context.write_connection(shard)
+                )
+                _ensure_empty(shard_connection)
+                shard_connection.execute("BEGIN IMMEDIATE")
+                connections[shard] = shard_connection
+            return shard_connection
+
+        connection.executemany(
+            """
+            INSERT INTO users
+                (username, password_hash, email, role, company_id, created_date)
+            VALUES (?, ?, ?, ?, ?, ?)
+            """,
+            _users(companies, password_hash, created),
+        )
+        offering_ids = []
+        for row in _offerings(rng, companies, offerings_per_company, created):
+            cursor = connection_for(row[0]).execute(
+                """
+                INSERT INTO offerings (company_id, description, is_open, created_date)
+                VALUES (?, ?, ?, ?)
+                """,
+                row,
+            )
+            offering_ids.append(cursor.lastrowid)
+        for company_id in range(1, companies + 1):
+            connection_for(company_id).execute(
+                """
+                INSERT INTO company_versions (company_id, offerings_version)
+                VALUES (?, 1)
+                ON CONFLICT (company_id) DO NOTHING
+                """,
+                (company_id,),
+            )
+        appointment_count = _insert_batches(
+            connection_for,
+            """
+            INSERT INTO appointments
+                (company_id, offering_id, customer_name, customer_phone,
+                 customer_email, start_date, end_date, created_date, status)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+            """,
+            _appointments(rng, offering_ids, offerings_per_company, appointments),
+        )
+        for shard_connection in connections.values():
+            rebuild_daily_counts(shard_connection)
+            shard_connection.commit()
+            shard_connection.execute("ANALYZE")
+
+    return GeneratedDataset(
+        companies=companies,
+        offerings=len(offering_ids),
+        appointments=appointment_count,
+        seconds=time.perf_counter() - started,
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Fill an empty database with seeded synthetic data"
+    )
+    parser.add_argument("--db", default=db_context.DB_PATH, help="SQLite database path")
+    parser.add_argument("--companies", type=int, default=10)
+    parser.add_argument("--offerings-per-company", type=int, default=20)
+    parser.add_argument("--appointments", type=int, default=100_000)
+    parser.add_argument("--seed", type=int, default=DEFAULT_SEED)
+    parser.add_argument(
+        "--sharded", action="store_true", help="Write one shard database per company"
+    )
+    args = parser.parse_args()
+
+    db_context.DB_PATH = args.db
+    db_context.SHARDING_ENABLED = args.sharded
+    try:
+        dataset = generate(
+            args.companies, args.offerings_per_company, args.appointments, args.seed
+        )
+    finally:
+        db_context.close_connections()
+    print(
+        f"Generated {dataset.companies} companies, {dataset.offerings} offerings and "
+        f"{dataset.appointments} appointments in {dataset.seconds:.1f}s"
+    )
+    print(f"Company users: company1..company{dataset.companies} / {BENCHMARK_PASSWORD}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,419 @@
+import argparse
+import json
+import os
+import platform
+import random
+import sqlite3
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import urllib.error
+import urllib.parse
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import asdict, dataclass
+from datetime import datetime, timedelta, timezone
+from typing import Callable
+
+from backend.benchmarks.data_generator import (
+    BENCHMARK_PASSWORD,
+    DEFAULT_SEED,
+    company_username,
+)
+from backend.api.dependencies import rate_limit
+from backend.data_access import db_context
+
+SCENARIOS = ("login", "booking", "listing", "offering_lookup")
+DEFAULT_REQUESTS = {"login": 50, "booking": 500, "listing": 500, "offering_lookup": 1000}
+DEFAULT_CONCURRENCY = 8
+LIST_PAGE_SIZE = 100
+EXPECTED_STATUS = {"login": 200, "booking": 201, "listing": 200, "offering_lookup": 200}
+# Rate-limit and load-shedding rejections are counted apart from errors and
+# left out of the latency figures: they return before doing the real work.
+REJECTED_STATUSES = (429, 503)
+
+# Bookings go far past anything the data generator lays out, one slot per
+# request, so they never conflict with seeded rows. Runs must start from a
+# freshly generated database for results (and bookings) to be repeatable.
+BOOKING_TIMELINE_START = datetime(2100, 1, 1, tzinfo=timezone.utc)
+
+
+@dataclass
+class ScenarioResult:
+    requests: int
+    errors: int
+    rejected: int
+    seconds: float
+    throughput_rps: float
+    mean_ms: float
+    p50_ms: float
+    p95_ms: float
+    p99_ms: float
+    max_ms: float
+
+
+def _copy_database(source_path: str, target_path: str) -> None:
+    source = sqlite3.connect(f"file:{urllib.parse.quote(source_path)}?mode=ro", uri=True)
+    target = sqlite3.connect(target_path)
+    try:
+        source.backup(target)
+    finally:
+        source.close()
+        target.close()
+
+
+class InProcessClient:
+
+    def __init__(self, source_db: str) -> None:
+        from fastapi.testclient import TestClient
+
+        from backend.main import app
+
+        # Work on a copy so the generated database can be reused run after run.
+        self._directory = tempfile.TemporaryDirectory()
+        db_context.DB_PATH = os.path.join(self._directory.name, "benchmark.db")
+        _copy_database(source_db, db_context.DB_PATH)
+        shard_dir = os.path.join(os.path.dirname(source_db), db_context.SHARD_DIR_NAME)
+        if db_context.SHARDING_ENABLED and os.path.isdir(shard_dir):
+            target_dir = os.path.join(self._directory.name, db_context.SHARD_DIR_NAME)
+            os.makedirs(target_dir)
+            for name in os.listdir(shard_dir):
+                if name.endswith(".db"):
+                    _copy_database(
+                        os.path.join(shard_dir, name), os.path.join(target_dir, name)
+                    )
+
+        self._client = TestClient(app)
+        self._client.__enter__()
+
+    def request(
+        self, method: str, path: str, body: dict | None = None, token: str | None = None
+    ) -> tuple[int, bytes]:
+        headers = {"Authorization": f"Bearer {token}"} if token else None
+        response = self._client.request(method, path, json=body, headers=headers)
+        return response.status_code, response.content
+
+    def close(self) -> None:
+        self._client.__exit__(None, None, None)
+        db_context.close_connections()
+        self._directory.cleanup()
+
+
+class HTTPClient:
+
+    def __init__(self, base_url: str) -> None:
+        self._base_url = base_url.rstrip("/")
+
+    def request(
+        self, method: str, path: str, body: dict | None = None, token: str | None = None
+    ) -> tuple[int, bytes]:
+        headers = {"Content-Type": "application/json"}
+        if token:
+            headers["Authorization"] = f"Bearer {token}"
+        request = urllib.request.Request(
+            self._base_url + path,
+            data=None if body is None else json.dumps(body).encode("utf-8"),
+            headers=headers,
+            method=method,
+        )
+        try:
+            with urllib.request.urlopen(request) as response:
+                return response.status, response.read()
+        except urllib.error.HTTPError as e:
+            return e.code, e.read()
+
+    def close(self) -> None:
+        pass
+
+
+def _percentile(sorted_samples: list[float], percent: float) -> float:
+    index = min(len(sorted_samples) - 1, int(len(sorted_samples) * percent / 100))
+    return sorted_samples[index]
+
+
+def _run_scenario(
+    call: Callable[[int], int], expected_status: int, requests: int, concurrency: int
+) -> ScenarioResult:
+    samples = [0.0] * requests
+    statuses = [0] * requests
+
+    def timed(number: int) -> None:
+        started = time.perf_counter()
+        try:
+            status = call(number)
+        except Exception:
+            status = 0
+        samples[number] = time.perf_counter() - started
+        statuses[number] = status
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        list(executor.map(timed, range(requests)))
+    seconds = time.perf_counter() - started
+
+    rejected = sum(status in REJECTED_STATUSES for status in statuses)
+    ordered = sorted(
+        sample
+        for sample, status in zip(samples, statuses)
+        if status not in REJECTED_STATUSES
+    ) or [0.0]
+    return ScenarioResult(
+        requests=requests,
+        errors=sum(
+            status != expected_status and status not in REJECTED_STATUSES
+            for status in statuses
+        ),
+        rejected=rejected,
+        seconds=round(seconds, 4),
+        throughput_rps=round(requests / seconds, 2),
+        mean_ms=round(sum(ordered) / len(ordered) * 1000, 3),
+        p50_ms=round(_percentile(ordered, 50) * 1000, 3),
+        p95_ms=round(_percentile(ordered, 95) * 1000, 3),
+        p99_ms=round(_percentile(ordered, 99) * 1000, 3),
+        max_ms=round(ordered[-1] * 1000, 3),
+    )
+
+
+class Workload:
+
+    def __init__(self, client, companies: int, seed: int) -> None:
+        self._client = client
+        self._companies = companies
+        self._seed = seed
+        self._tokens: dict[int, str] = {}
+        self._open_offerings: dict[int, list[int]] = {}
+        self._lock = threading.Lock()
+
+    def _company(self, number: int) -> int:
+        return random.Random(self._seed * 1_000_003 + number).randrange(self._companies) + 1
+
+    def _token(self, company_id: int) -> str:
+        token = self._tokens.get(company_id)
+        if token is None:
+            status, body = self._client.request(
+                "POST",
+                "/api/auth/login",
+                {"username": company_username(company_id), "password": BENCHMARK_PASSWORD},
+            )
+            if status in REJECTED_STATUSES:
+                raise RuntimeError(
+                    f"Login for company {company_id} was rate limited ({status}); "
+                    "start the server with RATE_LIMITING=off"
+                )
+            if status != 200:
+                raise RuntimeError(f"Login failed for company {company_id}: {status}")
+            token = json.loads(body)["access_token"]
+            with self._lock:
+                self._tokens[company_id] = token
+        return token
+
+    def _offerings(self, company_id: int) -> list[int]:
+        offerings = self._open_offerings.get(company_id)
+        if offerings is None:
+            _, body = self._client.request("GET", f"/api/offerings/company/{company_id}")
+            offerings = [offering["id"] for offering in json.loads(body)]
+            with self._lock:
+                self._open_offerings[company_id] = offerings
+        return offerings
+
+    def prepare(self, scenarios: list[str]) -> None:
+        if "listing" in scenarios:
+            for company_id in range(1, self._companies + 1):
+                self._token(company_id)
+        if "booking" in scenarios:
+            for company_id in range(1, self._companies + 1):
+                self._offerings(company_id)
+
+    def login(self, number: int) -> int:
+        status, _ = self._client.request(
+            "POST",
+            "/api/auth/login",
+            {
+                "username": company_username(self._company(number)),
+                "password": BENCHMARK_PASSWORD,
+            },
+        )
+        return status
+
+    def booking(self, number: int) -> int:
+        company_id = self._company(number)
+        offerings = self._open_offerings[company_id]
+        if not offerings:
+            return 0
+        start = BOOKING_TIMELINE_START + timedelta(hours=number)
+        status, _ = self._client.request(
+            "POST",
+            "/api/appointments/",
+            {
+                "company_id": company_id,
+                "offering_id": offerings[number % len(offerings)],
+                "customer_name": "Benchmark Customer",
+                "customer_phone": "+1-555-0100",
+                "customer_email": f"bench{number}@example.com",
+                "start_date": start.isoformat(),
+                "end_date": (start + timedelta(minutes=30)).isoformat(),
+            },
+        )
+        return status
+
+    def listing(self, number: int) -> int:
+        status, _ = self._client.request(
+            "GET",
+            f"/api/appointments/?limit={LIST_PAGE_SIZE}",
+            token=self._tokens[self._company(number)],
+        )
+        return status
+
+    def offering_lookup(self, number: int) -> int:
+        status, _ = self._client.request(
+            "GET", f"/api/offerings/company/{self._company(number)}"
+        )
+        return status
+
+
+def _git_commit() -> str | None:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "HEAD"],
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def run(
+    client,
+    mode: str,
+    companies: int,
+    scenarios: list[str],
+    requests: dict[str, int],
+    concurrency: int,
+    seed: int,
+) -> dict:
+    workload = Workload(client, companies, seed)
+    workload.prepare(scenarios)
+    results = {}
+    for name in scenarios:
+        results[name] = asdict(
+            _run_scenario(
+                getattr(workload, name), EXPECTED_STATUS[name], requests[name], concurrency
+            )
+        )
+    return {
+        "commit": _git_commit(),
+        "created": datetime.now(timezone.utc).isoformat(),
+        "python": platform.python_version(),
+        "mode": mode,
+        "companies": companies,
+        "concurrency": concurrency,
+        "seed": seed,
+        "scenarios": results,
+    }
+
+
+def compare(baseline_path: str, candidate_path: str) -> None:
+    with open(baseline_path) as f:
+        baseline = json.load(f)
+    with open(candidate_path) as f:
+        candidate = json.load(f)
+    print(f"{'scenario':<18}{'metric':<16}{'baseline':>12}{'candidate':>12}{'change':>9}")
+    for name, before in baseline["scenarios"].items():
+        after = candidate["scenarios"].get(name)
+        if after is None:
+            continue
+        for metric in ("throughput_rps", "p50_ms", "p95_ms", "p99_ms"):
+            change = (after[metric] - before[metric]) / before[metric] * 100 if before[metric] else 0.0
+            print(
+                f"{name:<18}{metric:<16}{before[metric]:>12.3f}{after[metric]:>12.3f}"
+                f"{change:>+8.1f}%"
+            )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Appointment System load benchmarks")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    run_parser = subparsers.add_parser("run", help="Run the benchmark scenarios")
+    run_parser.add_argument(
+        "--db",
+        default=db_context.DB_PATH,
+        help="Database filled by backend.benchmarks.data_generator (in-process mode)",
+    )
+    run_parser.add_argument(
+        "--url", default=None, help="Benchmark a running server over HTTP instead"
+    )
+    run_parser.add_argument("--companies", type=int, default=10)
+    run_parser.add_argument(
+        "--scenario", action="append", choices=SCENARIOS, dest="scenarios"
+    )
+    run_parser.add_argument(
+        "--requests", type=int, default=None, help="Requests per scenario"
+    )
+    run_parser.add_argument("--concurrency", type=int, default=DEFAULT_CONCURRENCY)
+    run_parser.add_argument("--seed", type=int, default=DEFAULT_SEED)
+    run_parser.add_argument("--output", default=None, help="Write results to this JSON file")
+    run_parser.add_argument(
+        "--rate-limits",
+        action="store_true",
+        help="Keep rate limits and load shedding on in in-process mode "
+        "(a --url server controls its own with RATE_LIMITING)",
+    )
+    run_parser.add_argument(
+        "--sharded",
+        action="store_true",
+        help="Run in-process with per-company shards (generate with --sharded)",
+    )
+
+    compare_parser = subparsers.add_parser("compare", help="Compare two result files")
+    compare_parser.add_argument("baseline")
+    compare_parser.add_argument("candidate")
+
+    args = parser.parse_args()
+    if args.command == "compare":
+        compare(args.baseline, args.candidate)
+        return
+
+    scenarios = args.scenarios or list(SCENARIOS)
+    requests = {
+        name: args.requests or DEFAULT_REQUESTS[name] for name in scenarios
+    }
+    if args.url is not None:
+        client, mode = HTTPClient(args.url), "http"
+    else:
+        db_context.SHARDING_ENABLED = args.sharded
+        # Every in-process request comes from one client address.
+        rate_limit.RATE_LIMITING_ENABLED = args.rate_limits
+        client = InProcessClient(args.db)
+        mode = "in-process-sharded" if args.sharded else "in-process"
+    try:
+        report = run(
+            client, mode, args.companies, scenarios, requests, args.concurrency, args.seed
+        )
+    finally:
+        client.close()
+
+    for name, result in report["scenarios"].items():
+        print(
+            f"{name:<16} {result['throughput_rps']:>9.1f} req/s  "
+            f"p50 {result['p50_ms']:.2f} ms  p95 {result['p95_ms']:.2f} ms  "
+            f"p99 {result['p99_ms']:.2f} ms  errors {result['errors']}  "
+            f"rejected {result['rejected']}"
+        )
+    if any(result["rejected"] for result in report["scenarios"].values()):
+        print(
+            "warning: requests were rate limited or shed (429/503); start the "
+            "server with RATE_LIMITING=off for comparable results",
+            file=sys.stderr,
+        )
+    if args.output is not None:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+        print(f"Results written to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
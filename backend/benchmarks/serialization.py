@@ -0,0 +1,189 @@
+import argparse
+import asyncio
+import os
+import statistics
+import tempfile
+import time
+from datetime import datetime, timedelta, timezone
+from typing import Any, Awaitable, Callable
+
+from fastapi.responses import JSONResponse
+from fastapi.routing import serialize_response
+from fastapi.utils import create_model_field
+
+from backend.api.fast_json import (
+    encode_appointment_page,
+    encode_offerings,
+    encode_user,
+)
+from backend.business.services.appointment_service import AppointmentService
+from backend.business.services.offering_service import OfferingService
+from backend.data_access import db_context
+from backend.data_access.repositories.appointment_repository import (
+    AppointmentRepository,
+)
+from backend.data_access.repositories.offering_repository import OfferingRepository
+from backend.data_access.repositories.user_repository import UserRepository
+from backend.models.dtos.appointment_dto import (
+    AppointmentFilter,
+    AppointmentPageResponse,
+)
+from backend.models.dtos.auth_dto import UserResponse
+from backend.models.dtos.offering_dto import OfferingResponse
+from backend.models.entities.appointment import Appointment
+from backend.models.entities.offering import Offering
+from backend.models.entities.user import User
+from backend.models.enums.appointment_status import AppointmentStatus
+from backend.models.enums.role import Role
+
+COMPANY_ID = 1
+
+
+def _seed(appointments: int, offerings: int) -> None:
+    now = datetime.now(timezone.utc)
+    UserRepository().create(
+        User(
+            id=None,
+            username="bench",
+            password_hash="x",
+            email="bench@example.com",
+            role=Role.COMPANY,
+            company_id=COMPANY_ID,
+            created_date=now,
+        )
+    )
+    offering_repository = OfferingRepository()
+    for i in range(offerings):
+        offering_repository.create(
+            Offering(
+                id=None,
+                company_id=COMPANY_ID,
+                description=f"Offering {i}",
+                is_open=True,
+                created_date=now,
+            )
+        )
+    start = datetime(2026, 1, 1, tzinfo=timezone.utc)
+    AppointmentRepository().create_many(
+        [
+            Appointment(
+                id=None,
+                company_id=COMPANY_ID,
+                offering_id=1,
+                customer_name=f"Customer {i}",
+                customer_phone="555-0100",
+                customer_email=f"customer{i}@example.com",
+                start_date=start + timedelta(hours=i),
+                end_date=start + timedelta(hours=i, minutes=30),
+                created_date=now,
+                status=AppointmentStatus.APPROVED,
+            )
+            for i in range(appointments)
+        ]
+    )
+
+
+async def _response_model_body(response_model: Any, content: Any) -> bytes:
+    # What FastAPI does for a route with response_model: validate the
+    # returned value again, dump it to JSON-able data and json.dumps it.
+    field = create_model_field(
+        name="Response", type_=response_model, mode="serialization"
+    )
+    value = await serialize_response(field=field, response_content=content)
+    return JSONResponse(value).body
+
+
+async def _time(
+    work: Callable[[], Awaitable[bytes]], repeat: int
+) -> tuple[float, bytes]:
+    body = await work()
+    samples = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        await work()
+        samples.append(time.perf_counter() - started)
+    return statistics.median(samples), body
+
+
+async def run(appointments: int, offerings: int, repeat: int) -> None:
+    appointment_repository = AppointmentRepository()
+    offering_repository = OfferingRepository()
+    user_repository = UserRepository()
+    appointment_service = AppointmentService
+    offering_service = OfferingService
+    filters = AppointmentFilter(company_id=COMPANY_ID)
+
+    async def appointments_model() -> bytes:
+        rows = appointment_repository.get_page(filters, appointments)
+        page = AppointmentPageResponse(
+            items=[appointment_service._to_response(a) for a in rows]
+        )
+        return await _response_model_body(AppointmentPageResponse, page)
+
+    async def appointments_fast() -> bytes:
+        rows = appointment_repository.get_page_rows(filters, appointments)
+        return encode_appointment_page(rows, None)
+
+    async def offerings_model() -> bytes:
+        rows = offering_repository.get_by_company_id(COMPANY_ID)
+        return await _response_model_body(
+            list[OfferingResponse],
+            [offering_service._to_response(o) for o in rows],
+        )
+
+    async def offerings_fast() -> bytes:
+        return encode_offerings(offering_repository.get_by_company_id(COMPANY_ID))
+
+    async def user_model() -> bytes:
+        user = user_repository.get_by_id(1)
+        return await _response_model_body(
+            UserResponse,
+            UserResponse(
+                id=user.id,
+                username=user.username,
+                email=user.email,
+                role=user.role,
+                company_id=user.company_id,
+                created_date=user.created_date,
+            ),
+        )
+
+    async def user_fast() -> bytes:
+        return encode_user(user_repository.get_row_by_id(1))
+
+    cases = (
+        (f"appointments ({appointments} rows)", appointments_model, appointments_fast),
+        (f"offerings ({offerings} rows)", offerings_model, offerings_fast),
+        ("users (1 row)", user_model, user_fast),
+    )
+    print(f"{'case':<28}{'model ms':>10}{'fast ms':>10}{'speedup':>9}  same")
+    for name, model, fast in cases:
+        model_seconds, model_body = await _time(model, repeat)
+        fast_seconds, fast_body = await _time(fast, repeat)
+        print(
+            f"{name:<28}{model_seconds * 1000:>10.3f}{fast_seconds * 1000:>10.3f}"
+            f"{model_seconds / fast_seconds:>8.1f}x  {model_body == fast_body}"
+        )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Compare the response_model path with the row fast path"
+    )
+    parser.add_argument("--appointments", type=int, default=1000)
+    parser.add_argument("--offerings", type=int, default=200)
+    parser.add_argument("--repeat", type=int, default=50)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        db_context.DB_PATH = os.path.join(directory, "benchmark.db")
+        try:
+            db_context.initialize_database()
+            _seed(args.appointments, args.offerings)
+            asyncio.run(run(args.appointments, args.offerings, args.repeat))
+        finally:
+            db_context.close_connections()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,106 @@
+import asyncio
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Callable, TypeVar
+
+import bcrypt
+
+from backend.instrumentation.metrics import password_hash_duration
+
+BCRYPT_ROUNDS = 12
+PASSWORD_HASH_WORKERS = 4
+
+T = TypeVar("T")
+
+
+@dataclass
+class PasswordHasherStats:
+    workers: int
+    rounds: int
+    running: int
+    queued: int
+    max_queued: int
+    completed: int
+
+
+class PasswordHasher:
+    # bcrypt releases the GIL, so a small dedicated thread pool keeps hashing
+    # off the event loop without competing with FastAPI's request threadpool.
+
+    def __init__(
+        self, rounds: int = BCRYPT_ROUNDS, workers: int = PASSWORD_HASH_WORKERS
+    ) -> None:
+        if not 4 <= rounds <= 31:
+            raise ValueError("bcrypt rounds must be between 4 and 31")
+        self._rounds = rounds
+        self._workers = workers
+        self._executor = ThreadPoolExecutor(
+            max_workers=workers, thread_name_prefix="password-hasher"
+        )
+        self._lock = threading.Lock()
+        self._pending = 0
+        self._running = 0
+        self._max_queued = 0
+        self._completed = 0
+
+    def _hash(self, password: str) -> str:
+        return bcrypt.hashpw(
+            password.encode("utf-8"), bcrypt.gensalt(rounds=self._rounds)
+        ).decode("utf-8")
+
+    @staticmethod
+    def _verify(password: str, password_hash: str) -> bool:
+        return bcrypt.checkpw(password.encode("utf-8"), password_hash.encode("utf-8"))
+
+    def _tracked(self, operation: str, work: Callable[..., T], *args) -> T:
+        with self._lock:
+            self._running += 1
+        started = time.perf_counter()
+        try:
+            return work(*args)
+        finally:
+            password_hash_duration.observe(time.perf_counter() - started, operation)
+            with self._lock:
+                self._running -= 1
+
+    async def _submit(self, operation: str, work: Callable[..., T], *args) -> T:
+        with self._lock:
+            self._pending += 1
+            self._max_queued = max(
+                self._max_queued, self._pending - min(self._pending, self._workers)
+            )
+        try:
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(
+                self._executor, self._tracked, operation, work, *args
+            )
+        finally:
+            with self._lock:
+                self._pending -= 1
+                self._completed += 1
+
+    async def hash(self, password: str) -> str:
+        return await self._submit("hash", self._hash, password)
+
+    async def verify(self, password: str, password_hash: str) -> bool:
+        return await self._submit("verify", self._verify, password, password_hash)
+
+    def queue_depth(self) -> int:
+        with self._lock:
+            return self._pending - self._running
+
+    def stats(self) -> PasswordHasherStats:
+        with self._lock:
+            return PasswordHasherStats(
+                workers=self._workers,
+                rounds=self._rounds,
+                running=self._running,
+                queued=self._pending - self._running,
+                max_queued=self._max_queued,
+                completed=self._completed,
+            )
+
+
+password_hasher = PasswordHasher()
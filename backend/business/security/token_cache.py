@@ -0,0 +1,82 @@
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any
+
+TOKEN_CACHE_SIZE = 10_000
+
+
+@dataclass
+class TokenCacheStats:
+    size: int
+    max_size: int
+    hits: int
+    misses: int
+    evictions: int
+    expirations: int
+
+
+class VerifiedTokenCache:
+    # Holds the claims of a verified token until the token expires. Tokens
+    # are not revocable: a cache miss decodes the same still-valid JWT and
+    # gets the same claims back, so the cache never serves anything the
+    # token itself would not.
+
+    def __init__(self, max_size: int = TOKEN_CACHE_SIZE) -> None:
+        self._max_size = max_size
+        self._entries: OrderedDict[bytes, tuple[Any, float]] = OrderedDict()
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+        self._expirations = 0
+
+    @staticmethod
+    def _digest(token: str) -> bytes:
+        return hashlib.sha256(token.encode("utf-8")).digest()
+
+    def get(self, token: str) -> Any | None:
+        key = self._digest(token)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self._misses += 1
+                return None
+            value, expires_at = entry
+            if expires_at <= time.time():
+                del self._entries[key]
+                self._expirations += 1
+                self._misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self._hits += 1
+            return value
+
+    def put(self, token: str, value: Any, expires_at: float) -> None:
+        key = self._digest(token)
+        with self._lock:
+            self._entries[key] = (value, expires_at)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self._max_size:
+                self._entries.popitem(last=False)
+                self._evictions += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> TokenCacheStats:
+        with self._lock:
+            return TokenCacheStats(
+                size=len(self._entries),
+                max_size=self._max_size,
+                hits=self._hits,
+                misses=self._misses,
+                evictions=self._evictions,
+                expirations=self._expirations,
+            )
+
+
+verified_tokens = VerifiedTokenCache()
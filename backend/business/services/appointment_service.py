@@ -1,39 +1,190 @@
-from datetime import datetime, timezone
+import base64
+import csv
+import hashlib
+import io
+import json
+from datetime import date, datetime, timedelta, timezone
+from typing import AsyncIterator
 
-from backend.data_access.repositories.appointment_repository import (
-    AppointmentRepository,
+from backend.data_access.exceptions import (
+    BookingConflictError,
+    IdempotencyKeyMismatchError,
 )
-from backend.data_access.repositories.offering_repository import OfferingRepository
+from backend.data_access.idempotency_cache import idempotency_cache
+from backend.data_access.repositories.async_appointment_repository import (
+    AsyncAppointmentRepository,
+)
+from backend.data_access.repositories.async_offering_repository import (
+    AsyncOfferingRepository,
+)
+from backend.data_access.row_types import AppointmentRow
+from backend.data_access.timestamps import from_epoch_us, to_epoch_us
 from backend.models.dtos.appointment_dto import (
+    AppointmentFilter,
+    AppointmentDayStats,
     AppointmentResponse,
+    AppointmentStatsResponse,
+    BatchStatusUpdateRequest,
+    BatchStatusUpdateResponse,
+    BulkAppointmentResult,
+    BulkCreateAppointmentsResponse,
     CreateAppointmentRequest,
     UpdateAppointmentRequest,
 )
 from backend.models.entities.appointment import Appointment
+from backend.models.entities.idempotency_key import IdempotencyKey
+from backend.models.entities.offering import Offering
 from backend.models.enums.appointment_status import AppointmentStatus
+from backend.models.enums.export_format import ExportFormat
+
+DEFAULT_PAGE_SIZE = 100
+MAX_PAGE_SIZE = 1000
+EXPORT_BATCH_SIZE = 500
+IDEMPOTENCY_KEY_TTL_SECONDS = 24 * 60 * 60
+MAX_IDEMPOTENCY_KEY_LENGTH = 255
+STATS_DEFAULT_DAYS = 30
+STATS_MAX_DAYS = 366
+
+_EPOCH_DATE = date(1970, 1, 1)
+
+EXPORT_FIELDS = (
+    "id",
+    "company_id",
+    "offering_id",
+    "customer_name",
+    "customer_phone",
+    "customer_email",
+    "start_date",
+    "end_date",
+    "created_date",
+    "status",
+)
 
 
 class AppointmentService:
 
     def __init__(self) -> None:
-        self._repository = AppointmentRepository()
-        self._offering_repository = OfferingRepository()
+        self._repository = AsyncAppointmentRepository()
+        self._offering_repository = AsyncOfferingRepository()
 
-    def create_appointment(
-        self, request: CreateAppointmentRequest
+    async def create_appointment(
+        self, request: CreateAppointmentRequest, idempotency_key: str | None = None
     ) -> AppointmentResponse:
-        if request.end_date <= request.start_date:
+        if idempotency_key is None:
+            created = await self._create_appointment(request)
+        else:
+            key = self._idempotency_key(request, idempotency_key)
+            created = await idempotency_cache.run(
+                key, lambda: self._create_or_replay(request, key)
+            )
+        return self._to_response(created)
+
+    async def _create_appointment(
+        self, request: CreateAppointmentRequest, key: IdempotencyKey | None = None
+    ) -> Appointment:
+        end_date = to_epoch_us(request.end_date)
+        if end_date <= to_epoch_us(request.start_date):
             raise ValueError("end_date must be after start_date")
 
-        offering = self._offering_repository.get_by_id(request.offering_id)
+        offering = await self._offering_repository.get_by_id(request.offering_id)
+        self._validate_offering(request.company_id, offering)
+
+        return await self._repository.create(
+            self._new_appointment(request, datetime.now(timezone.utc)), key
+        )
+
+    async def _create_or_replay(
+        self, request: CreateAppointmentRequest, key: IdempotencyKey
+    ) -> Appointment:
+        # Replays are answered before validation: the original request was
+        # valid when it ran, even if (say) the offering has closed since.
+        stored = await self._repository.get_idempotency_key(key.company_id, key.key)
+        if stored is not None:
+            if stored.request_hash != key.request_hash:
+                raise IdempotencyKeyMismatchError(
+                    "Idempotency-Key was already used with a different request"
+                )
+            if stored.appointment is not None:
+                return stored.appointment
+        return await self._create_appointment(request, key)
+
+    @staticmethod
+    def _idempotency_key(
+        request: CreateAppointmentRequest, idempotency_key: str
+    ) -> IdempotencyKey:
+        if not 0 < len(idempotency_key) <= MAX_IDEMPOTENCY_KEY_LENGTH:
+            raise ValueError(
+                f"Idempotency-Key must be 1 to {MAX_IDEMPOTENCY_KEY_LENGTH} characters"
+            )
+        now = to_epoch_us(datetime.now(timezone.utc))
+        return IdempotencyKey(
+            company_id=request.company_id,
+            key=idempotency_key,
+            request_hash=hashlib.sha256(
+                request.model_dump_json().encode("utf-8")
+            ).hexdigest(),
+            expires_at=now + IDEMPOTENCY_KEY_TTL_SECONDS * 1_000_000,
+        )
+
+    async def create_appointments_bulk(
+        self,
+        requests: list[CreateAppointmentRequest],
+        company_id: int | None = None,
+    ) -> BulkCreateAppointmentsResponse:
+        offerings = await self._offering_repository.get_by_ids(
+            [r.offering_id for r in requests]
+        )
+        created_date = datetime.now(timezone.utc)
+
+        results = [BulkAppointmentResult(index=i) for i in range(len(requests))]
+        indexes = []
+        appointments = []
+        for index, request in enumerate(requests):
+            try:
+                if company_id is not None and request.company_id != company_id:
+                    raise ValueError("Appointment does not belong to your company")
+                end_date = to_epoch_us(request.end_date)
+                if end_date <= to_epoch_us(request.start_date):
+                    raise ValueError("end_date must be after start_date")
+                self._validate_offering(
+                    request.company_id, offerings.get(request.offering_id)
+                )
+            except ValueError as e:
+                results[index].error = str(e)
+                continue
+            indexes.append(index)
+            appointments.append(self._new_appointment(request, created_date))
+
+        outcomes = []
+        if appointments:
+            outcomes = await self._repository.create_many(appointments)
+        for index, outcome in zip(indexes, outcomes):
+            if isinstance(outcome, BookingConflictError):
+                results[index].error = str(outcome)
+            else:
+                results[index].appointment = self._to_response(outcome)
+
+        created = sum(1 for r in results if r.appointment is not None)
+        return BulkCreateAppointmentsResponse(
+            created=created,
+            failed=len(results) - created,
+            results=results,
+        )
+
+    @staticmethod
+    def _validate_offering(company_id: int, offering: Offering | None) -> None:
         if offering is None:
             raise ValueError("Offering not found")
         if not offering.is_open:
             raise ValueError("Offering is not available")
-        if offering.company_id != request.company_id:
+        if offering.company_id != company_id:
             raise ValueError("Offering does not belong to the specified company")
 
-        appointment = Appointment(
+    @staticmethod
+    def _new_appointment(
+        request: CreateAppointmentRequest, created_date: datetime
+    ) -> Appointment:
+        return Appointment(
             id=None,
             company_id=request.company_id,
             offering_id=request.offering_id,
@@ -42,36 +193,51 @@ class AppointmentService:
             customer_email=request.customer_email,
             start_date=request.start_date,
             end_date=request.end_date,
-            created_date=datetime.now(timezone.utc),
+            created_date=created_date,
             status=AppointmentStatus.PENDING,
         )
 
-        created = self._repository.create(appointment)
-        return self._to_response(created)
+    async def get_appointment_row(
+        self, appointment_id: int, company_id: int | None = None
+    ) -> AppointmentRow | None:
+        row = await self._repository.get_row_by_id(appointment_id)
+        if row is None:
+            return None
+        if company_id is not None and row.company_id != company_id:
+            return None
+        return row
 
-    def get_appointment(
+    async def get_appointment_version(
         self, appointment_id: int, company_id: int | None = None
-    ) -> AppointmentResponse | None:
-        appointment = self._repository.get_by_id(appointment_id)
-        if appointment is None:
+    ) -> int | None:
+        found = await self._repository.get_version(appointment_id)
+        if found is None:
             return None
-        if company_id is not None and appointment.company_id != company_id:
+        if company_id is not None and found[0] != company_id:
             return None
-        return self._to_response(appointment)
+        return found[1]
 
-    def update_appointment(
+    async def get_appointments_version(self, company_id: int) -> int:
+        return await self._repository.get_company_version(company_id)
+
+    async def update_appointment(
         self,
         appointment_id: int,
         request: UpdateAppointmentRequest,
         company_id: int | None = None,
     ) -> AppointmentResponse | None:
-        appointment = self._repository.get_by_id(appointment_id)
+        appointment = await self._repository.get_by_id(appointment_id)
         if appointment is None:
             return None
         if company_id is not None and appointment.company_id != company_id:
             return None
 
-        if request.offering_id is not None:
+        if (
+            request.offering_id is not None
+            and request.offering_id != appointment.offering_id
+        ):
+            offering = await self._offering_repository.get_by_id(request.offering_id)
+            self._validate_offering(appointment.company_id, offering)
             appointment.offering_id = request.offering_id
         if request.customer_name is not None:
             appointment.customer_name = request.customer_name
@@ -86,20 +252,168 @@ class AppointmentService:
         if request.status is not None:
             appointment.status = request.status
 
-        if appointment.end_date <= appointment.start_date:
+        end_date = to_epoch_us(appointment.end_date)
+        if end_date <= to_epoch_us(appointment.start_date):
             raise ValueError("end_date must be after start_date")
 
-        updated = self._repository.update(appointment)
+        updated = await self._repository.update(appointment)
         return self._to_response(updated)
 
-    def get_all_appointments(
-        self, company_id: int | None = None
-    ) -> list[AppointmentResponse]:
+    async def update_status_batch(
+        self,
+        request: BatchStatusUpdateRequest,
+        company_id: int | None = None,
+    ) -> BatchStatusUpdateResponse:
+        if (request.ids is None) == (request.filter is None):
+            raise ValueError("Provide exactly one of ids or filter")
+
+        filters = request.filter or AppointmentFilter()
         if company_id is not None:
-            appointments = self._repository.get_by_company_id(company_id)
-        else:
-            appointments = self._repository.get_all()
-        return [self._to_response(a) for a in appointments]
+            filters = filters.model_copy(update={"company_id": company_id})
+
+        updated_ids, conflicting_ids = await self._repository.update_status_many(
+            request.status, filters, request.ids
+        )
+        return BatchStatusUpdateResponse(
+            updated=len(updated_ids),
+            updated_ids=updated_ids,
+            conflicting_ids=conflicting_ids,
+        )
+
+    async def list_appointment_rows(
+        self,
+        filters: AppointmentFilter,
+        limit: int = DEFAULT_PAGE_SIZE,
+        cursor: str | None = None,
+    ) -> tuple[list[AppointmentRow], str | None]:
+        after = self._page_start(filters, limit, cursor)
+        rows = await self._repository.get_page_rows(filters, limit + 1, after)
+
+        next_cursor = None
+        if len(rows) > limit:
+            rows = rows[:limit]
+            last = rows[-1]
+            next_cursor = self._encode_cursor(
+                from_epoch_us(last.start_date), last.id
+            )
+        return rows, next_cursor
+
+    def _page_start(
+        self, filters: AppointmentFilter, limit: int, cursor: str | None
+    ) -> tuple[datetime, int] | None:
+        if not 1 <= limit <= MAX_PAGE_SIZE:
+            raise ValueError(f"limit must be between 1 and {MAX_PAGE_SIZE}")
+        if (
+            filters.date_from is not None
+            and filters.date_to is not None
+            and to_epoch_us(filters.date_to) <= to_epoch_us(filters.date_from)
+        ):
+            raise ValueError("date_to must be after date_from")
+        return self._decode_cursor(cursor) if cursor is not None else None
+
+    async def get_appointment_stats(
+        self,
+        company_id: int | None,
+        offering_id: int | None = None,
+        date_from: date | None = None,
+        date_to: date | None = None,
+    ) -> AppointmentStatsResponse:
+        if date_to is None:
+            date_to = datetime.now(timezone.utc).date()
+        if date_from is None:
+            date_from = date_to - timedelta(days=STATS_DEFAULT_DAYS - 1)
+        if date_to < date_from:
+            raise ValueError("date_to must not be before date_from")
+        if (date_to - date_from).days >= STATS_MAX_DAYS:
+            raise ValueError(f"Date range must be at most {STATS_MAX_DAYS} days")
+
+        rows = await self._repository.get_daily_counts(
+            company_id,
+            offering_id,
+            (date_from - _EPOCH_DATE).days,
+            (date_to - _EPOCH_DATE).days,
+        )
+        days: dict[int, AppointmentDayStats] = {}
+        by_status: dict[AppointmentStatus, int] = {}
+        for day, status, count in rows:
+            stats = days.get(day)
+            if stats is None:
+                stats = days[day] = AppointmentDayStats(
+                    day=_EPOCH_DATE + timedelta(days=day), total=0, by_status={}
+                )
+            status = AppointmentStatus(status)
+            stats.total += count
+            stats.by_status[status] = count
+            by_status[status] = by_status.get(status, 0) + count
+        return AppointmentStatsResponse(
+            company_id=company_id,
+            offering_id=offering_id,
+            date_from=date_from,
+            date_to=date_to,
+            total=sum(by_status.values()),
+            by_status=by_status,
+            days=list(days.values()),
+        )
+
+    def export_appointments(
+        self, filters: AppointmentFilter, export_format: ExportFormat
+    ) -> AsyncIterator[str]:
+        batches = self._repository.iter_batches(filters, EXPORT_BATCH_SIZE)
+        if export_format == ExportFormat.CSV:
+            return self._export_csv(batches)
+        return self._export_ndjson(batches)
+
+    async def _export_ndjson(
+        self, batches: AsyncIterator[list[Appointment]]
+    ) -> AsyncIterator[str]:
+        async for batch in batches:
+            yield "".join(
+                json.dumps(self._to_export_record(a)) + "\n" for a in batch
+            )
+
+    async def _export_csv(
+        self, batches: AsyncIterator[list[Appointment]]
+    ) -> AsyncIterator[str]:
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        writer.writerow(EXPORT_FIELDS)
+        yield buffer.getvalue()
+        async for batch in batches:
+            buffer.seek(0)
+            buffer.truncate()
+            writer.writerows(
+                self._to_export_record(a).values() for a in batch
+            )
+            yield buffer.getvalue()
+
+    @staticmethod
+    def _to_export_record(appointment: Appointment) -> dict:
+        return {
+            "id": appointment.id,
+            "company_id": appointment.company_id,
+            "offering_id": appointment.offering_id,
+            "customer_name": appointment.customer_name,
+            "customer_phone": appointment.customer_phone,
+            "customer_email": appointment.customer_email,
+            "start_date": appointment.start_date.isoformat(),
+            "end_date": appointment.end_date.isoformat(),
+            "created_date": appointment.created_date.isoformat(),
+            "status": appointment.status.value,
+        }
+
+    @staticmethod
+    def _encode_cursor(start_date: datetime, appointment_id: int) -> str:
+        raw = json.dumps([start_date.isoformat(), appointment_id]).encode("utf-8")
+        return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+    @staticmethod
+    def _decode_cursor(cursor: str) -> tuple[datetime, int]:
+        try:
+            padded = cursor + "=" * (-len(cursor) % 4)
+            start_date, appointment_id = json.loads(base64.urlsafe_b64decode(padded))
+            return datetime.fromisoformat(start_date), int(appointment_id)
+        except (ValueError, TypeError):
+            raise ValueError("Invalid cursor")
 
     @staticmethod
     def _to_response(appointment: Appointment) -> AppointmentResponse:
@@ -110,8 +424,10 @@ class AppointmentService:
             customer_name=appointment.customer_name,
             customer_phone=appointment.customer_phone,
             customer_email=appointment.customer_email,
-            start_date=appointment.start_date,
-            end_date=appointment.end_date,
-            created_date=appointment.created_date,
+            # Serialize the stored instant, so a write echoes the same UTC
+            # value a later read returns.
+            start_date=from_epoch_us(to_epoch_us(appointment.start_date)),
+            end_date=from_epoch_us(to_epoch_us(appointment.end_date)),
+            created_date=from_epoch_us(to_epoch_us(appointment.created_date)),
             status=appointment.status,
         )
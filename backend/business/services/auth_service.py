@@ -1,9 +1,11 @@
+import time
 from datetime import datetime, timedelta, timezone
 
-import bcrypt
 import jwt
 
-from backend.data_access.repositories.user_repository import UserRepository
+from backend.business.security.password_hasher import password_hasher
+from backend.data_access.repositories.async_user_repository import AsyncUserRepository
+from backend.instrumentation.metrics import jwt_decode_duration
 from backend.models.dtos.auth_dto import (
     LoginRequest,
     RegisterRequest,
@@ -25,16 +27,14 @@ DEFAULT_ADMIN_EMAIL = "admin@appointment-system.com"
 class AuthService:
 
     def __init__(self) -> None:
-        self._repository = UserRepository()
+        self._repository = AsyncUserRepository()
 
-    def seed_default_admin(self) -> None:
-        existing = self._repository.get_by_username(DEFAULT_ADMIN_USERNAME)
+    async def seed_default_admin(self) -> None:
+        existing = await self._repository.get_by_username(DEFAULT_ADMIN_USERNAME)
         if existing is not None:
             return
 
-        password_hash = bcrypt.hashpw(
-            DEFAULT_ADMIN_PASSWORD.encode("utf-8"), bcrypt.gensalt()
-        ).decode("utf-8")
+        password_hash = await password_hasher.hash(DEFAULT_ADMIN_PASSWORD)
 
         admin = User(
             id=None,
@@ -45,23 +45,21 @@ class AuthService:
             company_id=None,
             created_date=datetime.now(timezone.utc),
         )
-        self._repository.create(admin)
+        await self._repository.create(admin)
 
-    def register(self, request: RegisterRequest) -> UserResponse:
-        existing = self._repository.get_by_username(request.username)
+    async def register(self, request: RegisterRequest) -> UserResponse:
+        existing = await self._repository.get_by_username(request.username)
         if existing is not None:
             raise ValueError("Username already exists")
 
-        existing_email = self._repository.get_by_email(request.email)
+        existing_email = await self._repository.get_by_email(request.email)
         if existing_email is not None:
             raise ValueError("Email already exists")
 
         if request.role == Role.COMPANY and request.company_id is None:
             raise ValueError("company_id is required for company role")
 
-        password_hash = bcrypt.hashpw(
-            request.password.encode("utf-8"), bcrypt.gensalt()
-        ).decode("utf-8")
+        password_hash = await password_hasher.hash(request.password)
 
         user = User(
             id=None,
@@ -73,18 +71,15 @@ class AuthService:
             created_date=datetime.now(timezone.utc),
         )
 
-        created = self._repository.create(user)
+        created = await self._repository.create(user)
         return self._to_response(created)
 
-    def login(self, request: LoginRequest) -> TokenResponse:
-        user = self._repository.get_by_username(request.username)
+    async def login(self, request: LoginRequest) -> TokenResponse:
+        user = await self._repository.get_by_username(request.username)
         if user is None:
             raise ValueError("Invalid username or password")
 
-        if not bcrypt.checkpw(
-            request.password.encode("utf-8"),
-            user.password_hash.encode("utf-8"),
-        ):
+        if not await password_hasher.verify(request.password, user.password_hash):
             raise ValueError("Invalid username or password")
 
         token = self._create_access_token(user)
@@ -106,7 +101,11 @@ class AuthService:
 
     @staticmethod
     def decode_token(token: str) -> dict:
-        return jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
+        started = time.perf_counter()
+        try:
+            return jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
+        finally:
+            jwt_decode_duration.observe(time.perf_counter() - started)
 
     @staticmethod
     def _to_response(user: User) -> UserResponse:
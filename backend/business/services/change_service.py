@@ -0,0 +1,78 @@
+from typing import AsyncIterator
+
+from backend.data_access.change_notifier import change_notifier
+from backend.data_access.repositories.async_change_repository import (
+    AsyncChangeRepository,
+)
+from backend.models.dtos.change_dto import ChangeFeedResponse, ChangeResponse
+from backend.models.entities.change import Change
+
+CHANGES_DEFAULT_PAGE_SIZE = 100
+CHANGES_MAX_PAGE_SIZE = 1000
+# An idle stream sends a comment this often so proxies keep the connection
+# open; it also re-reads the feed to catch writes from other processes.
+STREAM_KEEPALIVE_SECONDS = 15.0
+STREAM_RETRY_MILLISECONDS = 3000
+
+
+class ChangeService:
+
+    def __init__(self) -> None:
+        self._repository = AsyncChangeRepository()
+
+    async def list_changes(
+        self, company_id: int, since: int = 0, limit: int = CHANGES_DEFAULT_PAGE_SIZE
+    ) -> ChangeFeedResponse:
+        changes = await self._repository.get_since(company_id, since, limit + 1)
+        has_more = len(changes) > limit
+        changes = changes[:limit]
+        return ChangeFeedResponse(
+            changes=[self._to_response(change) for change in changes],
+            last_seq=changes[-1].seq if changes else since,
+            has_more=has_more,
+        )
+
+    async def stream_changes(
+        self,
+        company_id: int,
+        since: int | None = None,
+        keepalive_seconds: float = STREAM_KEEPALIVE_SECONDS,
+    ) -> AsyncIterator[str]:
+        subscription = change_notifier.subscribe(company_id)
+        try:
+            if since is None:
+                since = await self._repository.get_last_seq(company_id)
+            yield f"retry: {STREAM_RETRY_MILLISECONDS}\n\n"
+            while True:
+                # Clear before reading so a commit landing mid-read still
+                # wakes the next wait.
+                subscription.clear()
+                while True:
+                    changes = await self._repository.get_since(
+                        company_id, since, CHANGES_MAX_PAGE_SIZE
+                    )
+                    for change in changes:
+                        yield self._to_event(change)
+                    if changes:
+                        since = changes[-1].seq
+                    if len(changes) < CHANGES_MAX_PAGE_SIZE:
+                        break
+                if not await subscription.wait(keepalive_seconds):
+                    yield ": keep-alive\n\n"
+        finally:
+            change_notifier.unsubscribe(subscription)
+
+    @staticmethod
+    def _to_event(change: Change) -> str:
+        data = ChangeService._to_response(change).model_dump_json()
+        return f"id: {change.seq}\nevent: change\ndata: {data}\n\n"
+
+    @staticmethod
+    def _to_response(change: Change) -> ChangeResponse:
+        return ChangeResponse(
+            seq=change.seq,
+            entity=change.entity,
+            entity_id=change.entity_id,
+            operation=change.operation,
+            changed_at=change.changed_at,
+        )
@@ -1,20 +1,35 @@
 from datetime import datetime, timezone
 
-from backend.data_access.repositories.offering_repository import OfferingRepository
+from backend.data_access.repositories.async_appointment_repository import (
+    AsyncAppointmentRepository,
+)
+from backend.data_access.repositories.async_offering_repository import (
+    AsyncOfferingRepository,
+)
+from backend.data_access.timestamps import from_epoch_us, to_epoch_us
 from backend.models.dtos.offering_dto import (
+    AvailabilityResponse,
     CreateOfferingRequest,
     OfferingResponse,
+    TimeSlot,
     UpdateOfferingRequest,
 )
 from backend.models.entities.offering import Offering
 
+MAX_AVAILABILITY_DAYS = 366
+MAX_AVAILABILITY_SLOTS = 50_000
+
+_MINUTE_US = 60_000_000
+_DAY_US = 86_400_000_000
+
 
 class OfferingService:
 
     def __init__(self) -> None:
-        self._repository = OfferingRepository()
+        self._repository = AsyncOfferingRepository()
+        self._appointment_repository = AsyncAppointmentRepository()
 
-    def create_offering(
+    async def create_offering(
         self, request: CreateOfferingRequest, company_id: int
     ) -> OfferingResponse:
         offering = Offering(
@@ -24,38 +39,35 @@ class OfferingService:
             is_open=True,
             created_date=datetime.now(timezone.utc),
         )
-        created = self._repository.create(offering)
+        created = await self._repository.create(offering)
         return self._to_response(created)
 
-    def get_offering(
+    async def find_offering(
         self, offering_id: int, company_id: int | None = None
-    ) -> OfferingResponse | None:
-        offering = self._repository.get_by_id(offering_id)
+    ) -> Offering | None:
+        offering = await self._repository.get_by_id(offering_id)
         if offering is None:
             return None
         if company_id is not None and offering.company_id != company_id:
             return None
-        return self._to_response(offering)
+        return offering
+
+    async def get_offerings_version(self, company_id: int) -> int:
+        return await self._repository.get_current_version(company_id)
 
-    def get_offerings_by_company(
-        self, company_id: int
-    ) -> list[OfferingResponse]:
-        offerings = self._repository.get_by_company_id(company_id)
-        return [self._to_response(o) for o in offerings]
+    async def list_company_offerings(self, company_id: int) -> list[Offering]:
+        return await self._repository.get_by_company_id(company_id)
 
-    def get_open_offerings_by_company(
-        self, company_id: int
-    ) -> list[OfferingResponse]:
-        offerings = self._repository.get_open_by_company_id(company_id)
-        return [self._to_response(o) for o in offerings]
+    async def list_open_company_offerings(self, company_id: int) -> list[Offering]:
+        return await self._repository.get_open_by_company_id(company_id)
 
-    def update_offering(
+    async def update_offering(
         self,
         offering_id: int,
         request: UpdateOfferingRequest,
         company_id: int | None = None,
     ) -> OfferingResponse | None:
-        offering = self._repository.get_by_id(offering_id)
+        offering = await self._repository.get_by_id(offering_id)
         if offering is None:
             return None
         if company_id is not None and offering.company_id != company_id:
@@ -66,9 +78,101 @@ class OfferingService:
         if request.is_open is not None:
             offering.is_open = request.is_open
 
-        updated = self._repository.update(offering)
+        updated = await self._repository.update(offering)
         return self._to_response(updated)
 
+    async def get_availability(
+        self,
+        offering_id: int,
+        date_from: datetime,
+        date_to: datetime,
+        slot_minutes: int,
+    ) -> AvailabilityResponse | None:
+        # Compare on epoch values: a naive bound is UTC, so mixing it with an
+        # aware one is valid.
+        window_start = to_epoch_us(date_from)
+        window_end = to_epoch_us(date_to)
+        if window_end <= window_start:
+            raise ValueError("to must be after from")
+        if window_end - window_start > MAX_AVAILABILITY_DAYS * _DAY_US:
+            raise ValueError(
+                f"Availability window cannot exceed {MAX_AVAILABILITY_DAYS} days"
+            )
+        if slot_minutes < 1:
+            raise ValueError("slot must be at least 1 minute")
+        slot = slot_minutes * _MINUTE_US
+        if (window_end - window_start) // slot > MAX_AVAILABILITY_SLOTS:
+            raise ValueError("Too many slots requested; use a larger slot or a shorter window")
+
+        offering = await self._repository.get_by_id(offering_id)
+        if offering is None or not offering.is_open:
+            return None
+
+        booked = await self._appointment_repository.get_booked_intervals(
+            offering_id, date_from, date_to
+        )
+        starts = sorted(to_epoch_us(start) for start, _ in booked)
+        ends = sorted(to_epoch_us(end) for _, end in booked)
+        windows = self._free_windows(starts, ends, window_start, window_end)
+
+        naive = date_from.tzinfo is None
+        return AvailabilityResponse(
+            offering_id=offering_id,
+            slot_minutes=slot_minutes,
+            free_windows=[
+                self._to_slot(start, end, naive) for start, end in windows
+            ],
+            slots=[
+                self._to_slot(start, start + slot, naive)
+                for window in windows
+                for start in self._slot_starts(window, window_start, slot)
+            ],
+        )
+
+    @staticmethod
+    def _free_windows(
+        starts: list[int], ends: list[int], window_start: int, window_end: int
+    ) -> list[tuple[int, int]]:
+        # Sweep the sorted start and end arrays together: the number of
+        # bookings in effect drops to zero exactly where a free window opens.
+        windows = []
+        free_from = window_start
+        active = 0
+        i = j = 0
+        while i < len(starts):
+            if starts[i] < ends[j]:
+                if active == 0 and starts[i] > free_from:
+                    windows.append((free_from, starts[i]))
+                active += 1
+                i += 1
+            else:
+                active -= 1
+                if active == 0:
+                    free_from = max(free_from, ends[j])
+                j += 1
+        if j < len(ends):
+            free_from = max(free_from, ends[-1])
+        if free_from < window_end:
+            windows.append((free_from, window_end))
+        return windows
+
+    @staticmethod
+    def _slot_starts(
+        window: tuple[int, int], grid_origin: int, slot: int
+    ) -> range:
+        window_start, window_end = window
+        first = grid_origin + -(-(window_start - grid_origin) // slot) * slot
+        return range(first, window_end - slot + 1, slot)
+
+    @staticmethod
+    def _to_slot(start: int, end: int, naive: bool) -> TimeSlot:
+        start_date = from_epoch_us(start)
+        end_date = from_epoch_us(end)
+        if naive:
+            start_date = start_date.replace(tzinfo=None)
+            end_date = end_date.replace(tzinfo=None)
+        return TimeSlot(start=start_date, end=end_date)
+
     @staticmethod
     def _to_response(offering: Offering) -> OfferingResponse:
         return OfferingResponse(
@@ -0,0 +1,214 @@
+import asyncio
+import queue
+import sqlite3
+import threading
+import time
+from concurrent.futures import Future
+from dataclasses import dataclass
+
+from backend.data_access.db_context import shard_for_company
+from backend.data_access.db_executor import WRITE_LANES
+from backend.data_access.repositories.appointment_repository import (
+    AppointmentRepository,
+)
+from backend.models.entities.appointment import Appointment
+from backend.models.entities.idempotency_key import IdempotencyKey
+
+# A lane commits as soon as it has GROUP_COMMIT_MAX_BATCH bookings, or
+# GROUP_COMMIT_INTERVAL_SECONDS after the first booking of the batch arrived,
+# whichever comes first. A batch size of 1 commits every booking on its own.
+GROUP_COMMIT_INTERVAL_SECONDS = 0.002
+GROUP_COMMIT_MAX_BATCH = 256
+
+_STOP = object()
+
+
+@dataclass
+class BookingCommitStats:
+    lanes: int
+    pending: int
+    submitted: int
+    batches: int
+    largest_batch: int
+    fallbacks: int
+
+
+class BookingCommitQueue:
+    # Bookings are queued and a writer thread per lane inserts whatever has
+    # accumulated in one transaction, so a rush of bookings shares fsyncs
+    # instead of paying one each. Callers are only answered after that commit
+    # returns, with their own id or error, so a confirmed booking is exactly
+    # as durable as before. Lanes follow db_executor's shard-to-lane mapping.
+
+    def __init__(
+        self,
+        repository: AppointmentRepository | None = None,
+        interval_seconds: float = GROUP_COMMIT_INTERVAL_SECONDS,
+        max_batch: int = GROUP_COMMIT_MAX_BATCH,
+        lanes: int = WRITE_LANES,
+    ) -> None:
+        if max_batch < 1:
+            raise ValueError("max_batch must be at least 1")
+        self._repository = repository or AppointmentRepository()
+        self._interval = interval_seconds
+        self._max_batch = max_batch
+        self._lane_count = lanes
+        self._lanes: dict[int, tuple[queue.SimpleQueue, threading.Thread]] = {}
+        self._lock = threading.Lock()
+        self._pending = 0
+        self._submitted = 0
+        self._batches = 0
+        self._largest_batch = 0
+        self._fallbacks = 0
+        self._closed = False
+
+    def _lane(self, shard: int | None) -> queue.SimpleQueue:
+        number = 0 if shard is None else shard % self._lane_count
+        lane = self._lanes.get(number)
+        if lane is None:
+            with self._lock:
+                lane = self._lanes.get(number)
+                if lane is None:
+                    if self._closed:
+                        raise RuntimeError("booking queue closed")
+                    items: queue.SimpleQueue = queue.SimpleQueue()
+                    thread = threading.Thread(
+                        target=self._drain,
+                        args=(items,),
+                        name=f"booking-commit-{number}",
+                        daemon=True,
+                    )
+                    thread.start()
+                    lane = self._lanes[number] = (items, thread)
+        return lane[0]
+
+    async def submit(
+        self, appointment: Appointment, idempotency_key: IdempotencyKey | None = None
+    ) -> Appointment:
+        future: Future = Future()
+        lane = self._lane(shard_for_company(appointment.company_id))
+        # Enqueue under the lock close() takes, so nothing lands behind _STOP.
+        with self._lock:
+            if self._closed:
+                raise RuntimeError("booking queue closed")
+            self._pending += 1
+            self._submitted += 1
+            lane.put((appointment, idempotency_key, future))
+        return await asyncio.wrap_future(future)
+
+    def _next_batch(self, items: queue.SimpleQueue, first) -> tuple[list, bool]:
+        batch = [first]
+        deadline = time.monotonic() + self._interval
+        while len(batch) < self._max_batch:
+            try:
+                item = items.get_nowait()
+            except queue.Empty:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    item = items.get(timeout=remaining)
+                except queue.Empty:
+                    break
+            if item is _STOP:
+                return batch, True
+            batch.append(item)
+        return batch, False
+
+    def _drain(self, items: queue.SimpleQueue) -> None:
+        stopping = False
+        while not stopping:
+            first = items.get()
+            if first is _STOP:
+                return
+            batch, stopping = self._next_batch(items, first)
+            self._commit(batch)
+
+    def _commit(
+        self, queued: list[tuple[Appointment, IdempotencyKey | None, Future]]
+    ) -> None:
+        with self._lock:
+            self._pending -= len(queued)
+            self._batches += 1
+            self._largest_batch = max(self._largest_batch, len(queued))
+        # Callers that gave up while queued are dropped, not inserted.
+        batch = [item for item in queued if item[2].set_running_or_notify_cancel()]
+        # A lane can carry several shards, and each commits on its own, so a
+        # failure is confined to the shard it happened in.
+        by_shard: dict[int | None, list] = {}
+        for item in batch:
+            by_shard.setdefault(shard_for_company(item[0].company_id), []).append(item)
+        for shard, group in by_shard.items():
+            self._commit_shard(shard, group)
+
+    def _commit_shard(
+        self,
+        shard: int | None,
+        batch: list[tuple[Appointment, IdempotencyKey | None, Future]],
+    ) -> None:
+        appointments = [appointment for appointment, _, _ in batch]
+        keys = [key for _, key, _ in batch]
+        try:
+            results = self._repository.create_many_in_shard(shard, appointments, keys)
+        except sqlite3.IntegrityError:
+            # One bad row rolls back the whole shard batch; retry its
+            # bookings one by one so only that caller gets the error.
+            with self._lock:
+                self._fallbacks += 1
+            results = []
+            for appointment, key in zip(appointments, keys):
+                try:
+                    results.append(self._repository.create(appointment, key))
+                except Exception as e:
+                    results.append(e)
+        except Exception as e:
+            results = [e] * len(batch)
+
+        for (_, _, future), result in zip(batch, results):
+            if isinstance(result, Exception):
+                future.set_exception(result)
+            else:
+                future.set_result(result)
+
+    def queue_depth(self) -> int:
+        with self._lock:
+            return self._pending
+
+    def stats(self) -> BookingCommitStats:
+        with self._lock:
+            return BookingCommitStats(
+                lanes=len(self._lanes),
+                pending=self._pending,
+                submitted=self._submitted,
+                batches=self._batches,
+                largest_batch=self._largest_batch,
+                fallbacks=self._fallbacks,
+            )
+
+    def close(self) -> None:
+        with self._lock:
+            self._closed = True
+            lanes = list(self._lanes.values())
+            self._lanes.clear()
+        for items, _ in lanes:
+            items.put(_STOP)
+        for items, thread in lanes:
+            thread.join()
+            self._fail_remaining(items)
+
+    def _fail_remaining(self, items: queue.SimpleQueue) -> None:
+        while True:
+            try:
+                item = items.get_nowait()
+            except queue.Empty:
+                return
+            if item is _STOP:
+                continue
+            with self._lock:
+                self._pending -= 1
+            future = item[2]
+            if future.set_running_or_notify_cancel():
+                future.set_exception(RuntimeError("booking queue closed"))
+
+
+booking_commits = BookingCommitQueue()
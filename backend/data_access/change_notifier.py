@@ -0,0 +1,89 @@
+import asyncio
+import threading
+from dataclasses import dataclass
+from typing import Iterable
+
+
+@dataclass
+class ChangeNotifierStats:
+    subscribers: int
+    companies: int
+    publishes: int
+    wakeups: int
+
+
+class ChangeSubscription:
+
+    def __init__(self, company_id: int) -> None:
+        self.company_id = company_id
+        self._loop = asyncio.get_running_loop()
+        self._event = asyncio.Event()
+
+    def notify(self) -> None:
+        try:
+            self._loop.call_soon_threadsafe(self._event.set)
+        except RuntimeError:
+            # The subscriber's event loop has already shut down.
+            pass
+
+    def clear(self) -> None:
+        self._event.clear()
+
+    async def wait(self, timeout: float) -> bool:
+        try:
+            await asyncio.wait_for(self._event.wait(), timeout)
+        except asyncio.TimeoutError:
+            return False
+        return True
+
+
+class ChangeNotifier:
+    # Wakes change-feed streams of a company after one of its writes commits
+    # in this process. An idle stream is an Event waiting on the loop, so it
+    # costs no database reads until something changes. Writes made by other
+    # worker processes are picked up when a stream's keep-alive timer fires.
+
+    def __init__(self) -> None:
+        self._subscribers: dict[int, set[ChangeSubscription]] = {}
+        self._lock = threading.Lock()
+        self._publishes = 0
+        self._wakeups = 0
+
+    def subscribe(self, company_id: int) -> ChangeSubscription:
+        subscription = ChangeSubscription(company_id)
+        with self._lock:
+            self._subscribers.setdefault(company_id, set()).add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription: ChangeSubscription) -> None:
+        with self._lock:
+            subscribers = self._subscribers.get(subscription.company_id)
+            if subscribers is None:
+                return
+            subscribers.discard(subscription)
+            if not subscribers:
+                del self._subscribers[subscription.company_id]
+
+    def publish(self, company_ids: Iterable[int]) -> None:
+        with self._lock:
+            self._publishes += 1
+            woken = [
+                subscription
+                for company_id in set(company_ids)
+                for subscription in self._subscribers.get(company_id, ())
+            ]
+            self._wakeups += len(woken)
+        for subscription in woken:
+            subscription.notify()
+
+    def stats(self) -> ChangeNotifierStats:
+        with self._lock:
+            return ChangeNotifierStats(
+                subscribers=sum(len(s) for s in self._subscribers.values()),
+                companies=len(self._subscribers),
+                publishes=self._publishes,
+                wakeups=self._wakeups,
+            )
+
+
+change_notifier = ChangeNotifier()
@@ -1,62 +1,535 @@
 import os
+import queue
+import re
 import sqlite3
+import threading
+import time
+import urllib.parse
+from collections import deque
+from contextlib import contextmanager
+from dataclasses import dataclass
+from typing import Iterator
+
+from backend.data_access.schema_migrator import get_schema_version, migrate
+from backend.instrumentation.sql_trace import current_trace
 
 DB_DIR = "/testbed/db"
 DB_PATH = os.path.join(DB_DIR, "appointment_system.db")
 
+POOL_SIZE = 8
+POOL_TIMEOUT_SECONDS = 30.0
+POOL_HEALTH_CHECK_INTERVAL_SECONDS = 60.0
+WRITER_TIMEOUT_SECONDS = 30.0
+
+# When enabled, each company's offerings and appointments live in their own
+# database file under <DB_DIR>/shards; users stay in the global database.
+SHARDING_ENABLED = False
+SHARD_DIR_NAME = "shards"
+SHARD_POOL_SIZE = 4
+SHARD_ID_BITS = 32
+# Keeps shard-prefixed ids below 2**53 so they survive JSON clients.
+MAX_SHARD_KEY = 2**21 - 1
+
+_SHARD_FILE = re.compile(r"company_(\d+)\.db")
+
+
+@dataclass
+class PoolStats:
+    size: int
+    opened: int
+    idle: int
+    in_use: int
+    checkouts: int
+    waits: int
+    discarded: int
+
 
-def get_connection() -> sqlite3.Connection:
-    os.makedirs(DB_DIR, exist_ok=True)
-    connection = sqlite3.connect(DB_PATH)
-    connection.execute("PRAGMA journal_mode=WAL;")
+@dataclass
+class WriterStats:
+    acquisitions: int
+    waits: int
+    timeouts: int
+    queue_depth: int
+    max_queue_depth: int
+    reopened: int
+
+
+def _open_connection(
+    path: str, timeout: float, read_only: bool = False
+) -> sqlite3.Connection:
+    if read_only:
+        connection = sqlite3.connect(
+            f"file:{urllib.parse.quote(path)}?mode=ro",
+            uri=True,
+            timeout=timeout,
+            check_same_thread=False,
+        )
+        connection.execute("PRAGMA query_only=ON;")
+    else:
+        connection = sqlite3.connect(
+            path, timeout=timeout, check_same_thread=False
+        )
+        connection.execute("PRAGMA journal_mode=WAL;")
     connection.execute("PRAGMA foreign_keys=ON;")
     return connection
 
 
-def initialize_database() -> None:
-    connection = get_connection()
+def _is_healthy(connection: sqlite3.Connection) -> bool:
     try:
-        cursor = connection.cursor()
-        cursor.execute(
-            """
-            CREATE TABLE IF NOT EXISTS users (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                username TEXT NOT NULL UNIQUE,
-                password_hash TEXT NOT NULL,
-                email TEXT NOT NULL UNIQUE,
-                role TEXT NOT NULL DEFAULT 'user',
-                company_id INTEGER,
-                created_date TEXT NOT NULL
-            )
-            """
+        connection.execute("SELECT 1").fetchone()
+        return True
+    except sqlite3.Error:
+        return False
+
+
+class ConnectionPool:
+
+    def __init__(
+        self,
+        path: str,
+        size: int = POOL_SIZE,
+        timeout: float = POOL_TIMEOUT_SECONDS,
+        health_check_interval: float = POOL_HEALTH_CHECK_INTERVAL_SECONDS,
+        read_only: bool = False,
+    ) -> None:
+        if size < 1:
+            raise ValueError("Pool size must be at least 1")
+        self._path = path
+        self._size = size
+        self._read_only = read_only
+        self._timeout = timeout
+        self._health_check_interval = health_check_interval
+        self._idle: queue.LifoQueue[tuple[sqlite3.Connection, float]] = (
+            queue.LifoQueue()
         )
-        cursor.execute(
-            """
-            CREATE TABLE IF NOT EXISTS offerings (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                company_id INTEGER NOT NULL,
-                description TEXT NOT NULL,
-                is_open INTEGER NOT NULL DEFAULT 1,
-                created_date TEXT NOT NULL
+        self._lock = threading.Lock()
+        self._opened = 0
+        self._in_use = 0
+        self._checkouts = 0
+        self._waits = 0
+        self._discarded = 0
+        self._closed = False
+
+    def _open(self) -> sqlite3.Connection:
+        return _open_connection(self._path, self._timeout, self._read_only)
+
+    def _discard(self, connection: sqlite3.Connection) -> None:
+        try:
+            connection.close()
+        except sqlite3.Error:
+            pass
+        with self._lock:
+            self._opened -= 1
+            self._discarded += 1
+
+    def _reserve_slot(self) -> bool:
+        with self._lock:
+            if self._opened < self._size:
+                self._opened += 1
+                return True
+            return False
+
+    def _take(self) -> sqlite3.Connection:
+        try:
+            connection, released_at = self._idle.get_nowait()
+        except queue.Empty:
+            if self._reserve_slot():
+                try:
+                    return self._open()
+                except Exception:
+                    with self._lock:
+                        self._opened -= 1
+                    raise
+            with self._lock:
+                self._waits += 1
+            try:
+                connection, released_at = self._idle.get(timeout=self._timeout)
+            except queue.Empty:
+                raise sqlite3.OperationalError(
+                    "Timed out waiting for a pooled database connection"
+                )
+
+        if time.monotonic() - released_at >= self._health_check_interval:
+            if not _is_healthy(connection):
+                self._discard(connection)
+                return self._take()
+        return connection
+
+    def acquire(self) -> sqlite3.Connection:
+        if self._closed:
+            raise sqlite3.ProgrammingError("Connection pool is closed")
+        connection = self._take()
+        with self._lock:
+            self._in_use += 1
+            self._checkouts += 1
+        return connection
+
+    def release(self, connection: sqlite3.Connection) -> None:
+        with self._lock:
+            self._in_use -= 1
+        if self._closed:
+            self._discard(connection)
+            return
+        try:
+            if connection.in_transaction:
+                connection.rollback()
+        except sqlite3.Error:
+            self._discard(connection)
+            return
+        self._idle.put((connection, time.monotonic()))
+
+    @contextmanager
+    def connection(self) -> Iterator[sqlite3.Connection]:
+        connection = self.acquire()
+        try:
+            yield connection
+        finally:
+            self.release(connection)
+
+    @contextmanager
+    def detached(self) -> Iterator[sqlite3.Connection]:
+        # A connection to the same database that does not count against the
+        # pool, for long-running readers that would otherwise pin a slot.
+        connection = self._open()
+        try:
+            yield connection
+        finally:
+            connection.close()
+
+    def health_check(self) -> int:
+        checked = []
+        while True:
+            try:
+                connection, _ = self._idle.get_nowait()
+            except queue.Empty:
+                break
+            if _is_healthy(connection):
+                checked.append(connection)
+            else:
+                self._discard(connection)
+        now = time.monotonic()
+        for connection in checked:
+            self._idle.put((connection, now))
+        return len(checked)
+
+    def stats(self) -> PoolStats:
+        with self._lock:
+            return PoolStats(
+                size=self._size,
+                opened=self._opened,
+                idle=self._idle.qsize(),
+                in_use=self._in_use,
+                checkouts=self._checkouts,
+                waits=self._waits,
+                discarded=self._discarded,
             )
-            """
+
+    def close(self) -> None:
+        self._closed = True
+        while True:
+            try:
+                connection, _ = self._idle.get_nowait()
+            except queue.Empty:
+                break
+            self._discard(connection)
+
+
+class DatabaseWriter:
+
+    def __init__(self, path: str, timeout: float = WRITER_TIMEOUT_SECONDS) -> None:
+        self._path = path
+        self._timeout = timeout
+        self._connection: sqlite3.Connection | None = None
+        self._lock = threading.Lock()
+        self._busy = False
+        self._waiters: deque[threading.Event] = deque()
+        self._acquisitions = 0
+        self._waits = 0
+        self._timeouts = 0
+        self._max_queue_depth = 0
+        self._reopened = 0
+        self._closed = False
+
+    def _enter_queue(self) -> None:
+        with self._lock:
+            if not self._busy and not self._waiters:
+                self._busy = True
+                return
+            turn = threading.Event()
+            self._waiters.append(turn)
+            self._waits += 1
+            self._max_queue_depth = max(self._max_queue_depth, len(self._waiters))
+
+        if turn.wait(self._timeout):
+            return
+        with self._lock:
+            if turn.is_set():
+                return
+            self._waiters.remove(turn)
+            self._timeouts += 1
+        raise sqlite3.OperationalError(
+            "Timed out waiting for the database writer"
         )
-        cursor.execute(
-            """
-            CREATE TABLE IF NOT EXISTS appointments (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                company_id INTEGER NOT NULL,
-                offering_id INTEGER NOT NULL,
-                customer_name TEXT NOT NULL,
-                customer_phone TEXT NOT NULL,
-                customer_email TEXT NOT NULL,
-                start_date TEXT NOT NULL,
-                end_date TEXT NOT NULL,
-                created_date TEXT NOT NULL,
-                status TEXT NOT NULL DEFAULT 'pending'
+
+    def _leave_queue(self) -> None:
+        with self._lock:
+            if self._waiters:
+                self._waiters.popleft().set()
+            else:
+                self._busy = False
+
+    def _ensure_connection(self) -> sqlite3.Connection:
+        if self._connection is None:
+            self._connection = _open_connection(self._path, self._timeout)
+        return self._connection
+
+    def _reset_connection(self) -> None:
+        if self._connection is not None:
+            try:
+                self._connection.close()
+            except sqlite3.Error:
+                pass
+        self._connection = None
+        self._reopened += 1
+
+    def acquire(self) -> sqlite3.Connection:
+        if self._closed:
+            raise sqlite3.ProgrammingError("Database writer is closed")
+        self._enter_queue()
+        try:
+            connection = self._ensure_connection()
+        except Exception:
+            self._leave_queue()
+            raise
+        self._acquisitions += 1
+        return connection
+
+    def release(self, connection: sqlite3.Connection) -> None:
+        try:
+            if connection.in_transaction:
+                connection.rollback()
+        except sqlite3.Error:
+            self._reset_connection()
+        finally:
+            self._leave_queue()
+
+    @contextmanager
+    def connection(self) -> Iterator[sqlite3.Connection]:
+        connection = self.acquire()
+        try:
+            yield connection
+        finally:
+            self.release(connection)
+
+    def health_check(self) -> bool:
+        with self.connection() as connection:
+            if _is_healthy(connection):
+                return True
+            self._reset_connection()
+            return False
+
+    def queue_depth(self) -> int:
+        with self._lock:
+            return len(self._waiters)
+
+    def stats(self) -> WriterStats:
+        with self._lock:
+            return WriterStats(
+                acquisitions=self._acquisitions,
+                waits=self._waits,
+                timeouts=self._timeouts,
+                queue_depth=len(self._waiters),
+                max_queue_depth=self._max_queue_depth,
+                reopened=self._reopened,
             )
+
+    def close(self) -> None:
+        with self.connection():
+            self._closed = True
+            if self._connection is not None:
+                self._connection.close()
+                self._connection = None
+
+
+_reader_pool: ConnectionPool | None = None
+_writer: DatabaseWriter | None = None
+_shards: dict[int, "_Shard"] = {}
+_lock = threading.Lock()
+
+
+@dataclass
+class _Shard:
+    writer: DatabaseWriter
+    reader_pool: ConnectionPool
+
+
+def shard_for_company(company_id: int) -> int | None:
+    if not SHARDING_ENABLED:
+        return None
+    return company_id
+
+
+def shard_for_id(row_id: int) -> int | None:
+    # Each shard's AUTOINCREMENT counters start at company_id << SHARD_ID_BITS,
+    # so offering and appointment ids identify their shard.
+    if not SHARDING_ENABLED:
+        return None
+    return row_id >> SHARD_ID_BITS
+
+
+def group_ids_by_shard(row_ids: list[int]) -> dict[int | None, list[int]]:
+    groups: dict[int | None, list[int]] = {}
+    for row_id in row_ids:
+        groups.setdefault(shard_for_id(row_id), []).append(row_id)
+    return groups
+
+
+def _shard_dir() -> str:
+    return os.path.join(os.path.dirname(DB_PATH), SHARD_DIR_NAME)
+
+
+def _shard_path(shard: int) -> str:
+    return os.path.join(_shard_dir(), f"company_{shard}.db")
+
+
+def shard_keys() -> list[int | None]:
+    if not SHARDING_ENABLED:
+        return [None]
+    try:
+        names = os.listdir(_shard_dir())
+    except FileNotFoundError:
+        return []
+    keys = []
+    for name in names:
+        match = _SHARD_FILE.fullmatch(name)
+        if match is not None:
+            keys.append(int(match.group(1)))
+    return sorted(keys)
+
+
+def _initialize_shard(connection: sqlite3.Connection, shard: int) -> None:
+    # Existing shards are migrated by initialize_database() and manage.py,
+    # like the global database; only a brand-new file is brought up here.
+    if get_schema_version(connection) == 0:
+        migrate(connection)
+    first_id = shard << SHARD_ID_BITS
+    connection.execute("BEGIN IMMEDIATE")
+    for table in ("offerings", "appointments"):
+        connection.execute(
             """
+            INSERT INTO sqlite_sequence (name, seq)
+            SELECT ?, ? WHERE NOT EXISTS (SELECT 1 FROM sqlite_sequence WHERE name = ?)
+            """,
+            (table, first_id, table),
+        )
+    connection.commit()
+
+
+def _get_shard(shard: int, create: bool) -> _Shard | None:
+    existing = _shards.get(shard)
+    if existing is not None:
+        return existing
+    path = _shard_path(shard)
+    if not create and not os.path.exists(path):
+        return None
+    if not 0 <= shard <= MAX_SHARD_KEY:
+        raise ValueError("company_id is out of range")
+    with _lock:
+        existing = _shards.get(shard)
+        if existing is not None:
+            return existing
+        os.makedirs(_shard_dir(), exist_ok=True)
+        writer = DatabaseWriter(path)
+        with writer.connection() as connection:
+            _initialize_shard(connection, shard)
+        _shards[shard] = _Shard(
+            writer=writer,
+            reader_pool=ConnectionPool(path, size=SHARD_POOL_SIZE, read_only=True),
         )
-        connection.commit()
-    finally:
-        connection.close()
+        return _shards[shard]
+
+
+def get_writer(shard: int | None = None) -> DatabaseWriter:
+    global _writer
+    if shard is not None:
+        return _get_shard(shard, create=True).writer
+    if _writer is None:
+        with _lock:
+            if _writer is None:
+                os.makedirs(os.path.dirname(DB_PATH), exist_ok=True)
+                _writer = DatabaseWriter(DB_PATH)
+    return _writer
+
+
+def get_reader_pool(shard: int | None = None) -> ConnectionPool:
+    global _reader_pool
+    if shard is not None:
+        existing = _get_shard(shard, create=False)
+        # A tenant without a shard file has no rows yet. The global database
+        # has the same (in sharding mode, tenant-free) tables, so reading it
+        # returns the same empty results without creating a file per lookup.
+        if existing is not None:
+            return existing.reader_pool
+    if _reader_pool is None:
+        get_writer()
+        with _lock:
+            if _reader_pool is None:
+                _reader_pool = ConnectionPool(DB_PATH, read_only=True)
+    return _reader_pool
+
+
+def close_connections() -> None:
+    global _reader_pool, _writer
+    with _lock:
+        if _reader_pool is not None:
+            _reader_pool.close()
+            _reader_pool = None
+        if _writer is not None:
+            _writer.close()
+            _writer = None
+        for shard in _shards.values():
+            shard.reader_pool.close()
+            shard.writer.close()
+        _shards.clear()
+
+
+@contextmanager
+def read_connection(shard: int | None = None) -> Iterator[sqlite3.Connection]:
+    with get_reader_pool(shard).connection() as connection:
+        trace = current_trace()
+        if trace is None:
+            yield connection
+        else:
+            with trace.attached(connection):
+                yield connection
+
+
+@contextmanager
+def stream_connection(shard: int | None = None) -> Iterator[sqlite3.Connection]:
+    with get_reader_pool(shard).detached() as connection:
+        trace = current_trace()
+        if trace is None:
+            yield connection
+        else:
+            with trace.attached(connection):
+                yield connection
+
+
+@contextmanager
+def write_connection(shard: int | None = None) -> Iterator[sqlite3.Connection]:
+    with get_writer(shard).connection() as connection:
+        trace = current_trace()
+        if trace is None:
+            yield connection
+        else:
+            with trace.attached(connection):
+                yield connection
+
+
+def initialize_database() -> None:
+    with write_connection() as connection:
+        migrate(connection)
+    for shard in shard_keys():
+        if shard is not None:
+            with write_connection(shard) as connection:
+                migrate(connection)
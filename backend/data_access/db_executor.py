@@ -0,0 +1,98 @@
+import asyncio
+import contextvars
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Callable, TypeVar
+
+from backend.data_access.db_context import POOL_SIZE
+
+WRITE_LANES = 8
+
+T = TypeVar("T")
+
+
+@dataclass
+class DatabaseExecutorStats:
+    read_workers: int
+    write_lanes: int
+    pending_reads: int
+    pending_writes: int
+    completed_reads: int
+    completed_writes: int
+
+
+class DatabaseExecutor:
+    # Reads fan out over as many threads as there are pooled reader
+    # connections. Writes go to a dedicated thread per lane, matching the
+    # single writer connection of each database, so they queue here instead of
+    # blocking request threads. Unsharded writes all use lane 0; with sharding,
+    # each shard maps to a fixed lane so tenants write in parallel.
+    # Work runs in a copy of the caller's context so per-request SQL tracing
+    # follows it onto the executor threads.
+
+    def __init__(
+        self, read_workers: int = POOL_SIZE, write_lanes: int = WRITE_LANES
+    ) -> None:
+        self._read_workers = read_workers
+        self._read_executor = ThreadPoolExecutor(
+            max_workers=read_workers, thread_name_prefix="db-read"
+        )
+        self._write_executors = [
+            ThreadPoolExecutor(max_workers=1, thread_name_prefix=f"db-write-{lane}")
+            for lane in range(write_lanes)
+        ]
+        self._lock = threading.Lock()
+        self._pending_reads = 0
+        self._pending_writes = 0
+        self._completed_reads = 0
+        self._completed_writes = 0
+
+    async def read(self, work: Callable[..., T], *args) -> T:
+        with self._lock:
+            self._pending_reads += 1
+        try:
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(
+                self._read_executor, contextvars.copy_context().run, work, *args
+            )
+        finally:
+            with self._lock:
+                self._pending_reads -= 1
+                self._completed_reads += 1
+
+    async def write(
+        self, work: Callable[..., T], *args, shard: int | None = None
+    ) -> T:
+        executor = self._write_executors[
+            0 if shard is None else shard % len(self._write_executors)
+        ]
+        with self._lock:
+            self._pending_writes += 1
+        try:
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(
+                executor, contextvars.copy_context().run, work, *args
+            )
+        finally:
+            with self._lock:
+                self._pending_writes -= 1
+                self._completed_writes += 1
+
+    def write_queue_depth(self) -> int:
+        with self._lock:
+            return self._pending_writes
+
+    def stats(self) -> DatabaseExecutorStats:
+        with self._lock:
+            return DatabaseExecutorStats(
+                read_workers=self._read_workers,
+                write_lanes=len(self._write_executors),
+                pending_reads=self._pending_reads,
+                pending_writes=self._pending_writes,
+                completed_reads=self._completed_reads,
+                completed_writes=self._completed_writes,
+            )
+
+
+db_executor = DatabaseExecutor()
@@ -0,0 +1,6 @@
+class BookingConflictError(ValueError):
+    pass
+
+
+class IdempotencyKeyMismatchError(ValueError):
+    pass
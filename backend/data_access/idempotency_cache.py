@@ -0,0 +1,137 @@
+import asyncio
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, replace
+from typing import Awaitable, Callable
+
+from backend.data_access.exceptions import IdempotencyKeyMismatchError
+from backend.models.entities.appointment import Appointment
+from backend.models.entities.idempotency_key import IdempotencyKey
+
+IDEMPOTENCY_CACHE_SIZE = 10_000
+
+
+@dataclass
+class IdempotencyCacheStats:
+    size: int
+    max_size: int
+    in_flight: int
+    hits: int
+    misses: int
+    coalesced: int
+    evictions: int
+    expirations: int
+
+
+def _check_request(expected_hash: str, idempotency_key: IdempotencyKey) -> None:
+    if expected_hash != idempotency_key.request_hash:
+        raise IdempotencyKeyMismatchError(
+            "Idempotency-Key was already used with a different request"
+        )
+
+
+class IdempotencyCache:
+    # Front cache for the idempotency_keys table. Recent replays are answered
+    # from memory, and requests that arrive while the first one with the same
+    # key is still running wait for its result instead of inserting again.
+    # In-flight tracking is per process; the write transaction re-checks the
+    # table, so concurrent workers still create at most one appointment.
+
+    def __init__(self, max_size: int = IDEMPOTENCY_CACHE_SIZE) -> None:
+        self._max_size = max_size
+        self._entries: OrderedDict[tuple[int, str], tuple[str, Appointment, int]] = (
+            OrderedDict()
+        )
+        self._in_flight: dict[tuple[int, str], tuple[str, asyncio.Future]] = {}
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+        self._coalesced = 0
+        self._evictions = 0
+        self._expirations = 0
+
+    def _cached(self, claim: tuple[int, str]) -> tuple[str, Appointment] | None:
+        with self._lock:
+            entry = self._entries.get(claim)
+            if entry is None:
+                self._misses += 1
+                return None
+            request_hash, appointment, expires_at = entry
+            if expires_at <= time.time() * 1_000_000:
+                del self._entries[claim]
+                self._expirations += 1
+                self._misses += 1
+                return None
+            self._entries.move_to_end(claim)
+            self._hits += 1
+            return request_hash, appointment
+
+    def _store(self, idempotency_key: IdempotencyKey, appointment: Appointment) -> None:
+        claim = (idempotency_key.company_id, idempotency_key.key)
+        with self._lock:
+            self._entries[claim] = (
+                idempotency_key.request_hash,
+                replace(appointment),
+                idempotency_key.expires_at,
+            )
+            self._entries.move_to_end(claim)
+            while len(self._entries) > self._max_size:
+                self._entries.popitem(last=False)
+                self._evictions += 1
+
+    async def run(
+        self,
+        idempotency_key: IdempotencyKey,
+        create: Callable[[], Awaitable[Appointment]],
+    ) -> Appointment:
+        claim = (idempotency_key.company_id, idempotency_key.key)
+        cached = self._cached(claim)
+        if cached is not None:
+            _check_request(cached[0], idempotency_key)
+            return replace(cached[1])
+
+        pending = self._in_flight.get(claim)
+        if pending is not None:
+            _check_request(pending[0], idempotency_key)
+            with self._lock:
+                self._coalesced += 1
+            return replace(await asyncio.shield(pending[1]))
+
+        future = asyncio.get_running_loop().create_future()
+        self._in_flight[claim] = (idempotency_key.request_hash, future)
+        try:
+            appointment = await create()
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except BaseException as e:
+            future.set_exception(e)
+            # Mark it retrieved: there may be no coalesced waiters.
+            future.exception()
+            raise
+        finally:
+            del self._in_flight[claim]
+        self._store(idempotency_key, appointment)
+        future.set_result(appointment)
+        return replace(appointment)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> IdempotencyCacheStats:
+        with self._lock:
+            return IdempotencyCacheStats(
+                size=len(self._entries),
+                max_size=self._max_size,
+                in_flight=len(self._in_flight),
+                hits=self._hits,
+                misses=self._misses,
+                coalesced=self._coalesced,
+                evictions=self._evictions,
+                expirations=self._expirations,
+            )
+
+
+idempotency_cache = IdempotencyCache()
@@ -0,0 +1,99 @@
+import bisect
+import sqlite3
+from collections import OrderedDict
+
+INTERVAL_INDEX_MAX_OFFERINGS = 1024
+
+
+class _OfferingIntervals:
+    __slots__ = ("starts", "ends", "max_ends")
+
+    def __init__(self, intervals: list[tuple]) -> None:
+        self.starts = [start for start, _ in intervals]
+        self.ends = [end for _, end in intervals]
+        self.max_ends: list = []
+        self._rebuild_max_ends(0)
+
+    def _rebuild_max_ends(self, position: int) -> None:
+        del self.max_ends[position:]
+        running = self.max_ends[-1] if self.max_ends else None
+        for end in self.ends[position:]:
+            running = end if running is None or end > running else running
+            self.max_ends.append(running)
+
+    def overlaps(self, start, end) -> bool:
+        # Every interval starting before `end` is a candidate; the running
+        # maximum of their ends tells whether any of them reaches past `start`.
+        position = bisect.bisect_left(self.starts, end)
+        return position > 0 and self.max_ends[position - 1] > start
+
+    def add(self, start, end) -> None:
+        position = bisect.bisect_right(self.starts, start)
+        self.starts.insert(position, start)
+        self.ends.insert(position, end)
+        self._rebuild_max_ends(position)
+
+
+class BookingIntervalIndex:
+    # Only used while holding the writer connection, which serializes access.
+
+    def __init__(self, max_offerings: int = INTERVAL_INDEX_MAX_OFFERINGS) -> None:
+        self._max_offerings = max_offerings
+        self._offerings: OrderedDict[int, _OfferingIntervals] = OrderedDict()
+        self._data_version: int | None = None
+
+    def sync(self, connection: sqlite3.Connection) -> None:
+        # data_version changes whenever another connection (e.g. another
+        # worker process) commits, which may have added bookings we never saw.
+        data_version = connection.execute("PRAGMA data_version").fetchone()[0]
+        if data_version != self._data_version:
+            self._offerings.clear()
+            self._data_version = data_version
+
+    def get(
+        self, connection: sqlite3.Connection, offering_id: int
+    ) -> _OfferingIntervals:
+        intervals = self._offerings.get(offering_id)
+        if intervals is not None:
+            self._offerings.move_to_end(offering_id)
+            return intervals
+
+        cursor = connection.execute(
+            """
+            SELECT start_date, end_date FROM appointments
+            WHERE offering_id = ?
+              AND status NOT IN ('cancelled', 'deleted')
+              AND status <> 'denied'
+            ORDER BY start_date
+            """,
+            (offering_id,),
+        )
+        intervals = _OfferingIntervals(cursor.fetchall())
+        self._offerings[offering_id] = intervals
+        if len(self._offerings) > self._max_offerings:
+            self._offerings.popitem(last=False)
+        return intervals
+
+    def add(self, offering_id: int, start, end) -> None:
+        intervals = self._offerings.get(offering_id)
+        if intervals is not None:
+            intervals.add(start, end)
+
+    def invalidate(self, *offering_ids: int) -> None:
+        for offering_id in offering_ids:
+            self._offerings.pop(offering_id, None)
+
+    def clear(self) -> None:
+        self._offerings.clear()
+        self._data_version = None
+
+
+_indexes: dict[int | None, BookingIntervalIndex] = {}
+
+
+def booking_intervals(shard: int | None = None) -> BookingIntervalIndex:
+    # One index per database: each is only touched under that database's writer.
+    index = _indexes.get(shard)
+    if index is None:
+        index = _indexes.setdefault(shard, BookingIntervalIndex())
+    return index
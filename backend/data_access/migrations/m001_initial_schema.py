@@ -0,0 +1,52 @@
+import sqlite3
+
+DESCRIPTION = "Create users, offerings and appointments tables"
+
+
+def up(connection: sqlite3.Connection) -> None:
+    connection.execute(
+        """
+        CREATE TABLE IF NOT EXISTS users (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            username TEXT NOT NULL UNIQUE,
+            password_hash TEXT NOT NULL,
+            email TEXT NOT NULL UNIQUE,
+            role TEXT NOT NULL DEFAULT 'user',
+            company_id INTEGER,
+            created_date TEXT NOT NULL
+        )
+        """
+    )
+    connection.execute(
+        """
+        CREATE TABLE IF NOT EXISTS offerings (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            company_id INTEGER NOT NULL,
+            description TEXT NOT NULL,
+            is_open INTEGER NOT NULL DEFAULT 1,
+            created_date TEXT NOT NULL
+        )
+        """
+    )
+    connection.execute(
+        """
+        CREATE TABLE IF NOT EXISTS appointments (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            company_id INTEGER NOT NULL,
+            offering_id INTEGER NOT NULL,
+            customer_name TEXT NOT NULL,
+            customer_phone TEXT NOT NULL,
+            customer_email TEXT NOT NULL,
+            start_date TEXT NOT NULL,
+            end_date TEXT NOT NULL,
+            created_date TEXT NOT NULL,
+            status TEXT NOT NULL DEFAULT 'pending'
+        )
+        """
+    )
+
+
+def down(connection: sqlite3.Connection) -> None:
+    connection.execute("DROP TABLE IF EXISTS appointments")
+    connection.execute("DROP TABLE IF EXISTS offerings")
+    connection.execute("DROP TABLE IF EXISTS users")
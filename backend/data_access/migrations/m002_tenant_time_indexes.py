@@ -0,0 +1,38 @@
+import sqlite3
+
+DESCRIPTION = "Index appointments and offerings by tenant and time"
+
+
+def up(connection: sqlite3.Connection) -> None:
+    connection.execute(
+        """
+        CREATE INDEX IF NOT EXISTS idx_appointments_company_start
+        ON appointments (company_id, start_date)
+        """
+    )
+    connection.execute(
+        """
+        CREATE INDEX IF NOT EXISTS idx_appointments_offering_range
+        ON appointments (offering_id, start_date, end_date)
+        """
+    )
+    connection.execute(
+        """
+        CREATE INDEX IF NOT EXISTS idx_appointments_offering_active
+        ON appointments (offering_id, start_date, end_date)
+        WHERE status NOT IN ('cancelled', 'deleted')
+        """
+    )
+    connection.execute(
+        """
+        CREATE INDEX IF NOT EXISTS idx_offerings_company_open
+        ON offerings (company_id, is_open)
+        """
+    )
+
+
+def down(connection: sqlite3.Connection) -> None:
+    connection.execute("DROP INDEX IF EXISTS idx_offerings_company_open")
+    connection.execute("DROP INDEX IF EXISTS idx_appointments_offering_active")
+    connection.execute("DROP INDEX IF EXISTS idx_appointments_offering_range")
+    connection.execute("DROP INDEX IF EXISTS idx_appointments_company_start")
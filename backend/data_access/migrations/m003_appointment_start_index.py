@@ -0,0 +1,16 @@
+import sqlite3
+
+DESCRIPTION = "Index appointments by start_date for cross-tenant keyset pages"
+
+
+def up(connection: sqlite3.Connection) -> None:
+    connection.execute(
+        """
+        CREATE INDEX IF NOT EXISTS idx_appointments_start
+        ON appointments (start_date)
+        """
+    )
+
+
+def down(connection: sqlite3.Connection) -> None:
+    connection.execute("DROP INDEX IF EXISTS idx_appointments_start")
@@ -0,0 +1,18 @@
+import sqlite3
+
+DESCRIPTION = "Track a per-company offerings version for cache coherence"
+
+
+def up(connection: sqlite3.Connection) -> None:
+    connection.execute(
+        """
+        CREATE TABLE IF NOT EXISTS company_versions (
+            company_id INTEGER PRIMARY KEY,
+            offerings_version INTEGER NOT NULL DEFAULT 0
+        )
+        """
+    )
+
+
+def down(connection: sqlite3.Connection) -> None:
+    connection.execute("DROP TABLE IF EXISTS company_versions")
@@ -0,0 +1,92 @@
+import sqlite3
+from datetime import datetime, timedelta, timezone
+
+DESCRIPTION = "Store appointment timestamps as integer UTC epoch microseconds"
+
+_EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+_BATCH_SIZE = 5000
+
+
+def _iso_to_epoch_us(value: str) -> int:
+    parsed = datetime.fromisoformat(value)
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=timezone.utc)
+    delta = parsed - _EPOCH
+    return (delta.days * 86_400 + delta.seconds) * 1_000_000 + delta.microseconds
+
+
+def _epoch_us_to_iso(value: int) -> str:
+    return (_EPOCH + timedelta(0, 0, value)).isoformat()
+
+
+def _rebuild(
+    connection: sqlite3.Connection, column_type: str, convert
+) -> None:
+    sequence = connection.execute(
+        "SELECT seq FROM sqlite_sequence WHERE name = 'appointments'"
+    ).fetchone()
+    connection.execute(
+        f"""
+        CREATE TABLE appointments_rebuilt (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            company_id INTEGER NOT NULL,
+            offering_id INTEGER NOT NULL,
+            customer_name TEXT NOT NULL,
+            customer_phone TEXT NOT NULL,
+            customer_email TEXT NOT NULL,
+            start_date {column_type} NOT NULL,
+            end_date {column_type} NOT NULL,
+            created_date {column_type} NOT NULL,
+            status TEXT NOT NULL DEFAULT 'pending'
+        )
+        """
+    )
+    source = connection.execute("SELECT * FROM appointments ORDER BY id")
+    while True:
+        rows = source.fetchmany(_BATCH_SIZE)
+        if not rows:
+            break
+        connection.executemany(
+            "INSERT INTO appointments_rebuilt VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            [
+                (*row[:6], convert(row[6]), convert(row[7]), convert(row[8]), row[9])
+                for row in rows
+            ],
+        )
+    connection.execute("DROP TABLE appointments")
+    connection.execute("ALTER TABLE appointments_rebuilt RENAME TO appointments")
+    if sequence is not None:
+        updated = connection.execute(
+            "UPDATE sqlite_sequence SET seq = ? WHERE name = 'appointments'",
+            (sequence[0],),
+        )
+        if updated.rowcount == 0:
+            connection.execute(
+                "INSERT INTO sqlite_sequence (name, seq) VALUES ('appointments', ?)",
+                (sequence[0],),
+            )
+
+    connection.execute(
+        "CREATE INDEX idx_appointments_company_start ON appointments (company_id, start_date)"
+    )
+    connection.execute(
+        "CREATE INDEX idx_appointments_offering_range ON appointments (offering_id, start_date, end_date)"
+    )
+    connection.execute(
+        """
+        CREATE INDEX idx_appointments_offering_active
+        ON appointments (offering_id, start_date, end_date)
+        WHERE status NOT IN ('cancelled', 'deleted')
+        """
+    )
+    connection.execute(
+        "CREATE INDEX idx_appointments_start ON appointments (start_date)"
+    )
+
+
+def up(connection: sqlite3.Connection) -> None:
+    _rebuild(connection, "INTEGER", _iso_to_epoch_us)
+
+
+def down(connection: sqlite3.Connection) -> None:
+    _rebuild(connection, "TEXT", _epoch_us_to_iso)
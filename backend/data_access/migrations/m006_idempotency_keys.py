@@ -0,0 +1,28 @@
+import sqlite3
+
+DESCRIPTION = "Remember Idempotency-Key headers of created appointments"
+
+
+def up(connection: sqlite3.Connection) -> None:
+    connection.execute(
+        """
+        CREATE TABLE IF NOT EXISTS idempotency_keys (
+            company_id INTEGER NOT NULL,
+            idempotency_key TEXT NOT NULL,
+            request_hash TEXT NOT NULL,
+            appointment_id INTEGER NOT NULL,
+            expires_at INTEGER NOT NULL,
+            PRIMARY KEY (company_id, idempotency_key)
+        ) WITHOUT ROWID
+        """
+    )
+    connection.execute(
+        """
+        CREATE INDEX IF NOT EXISTS idx_idempotency_keys_expires
+        ON idempotency_keys (expires_at)
+        """
+    )
+
+
+def down(connection: sqlite3.Connection) -> None:
+    connection.execute("DROP TABLE IF EXISTS idempotency_keys")
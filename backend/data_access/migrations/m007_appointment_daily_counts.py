@@ -0,0 +1,37 @@
+import sqlite3
+
+DESCRIPTION = "Keep per-company appointment counts by offering, day and status"
+
+_DAY_US = 86_400_000_000
+
+
+def up(connection: sqlite3.Connection) -> None:
+    connection.execute(
+        """
+        CREATE TABLE IF NOT EXISTS appointment_daily_counts (
+            company_id INTEGER NOT NULL,
+            day INTEGER NOT NULL,
+            offering_id INTEGER NOT NULL,
+            status TEXT NOT NULL,
+            count INTEGER NOT NULL,
+            PRIMARY KEY (company_id, day, offering_id, status)
+        ) WITHOUT ROWID
+        """
+    )
+    # day is the UTC day of start_date, counted from 1970-01-01 (floor
+    # division, so it stays correct before the epoch too).
+    connection.execute(
+        f"""
+        INSERT INTO appointment_daily_counts
+            (company_id, day, offering_id, status, count)
+        SELECT company_id,
+               (start_date - ((start_date % {_DAY_US}) + {_DAY_US}) % {_DAY_US}) / {_DAY_US},
+               offering_id, status, COUNT(*)
+        FROM appointments
+        GROUP BY 1, 2, 3, 4
+        """
+    )
+
+
+def down(connection: sqlite3.Connection) -> None:
+    connection.execute("DROP TABLE IF EXISTS appointment_daily_counts")
@@ -0,0 +1,28 @@
+import sqlite3
+
+DESCRIPTION = "Record a sequenced change feed of appointment and offering writes"
+
+
+def up(connection: sqlite3.Connection) -> None:
+    connection.execute(
+        """
+        CREATE TABLE IF NOT EXISTS changes (
+            seq INTEGER PRIMARY KEY AUTOINCREMENT,
+            company_id INTEGER NOT NULL,
+            entity TEXT NOT NULL,
+            entity_id INTEGER NOT NULL,
+            operation TEXT NOT NULL,
+            changed_at INTEGER NOT NULL
+        )
+        """
+    )
+    connection.execute(
+        """
+        CREATE INDEX IF NOT EXISTS idx_changes_company_seq
+        ON changes (company_id, seq)
+        """
+    )
+
+
+def down(connection: sqlite3.Connection) -> None:
+    connection.execute("DROP TABLE IF EXISTS changes")
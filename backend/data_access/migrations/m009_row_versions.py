@@ -0,0 +1,24 @@
+import sqlite3
+
+DESCRIPTION = "Version appointment and offering rows and per-company appointments for ETags"
+
+
+def up(connection: sqlite3.Connection) -> None:
+    connection.execute(
+        "ALTER TABLE appointments ADD COLUMN version INTEGER NOT NULL DEFAULT 1"
+    )
+    connection.execute(
+        "ALTER TABLE offerings ADD COLUMN version INTEGER NOT NULL DEFAULT 1"
+    )
+    connection.execute(
+        """
+        ALTER TABLE company_versions
+        ADD COLUMN appointments_version INTEGER NOT NULL DEFAULT 0
+        """
+    )
+
+
+def down(connection: sqlite3.Connection) -> None:
+    connection.execute("ALTER TABLE company_versions DROP COLUMN appointments_version")
+    connection.execute("ALTER TABLE offerings DROP COLUMN version")
+    connection.execute("ALTER TABLE appointments DROP COLUMN version")
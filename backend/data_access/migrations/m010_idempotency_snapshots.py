@@ -0,0 +1,26 @@
+import sqlite3
+
+DESCRIPTION = "Keep the originally created appointment with each Idempotency-Key"
+
+
+def up(connection: sqlite3.Connection) -> None:
+    connection.execute("ALTER TABLE idempotency_keys ADD COLUMN appointment TEXT")
+    # Existing keys only have the current row to go on.
+    connection.execute(
+        """
+        UPDATE idempotency_keys
+        SET appointment = (
+            SELECT json_array(
+                id, company_id, offering_id, customer_name, customer_phone,
+                customer_email, start_date, end_date, created_date, status,
+                version
+            )
+            FROM appointments
+            WHERE appointments.id = idempotency_keys.appointment_id
+        )
+        """
+    )
+
+
+def down(connection: sqlite3.Connection) -> None:
+    connection.execute("ALTER TABLE idempotency_keys DROP COLUMN appointment")
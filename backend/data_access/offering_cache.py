@@ -0,0 +1,196 @@
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, replace
+from typing import Any, Callable
+
+from backend.data_access.repositories.offering_repository import OfferingRepository
+from backend.models.entities.offering import Offering
+
+OFFERING_CACHE_SIZE = 4096
+OFFERING_CACHE_TTL_SECONDS = 300.0
+OFFERING_VERSION_POLL_SECONDS = 1.0
+
+
+@dataclass
+class OfferingCacheStats:
+    size: int
+    max_size: int
+    hits: int
+    misses: int
+    stale: int
+    evictions: int
+    version_polls: int
+
+
+class OfferingCache:
+    # Entries are tagged with their company's offerings_version. Writes in
+    # this process advance the version immediately; writes from other workers
+    # are picked up by re-reading the version at most once per poll interval.
+
+    def __init__(
+        self,
+        max_size: int = OFFERING_CACHE_SIZE,
+        ttl: float = OFFERING_CACHE_TTL_SECONDS,
+        poll_interval: float = OFFERING_VERSION_POLL_SECONDS,
+    ) -> None:
+        self._max_size = max_size
+        self._ttl = ttl
+        self._poll_interval = poll_interval
+        self._entries: OrderedDict[tuple, tuple[Any, int, int, float]] = OrderedDict()
+        self._versions: dict[int, tuple[int, float]] = {}
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+        self._stale = 0
+        self._evictions = 0
+        self._version_polls = 0
+
+    def _store_version(self, company_id: int, version: int) -> None:
+        with self._lock:
+            known = self._versions.get(company_id)
+            if known is not None:
+                version = max(version, known[0])
+            self._versions[company_id] = (version, time.monotonic())
+            self._version_polls += 1
+
+    def company_version(
+        self, company_id: int, load_version: Callable[[int], int]
+    ) -> int:
+        with self._lock:
+            known = self._versions.get(company_id)
+        if known is not None and time.monotonic() - known[1] < self._poll_interval:
+            return known[0]
+        self._store_version(company_id, load_version(company_id))
+        return self._versions[company_id][0]
+
+    def refresh_version(
+        self, company_id: int, load_version: Callable[[int], int]
+    ) -> None:
+        self._store_version(company_id, load_version(company_id))
+
+    def get(self, key: tuple, current_version: Callable[[int], int]) -> Any | None:
+        with self._lock:
+            entry = self._entries.get(key)
+        if entry is None:
+            with self._lock:
+                self._misses += 1
+            return None
+        value, company_id, version, expires_at = entry
+        if expires_at <= time.monotonic() or version != current_version(company_id):
+            with self._lock:
+                if self._entries.get(key) is entry:
+                    del self._entries[key]
+                self._stale += 1
+                self._misses += 1
+            return None
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+            self._hits += 1
+        return value
+
+    def put(self, key: tuple, value: Any, company_id: int, version: int) -> None:
+        with self._lock:
+            known = self._versions.get(company_id)
+            if known is None or known[0] < version:
+                self._versions[company_id] = (version, time.monotonic())
+            self._entries[key] = (
+                value,
+                company_id,
+                version,
+                time.monotonic() + self._ttl,
+            )
+            self._entries.move_to_end(key)
+            while len(self._entries) > self._max_size:
+                self._entries.popitem(last=False)
+                self._evictions += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._versions.clear()
+
+    def stats(self) -> OfferingCacheStats:
+        with self._lock:
+            return OfferingCacheStats(
+                size=len(self._entries),
+                max_size=self._max_size,
+                hits=self._hits,
+                misses=self._misses,
+                stale=self._stale,
+                evictions=self._evictions,
+                version_polls=self._version_polls,
+            )
+
+
+offering_cache = OfferingCache()
+
+
+class CachedOfferingRepository(OfferingRepository):
+
+    def __init__(self, cache: OfferingCache = offering_cache) -> None:
+        self._cache = cache
+
+    def _version(self, company_id: int) -> int:
+        return self._cache.company_version(company_id, self.get_company_version)
+
+    def get_current_version(self, company_id: int) -> int:
+        # The version cached lists are validated against, so an ETag built
+        # from it is never newer than the list served with it.
+        return self._version(company_id)
+
+    def create(self, offering: Offering) -> Offering:
+        created = super().create(offering)
+        self._cache.refresh_version(created.company_id, self.get_company_version)
+        return created
+
+    def update(self, offering: Offering) -> Offering:
+        updated = super().update(offering)
+        self._cache.refresh_version(updated.company_id, self.get_company_version)
+        return updated
+
+    def get_by_id(self, offering_id: int) -> Offering | None:
+        return self.get_by_ids([offering_id]).get(offering_id)
+
+    def get_by_ids(self, offering_ids: list[int]) -> dict[int, Offering]:
+        offerings = {}
+        missing = []
+        for offering_id in dict.fromkeys(offering_ids):
+            cached = self._cache.get(("id", offering_id), self._version)
+            if cached is not None:
+                offerings[offering_id] = replace(cached)
+            else:
+                missing.append(offering_id)
+        if missing:
+            # Rows come back together with their company's version from the
+            # same statement, so an entry is never tagged newer than its data.
+            for offering, version in self.get_by_ids_with_versions(missing):
+                self._cache.put(
+                    ("id", offering.id), replace(offering), offering.company_id, version
+                )
+                offerings[offering.id] = offering
+        return offerings
+
+    def _get_company_list(
+        self, key: tuple, company_id: int, load: Callable[[int], list[Offering]]
+    ) -> list[Offering]:
+        cached = self._cache.get(key, self._version)
+        if cached is not None:
+            return [replace(o) for o in cached]
+        # Take the version before loading so the entry is tagged no newer
+        # than the data it holds.
+        version = self._version(company_id)
+        offerings = load(company_id)
+        self._cache.put(key, [replace(o) for o in offerings], company_id, version)
+        return offerings
+
+    def get_by_company_id(self, company_id: int) -> list[Offering]:
+        return self._get_company_list(
+            ("company", company_id), company_id, super().get_by_company_id
+        )
+
+    def get_open_by_company_id(self, company_id: int) -> list[Offering]:
+        return self._get_company_list(
+            ("open", company_id), company_id, super().get_open_by_company_id
+        )
@@ -1,41 +1,451 @@
-from backend.data_access.db_context import get_connection
+import heapq
+import json
+import sqlite3
+from collections import Counter
+from datetime import datetime, timezone
+from itertools import islice
+from typing import Callable, Iterable, Iterator, TypeVar
+
+from backend.data_access.change_notifier import change_notifier
+from backend.data_access.db_context import (
+    group_ids_by_shard,
+    read_connection,
+    shard_for_company,
+    shard_for_id,
+    shard_keys,
+    stream_connection,
+    write_connection,
+)
+from backend.data_access.exceptions import (
+    BookingConflictError,
+    IdempotencyKeyMismatchError,
+)
+from backend.data_access.interval_index import BookingIntervalIndex, booking_intervals
+from backend.data_access.repositories.change_repository import record_changes
+from backend.data_access.row_types import AppointmentRow, row_factory
+from backend.data_access.timestamps import from_epoch_us, to_epoch_us
+from backend.models.dtos.appointment_dto import AppointmentFilter
 from backend.models.entities.appointment import Appointment
+from backend.models.entities.idempotency_key import IdempotencyKey
+from backend.models.enums.appointment_status import AppointmentStatus
+from backend.models.enums.change_entity import ChangeEntity
+from backend.models.enums.change_operation import ChangeOperation
+
+BLOCKING_STATUSES = (AppointmentStatus.PENDING, AppointmentStatus.APPROVED)
+
+_MAX_IN_PARAMS = 900
+
+IDEMPOTENCY_PURGE_INTERVAL_US = 60 * 1_000_000
+
+DAY_US = 86_400_000_000
+
+_DAY_SQL = f"(start_date - ((start_date % {DAY_US}) + {DAY_US}) % {DAY_US}) / {DAY_US}"
+
+_INSERT_SQL = """
+    INSERT INTO appointments
+        (company_id, offering_id, customer_name, customer_phone,
+         customer_email, start_date, end_date, created_date, status)
+    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+"""
+
+_appointment_row = row_factory(AppointmentRow)
+
+_next_key_purge: dict[int | None, int] = {}
+
+T = TypeVar("T")
+
+
+def _to_entity(row: tuple) -> Appointment:
+    return Appointment(
+        id=row[0],
+        company_id=row[1],
+        offering_id=row[2],
+        customer_name=row[3],
+        customer_phone=row[4],
+        customer_email=row[5],
+        start_date=from_epoch_us(row[6]),
+        end_date=from_epoch_us(row[7]),
+        created_date=from_epoch_us(row[8]),
+        status=AppointmentStatus(row[9]),
+        version=row[10],
+    )
+
+
+def _snapshot(appointment: Appointment) -> str:
+    return json.dumps(
+        (appointment.id,)
+        + AppointmentRepository._insert_params(appointment)
+        + (appointment.version,)
+    )
+
+
+def _from_snapshot(snapshot: str | None) -> Appointment | None:
+    return None if snapshot is None else _to_entity(json.loads(snapshot))
+
+
+def epoch_day(epoch_us: int) -> int:
+    return epoch_us // DAY_US
+
+
+def rebuild_daily_counts(connection: sqlite3.Connection) -> int:
+    connection.execute("DELETE FROM appointment_daily_counts")
+    cursor = connection.execute(
+        f"""
+        INSERT INTO appointment_daily_counts
+            (company_id, day, offering_id, status, count)
+        SELECT company_id, {_DAY_SQL}, offering_id, status, COUNT(*)
+        FROM appointments
+        GROUP BY 1, 2, 3, 4
+        """
+    )
+    return cursor.rowcount
+
+
+def _count_key(
+    company_id: int, offering_id: int, start_date: int, status: str
+) -> tuple[int, int, int, str]:
+    return company_id, epoch_day(start_date), offering_id, status
+
+
+def _by_start(item: Appointment | AppointmentRow) -> tuple:
+    return item.start_date, item.id
+
+
+def _merge_sorted(
+    pages: list[Iterable[T]], key: Callable[[T], tuple], limit: int | None = None
+) -> list[T]:
+    if len(pages) == 1:
+        return list(islice(pages[0], limit))
+    return list(islice(heapq.merge(*pages, key=key), limit))
 
 
 class AppointmentRepository:
 
-    def create(self, appointment: Appointment) -> Appointment:
-        connection = get_connection()
-        try:
-            cursor = connection.cursor()
-            cursor.execute(
+    @staticmethod
+    def _insert_params(appointment: Appointment) -> tuple:
+        return (
+            appointment.company_id,
+            appointment.offering_id,
+            appointment.customer_name,
+            appointment.customer_phone,
+            appointment.customer_email,
+            to_epoch_us(appointment.start_date),
+            to_epoch_us(appointment.end_date),
+            to_epoch_us(appointment.created_date),
+            appointment.status.value,
+        )
+
+    @staticmethod
+    def _overlaps_booking(
+        connection: sqlite3.Connection,
+        intervals: BookingIntervalIndex,
+        offering_id: int,
+        start: int,
+        end: int,
+        exclude_id: int | None = None,
+    ) -> bool:
+        if not intervals.get(connection, offering_id).overlaps(start, end):
+            return False
+        if exclude_id is None:
+            return True
+        # The index cannot exclude the appointment being moved, so confirm
+        # the overlap against the table.
+        cursor = connection.execute(
+            """
+            SELECT id FROM appointments
+            WHERE offering_id = ?
+              AND status NOT IN ('cancelled', 'deleted')
+              AND status <> 'denied'
+              AND start_date < ? AND end_date > ?
+              AND id <> ?
+            LIMIT 1
+            """,
+            (offering_id, end, start, exclude_id),
+        )
+        return cursor.fetchone() is not None
+
+    def _ensure_slot_free(
+        self,
+        connection: sqlite3.Connection,
+        intervals: BookingIntervalIndex,
+        appointment: Appointment,
+    ) -> None:
+        if appointment.status not in BLOCKING_STATUSES:
+            return
+        if self._overlaps_booking(
+            connection,
+            intervals,
+            appointment.offering_id,
+            to_epoch_us(appointment.start_date),
+            to_epoch_us(appointment.end_date),
+            appointment.id,
+        ):
+            raise BookingConflictError(
+                "The offering is already booked for the requested time"
+            )
+
+    def create(
+        self,
+        appointment: Appointment,
+        idempotency_key: IdempotencyKey | None = None,
+    ) -> Appointment:
+        [result] = self.create_many_in_shard(
+            shard_for_company(appointment.company_id), [appointment], [idempotency_key]
+        )
+        if isinstance(result, Exception):
+            raise result
+        return result
+
+    def create_many(
+        self,
+        appointments: list[Appointment],
+        idempotency_keys: list[IdempotencyKey | None] | None = None,
+    ) -> list[Appointment | ValueError]:
+        if idempotency_keys is None:
+            idempotency_keys = [None] * len(appointments)
+        positions: dict[int | None, list[int]] = {}
+        for position, appointment in enumerate(appointments):
+            positions.setdefault(shard_for_company(appointment.company_id), []).append(
+                position
+            )
+        results: list[Appointment | ValueError | None] = [None] * len(appointments)
+        for shard, shard_positions in positions.items():
+            shard_results = self.create_many_in_shard(
+                shard,
+                [appointments[position] for position in shard_positions],
+                [idempotency_keys[position] for position in shard_positions],
+            )
+            for position, result in zip(shard_positions, shard_results):
+                results[position] = result
+        return results
+
+    @staticmethod
+    def _apply_daily_counts(
+        cursor: sqlite3.Cursor, deltas: Counter[tuple[int, int, int, str]]
+    ) -> None:
+        changes = [(*key, delta) for key, delta in deltas.items() if delta]
+        if not changes:
+            return
+        cursor.executemany(
+            """
+            INSERT INTO appointment_daily_counts
+                (company_id, day, offering_id, status, count)
+            VALUES (?, ?, ?, ?, ?)
+            ON CONFLICT (company_id, day, offering_id, status)
+            DO UPDATE SET count = count + excluded.count
+            """,
+            changes,
+        )
+        cursor.executemany(
+            """
+            DELETE FROM appointment_daily_counts
+            WHERE company_id = ? AND day = ? AND offering_id = ? AND status = ?
+              AND count <= 0
+            """,
+            [change[:4] for change in changes if change[4] < 0],
+        )
+
+    @staticmethod
+    def _bump_company_versions(
+        cursor: sqlite3.Cursor, company_ids: Iterable[int]
+    ) -> None:
+        cursor.executemany(
+            """
+            INSERT INTO company_versions (company_id, appointments_version)
+            VALUES (?, 1)
+            ON CONFLICT (company_id)
+            DO UPDATE SET appointments_version = appointments_version + 1
+            """,
+            [(company_id,) for company_id in set(company_ids)],
+        )
+
+    @staticmethod
+    def _purge_expired_keys(
+        connection: sqlite3.Connection, shard: int | None, now: int
+    ) -> None:
+        if _next_key_purge.get(shard, 0) > now:
+            return
+        _next_key_purge[shard] = now + IDEMPOTENCY_PURGE_INTERVAL_US
+        connection.execute("DELETE FROM idempotency_keys WHERE expires_at <= ?", (now,))
+
+    @staticmethod
+    def _claimed_in_batch(
+        claimed: dict[tuple[int, str], tuple[str, Appointment]],
+        claim: tuple[int, str],
+        idempotency_key: IdempotencyKey,
+    ) -> Appointment | None:
+        entry = claimed.get(claim)
+        if entry is None:
+            return None
+        if entry[0] != idempotency_key.request_hash:
+            raise IdempotencyKeyMismatchError(
+                "Idempotency-Key was already used with a different request"
+            )
+        return entry[1]
+
+    @staticmethod
+    def _replayed_appointment(
+        connection: sqlite3.Connection, idempotency_key: IdempotencyKey, now: int
+    ) -> Appointment | None:
+        row = connection.execute(
+            """
+            SELECT request_hash, appointment
+            FROM idempotency_keys
+            WHERE company_id = ? AND idempotency_key = ? AND expires_at > ?
+            """,
+            (idempotency_key.company_id, idempotency_key.key, now),
+        ).fetchone()
+        if row is None:
+            return None
+        if row[0] != idempotency_key.request_hash:
+            raise IdempotencyKeyMismatchError(
+                "Idempotency-Key was already used with a different request"
+            )
+        # Replays answer with the appointment as it was created, not as it
+        # is now, so the cached and stored paths agree.
+        return _from_snapshot(row[1])
+
+    def create_many_in_shard(
+        self,
+        shard: int | None,
+        appointments: list[Appointment],
+        idempotency_keys: list[IdempotencyKey | None],
+    ) -> list[Appointment | ValueError]:
+        results: list[Appointment | ValueError] = []
+        accepted: list[Appointment] = []
+        keyed: list[tuple[IdempotencyKey, Appointment]] = []
+        claimed: dict[tuple[int, str], tuple[str, Appointment]] = {}
+        intervals = booking_intervals(shard)
+        with write_connection(shard) as connection:
+            connection.execute("BEGIN IMMEDIATE")
+            intervals.sync(connection)
+            try:
+                now = to_epoch_us(datetime.now(timezone.utc))
+                if any(idempotency_keys):
+                    self._purge_expired_keys(connection, shard, now)
+                for appointment, idempotency_key in zip(appointments, idempotency_keys):
+                    if idempotency_key is not None:
+                        claim = (idempotency_key.company_id, idempotency_key.key)
+                        try:
+                            replayed = self._claimed_in_batch(
+                                claimed, claim, idempotency_key
+                            ) or self._replayed_appointment(
+                                connection, idempotency_key, now
+                            )
+                        except IdempotencyKeyMismatchError as e:
+                            results.append(e)
+                            continue
+                        if replayed is not None:
+                            results.append(replayed)
+                            continue
+                    try:
+                        self._ensure_slot_free(connection, intervals, appointment)
+                    except BookingConflictError as e:
+                        results.append(e)
+                        continue
+                    # Record accepted items right away so later items in the
+                    # same batch are checked against them too.
+                    if appointment.status in BLOCKING_STATUSES:
+                        intervals.add(
+                            appointment.offering_id,
+                            to_epoch_us(appointment.start_date),
+                            to_epoch_us(appointment.end_date),
+                        )
+                    if idempotency_key is not None:
+                        claimed[claim] = (idempotency_key.request_hash, appointment)
+                        keyed.append((idempotency_key, appointment))
+                    accepted.append(appointment)
+                    results.append(appointment)
+
+                cursor = connection.cursor()
+                cursor.executemany(
+                    _INSERT_SQL, [self._insert_params(a) for a in accepted]
+                )
+                last_id = connection.execute("SELECT last_insert_rowid()").fetchone()[0]
+                # The writer holds the write lock for the whole batch, so the
+                # AUTOINCREMENT ids of the inserted rows are consecutive.
+                first_id = last_id - len(accepted) + 1
+                for offset, appointment in enumerate(accepted):
+                    appointment.id = first_id + offset
+                self._apply_daily_counts(
+                    cursor,
+                    Counter(
+                        _count_key(
+                            a.company_id,
+                            a.offering_id,
+                            to_epoch_us(a.start_date),
+                            a.status.value,
+                        )
+                        for a in accepted
+                    ),
+                )
+                # Keys are stored in the same transaction as their appointment,
+                # so a retry can never find the row without its key or the
+                # key without its row.
+                cursor.executemany(
+                    """
+                    INSERT OR REPLACE INTO idempotency_keys
+                        (company_id, idempotency_key, request_hash,
+                         appointment_id, expires_at, appointment)
+                    VALUES (?, ?, ?, ?, ?, ?)
+                    """,
+                    [
+                        (
+                            key.company_id,
+                            key.key,
+                            key.request_hash,
+                            appointment.id,
+                            key.expires_at,
+                            _snapshot(appointment),
+                        )
+                        for key, appointment in keyed
+                    ],
+                )
+                record_changes(
+                    cursor,
+                    ChangeEntity.APPOINTMENT,
+                    ChangeOperation.CREATED,
+                    [(a.company_id, a.id) for a in accepted],
+                )
+                self._bump_company_versions(cursor, (a.company_id for a in accepted))
+                connection.commit()
+            except Exception:
+                intervals.invalidate(*{a.offering_id for a in accepted})
+                for appointment in accepted:
+                    appointment.id = None
+                raise
+        for key, appointment in keyed:
+            key.appointment_id = appointment.id
+        if accepted:
+            change_notifier.publish(a.company_id for a in accepted)
+        return results
+
+    def get_idempotency_key(
+        self, company_id: int, key: str
+    ) -> IdempotencyKey | None:
+        now = to_epoch_us(datetime.now(timezone.utc))
+        with read_connection(shard_for_company(company_id)) as connection:
+            row = connection.execute(
                 """
-                INSERT INTO appointments
-                    (company_id, offering_id, customer_name, customer_phone,
-                     customer_email, start_date, end_date, created_date, status)
-                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+                SELECT request_hash, appointment_id, expires_at, appointment
+                FROM idempotency_keys
+                WHERE company_id = ? AND idempotency_key = ? AND expires_at > ?
                 """,
-                (
-                    appointment.company_id,
-                    appointment.offering_id,
-                    appointment.customer_name,
-                    appointment.customer_phone,
-                    appointment.customer_email,
-                    appointment.start_date.isoformat(),
-                    appointment.end_date.isoformat(),
-                    appointment.created_date.isoformat(),
-                    appointment.status.value,
-                ),
-            )
-            connection.commit()
-            appointment.id = cursor.lastrowid
-            return appointment
-        finally:
-            connection.close()
+                (company_id, key, now),
+            ).fetchone()
+        if row is None:
+            return None
+        return IdempotencyKey(
+            company_id=company_id,
+            key=key,
+            request_hash=row[0],
+            expires_at=row[2],
+            appointment_id=row[1],
+            appointment=_from_snapshot(row[3]),
+        )
 
     def get_by_id(self, appointment_id: int) -> Appointment | None:
-        connection = get_connection()
-        try:
+        with read_connection(shard_for_id(appointment_id)) as connection:
             cursor = connection.cursor()
             cursor.execute(
                 "SELECT * FROM appointments WHERE id = ?", (appointment_id,)
@@ -43,43 +453,239 @@ class AppointmentRepository:
             row = cursor.fetchone()
             if row is None:
                 return None
-            return Appointment.from_row(row)
-        finally:
-            connection.close()
+            return _to_entity(row)
 
-    def get_all(self) -> list[Appointment]:
-        connection = get_connection()
-        try:
+    def get_row_by_id(self, appointment_id: int) -> AppointmentRow | None:
+        with read_connection(shard_for_id(appointment_id)) as connection:
             cursor = connection.cursor()
-            cursor.execute("SELECT * FROM appointments")
-            rows = cursor.fetchall()
-            return [Appointment.from_row(row) for row in rows]
-        finally:
-            connection.close()
+            cursor.row_factory = _appointment_row
+            cursor.execute(
+                "SELECT * FROM appointments WHERE id = ?", (appointment_id,)
+            )
+            return cursor.fetchone()
 
-    def get_by_company_id(self, company_id: int) -> list[Appointment]:
-        connection = get_connection()
+    def get_version(self, appointment_id: int) -> tuple[int, int] | None:
+        with read_connection(shard_for_id(appointment_id)) as connection:
+            return connection.execute(
+                "SELECT company_id, version FROM appointments WHERE id = ?",
+                (appointment_id,),
+            ).fetchone()
+
+    def get_company_version(self, company_id: int) -> int:
+        with read_connection(shard_for_company(company_id)) as connection:
+            row = connection.execute(
+                "SELECT appointments_version FROM company_versions WHERE company_id = ?",
+                (company_id,),
+            ).fetchone()
+            return 0 if row is None else row[0]
+
+    @staticmethod
+    def _filter_clauses(filters: AppointmentFilter) -> tuple[list[str], list]:
+        clauses = []
+        params: list = []
+        if filters.company_id is not None:
+            clauses.append("company_id = ?")
+            params.append(filters.company_id)
+        if filters.offering_id is not None:
+            clauses.append("offering_id = ?")
+            params.append(filters.offering_id)
+        if filters.status is not None:
+            clauses.append("status = ?")
+            params.append(filters.status.value)
+        if filters.customer_email is not None:
+            clauses.append("customer_email = ?")
+            params.append(filters.customer_email)
+        if filters.date_from is not None:
+            clauses.append("start_date >= ?")
+            params.append(to_epoch_us(filters.date_from))
+        if filters.date_to is not None:
+            clauses.append("start_date < ?")
+            params.append(to_epoch_us(filters.date_to))
+        return clauses, params
+
+    @staticmethod
+    def _shards_for(filters: AppointmentFilter) -> list[int | None]:
+        if filters.company_id is not None:
+            return [shard_for_company(filters.company_id)]
+        if filters.offering_id is not None:
+            return [shard_for_id(filters.offering_id)]
+        return shard_keys()
+
+    @staticmethod
+    def _select(clauses: list[str]) -> str:
+        query = "SELECT * FROM appointments"
+        if clauses:
+            query += " WHERE " + " AND ".join(clauses)
+        return query + " ORDER BY start_date, id"
+
+    def _page_query(
+        self,
+        filters: AppointmentFilter,
+        limit: int,
+        after: tuple[datetime, int] | None,
+    ) -> tuple[str, list]:
+        clauses, params = self._filter_clauses(filters)
+        if after is not None:
+            clauses.append("(start_date, id) > (?, ?)")
+            params.extend((to_epoch_us(after[0]), after[1]))
+        params.append(limit)
+        return self._select(clauses) + " LIMIT ?", params
+
+    def get_page(
+        self,
+        filters: AppointmentFilter,
+        limit: int,
+        after: tuple[datetime, int] | None = None,
+    ) -> list[Appointment]:
+        query, params = self._page_query(filters, limit, after)
+        pages = []
+        for shard in self._shards_for(filters):
+            with read_connection(shard) as connection:
+                cursor = connection.cursor()
+                cursor.execute(query, params)
+                pages.append([_to_entity(row) for row in cursor.fetchall()])
+        return _merge_sorted(pages, _by_start, limit)
+
+    def get_page_rows(
+        self,
+        filters: AppointmentFilter,
+        limit: int,
+        after: tuple[datetime, int] | None = None,
+    ) -> list[AppointmentRow]:
+        query, params = self._page_query(filters, limit, after)
+        pages = []
+        for shard in self._shards_for(filters):
+            with read_connection(shard) as connection:
+                cursor = connection.cursor()
+                cursor.row_factory = _appointment_row
+                cursor.execute(query, params)
+                pages.append(cursor.fetchall())
+        return _merge_sorted(pages, _by_start, limit)
+
+    def iter_batches(
+        self, filters: AppointmentFilter, batch_size: int
+    ) -> Iterator[list[Appointment]]:
+        clauses, params = self._filter_clauses(filters)
+        query = self._select(clauses)
+        shards = self._shards_for(filters)
+        if len(shards) == 1:
+            yield from self._iter_shard_batches(shards[0], query, params, batch_size)
+            return
+
+        # Each shard streams in (start_date, id) order; merge them lazily so
+        # only one batch per shard is held in memory.
+        streams = [
+            self._iter_shard_batches(shard, query, params, batch_size)
+            for shard in shards
+        ]
         try:
+            merged = heapq.merge(
+                *(
+                    (appointment for batch in stream for appointment in batch)
+                    for stream in streams
+                ),
+                key=_by_start,
+            )
+            while True:
+                batch = list(islice(merged, batch_size))
+                if not batch:
+                    return
+                yield batch
+        finally:
+            for stream in streams:
+                stream.close()
+
+    @staticmethod
+    def _iter_shard_batches(
+        shard: int | None, query: str, params: list, batch_size: int
+    ) -> Iterator[list[Appointment]]:
+        # Exports can stream for as long as the client keeps reading, so they
+        # use their own connection instead of holding one of the pool's.
+        with stream_connection(shard) as connection:
+            cursor = connection.cursor()
+            cursor.execute(query, params)
+            while True:
+                rows = cursor.fetchmany(batch_size)
+                if not rows:
+                    return
+                yield [_to_entity(row) for row in rows]
+
+    def get_booked_intervals(
+        self, offering_id: int, date_from: datetime, date_to: datetime
+    ) -> list[tuple[datetime, datetime]]:
+        with read_connection(shard_for_id(offering_id)) as connection:
             cursor = connection.cursor()
             cursor.execute(
-                "SELECT * FROM appointments WHERE company_id = ?", (company_id,)
+                """
+                SELECT start_date, end_date FROM appointments
+                WHERE offering_id = ?
+                  AND status NOT IN ('cancelled', 'deleted')
+                  AND status <> 'denied'
+                  AND start_date < ? AND end_date > ?
+                ORDER BY start_date
+                """,
+                (offering_id, to_epoch_us(date_to), to_epoch_us(date_from)),
             )
-            rows = cursor.fetchall()
-            return [Appointment.from_row(row) for row in rows]
-        finally:
-            connection.close()
+            return [
+                (from_epoch_us(start), from_epoch_us(end))
+                for start, end in cursor.fetchall()
+            ]
+
+    def get_daily_counts(
+        self,
+        company_id: int | None,
+        offering_id: int | None,
+        day_from: int,
+        day_to: int,
+    ) -> list[tuple[int, str, int]]:
+        clauses = ["day BETWEEN ? AND ?"]
+        params: list = [day_from, day_to]
+        if company_id is not None:
+            clauses.insert(0, "company_id = ?")
+            params.insert(0, company_id)
+        if offering_id is not None:
+            clauses.append("offering_id = ?")
+            params.append(offering_id)
+        filters = AppointmentFilter(company_id=company_id, offering_id=offering_id)
+        totals: Counter[tuple[int, str]] = Counter()
+        for shard in self._shards_for(filters):
+            with read_connection(shard) as connection:
+                cursor = connection.execute(
+                    f"""
+                    SELECT day, status, SUM(count)
+                    FROM appointment_daily_counts
+                    WHERE {" AND ".join(clauses)}
+                    GROUP BY day, status
+                    """,
+                    params,
+                )
+                for day, status, count in cursor:
+                    totals[(day, status)] += count
+        return sorted((day, status, count) for (day, status), count in totals.items())
 
     def update(self, appointment: Appointment) -> Appointment:
-        connection = get_connection()
-        try:
+        shard = shard_for_company(appointment.company_id)
+        intervals = booking_intervals(shard)
+        with write_connection(shard) as connection:
+            connection.execute("BEGIN IMMEDIATE")
+            previous = connection.execute(
+                """
+                SELECT offering_id, start_date, end_date, status, company_id
+                FROM appointments WHERE id = ?
+                """,
+                (appointment.id,),
+            ).fetchone()
+            intervals.sync(connection)
+            self._ensure_slot_free(connection, intervals, appointment)
             cursor = connection.cursor()
             cursor.execute(
                 """
                 UPDATE appointments
                 SET company_id = ?, offering_id = ?, customer_name = ?,
                     customer_phone = ?, customer_email = ?, start_date = ?,
-                    end_date = ?, status = ?
+                    end_date = ?, status = ?, version = version + 1
                 WHERE id = ?
+                RETURNING version
                 """,
                 (
                     appointment.company_id,
@@ -87,25 +693,190 @@ class AppointmentRepository:
                     appointment.customer_name,
                     appointment.customer_phone,
                     appointment.customer_email,
-                    appointment.start_date.isoformat(),
-                    appointment.end_date.isoformat(),
+                    to_epoch_us(appointment.start_date),
+                    to_epoch_us(appointment.end_date),
                     appointment.status.value,
                     appointment.id,
                 ),
             )
+            updated = cursor.fetchone()
+            if previous is not None:
+                appointment.version = updated[0]
+                deltas = Counter(
+                    {
+                        _count_key(
+                            appointment.company_id,
+                            appointment.offering_id,
+                            to_epoch_us(appointment.start_date),
+                            appointment.status.value,
+                        ): 1
+                    }
+                )
+                deltas[_count_key(previous[4], previous[0], previous[1], previous[3])] -= 1
+                self._apply_daily_counts(cursor, deltas)
+                record_changes(
+                    cursor,
+                    ChangeEntity.APPOINTMENT,
+                    ChangeOperation.UPDATED,
+                    [(appointment.company_id, appointment.id)],
+                )
+                self._bump_company_versions(
+                    cursor, (appointment.company_id, previous[4])
+                )
             connection.commit()
+            if previous is not None:
+                change_notifier.publish((appointment.company_id, previous[4]))
+            if previous is not None and previous[:4] != (
+                appointment.offering_id,
+                to_epoch_us(appointment.start_date),
+                to_epoch_us(appointment.end_date),
+                appointment.status.value,
+            ):
+                intervals.invalidate(previous[0], appointment.offering_id)
             return appointment
-        finally:
-            connection.close()
+
+    def update_status_many(
+        self,
+        status: AppointmentStatus,
+        filters: AppointmentFilter,
+        appointment_ids: list[int] | None = None,
+    ) -> tuple[list[int], list[int]]:
+        clauses, params = self._filter_clauses(filters)
+        clauses.append("status <> ?")
+        params.append(status.value)
+        where = " AND ".join(clauses)
+
+        if appointment_ids is None or filters.company_id is not None:
+            targets = [(shard, appointment_ids) for shard in self._shards_for(filters)]
+        else:
+            targets = list(group_ids_by_shard(appointment_ids).items())
+
+        # Each shard commits on its own; there is no cross-shard transaction.
+        updated: list[int] = []
+        conflicting: list[int] = []
+        for shard, ids in targets:
+            shard_updated, shard_conflicting = self._update_status_in_shard(
+                shard, status, where, params, ids
+            )
+            updated.extend(shard_updated)
+            conflicting.extend(shard_conflicting)
+        return updated, conflicting
+
+    def _update_status_in_shard(
+        self,
+        shard: int | None,
+        status: AppointmentStatus,
+        where: str,
+        params: list,
+        appointment_ids: list[int] | None,
+    ) -> tuple[list[int], list[int]]:
+        id_chunks = (
+            [
+                appointment_ids[start:start + _MAX_IN_PARAMS]
+                for start in range(0, len(appointment_ids), _MAX_IN_PARAMS)
+            ]
+            if appointment_ids is not None
+            else [None]
+        )
+
+        updated: list[int] = []
+        conflicting: list[int] = []
+        touched_offerings: set[int] = set()
+        rows: list[tuple] = []
+        intervals = booking_intervals(shard)
+        with write_connection(shard) as connection:
+            connection.execute("BEGIN IMMEDIATE")
+            intervals.sync(connection)
+            try:
+                cursor = connection.cursor()
+                for chunk in id_chunks:
+                    query = (
+                        "SELECT id, offering_id, start_date, end_date, status, company_id"
+                        f" FROM appointments WHERE {where}"
+                    )
+                    chunk_params = list(params)
+                    if chunk is not None:
+                        query += f" AND id IN ({', '.join('?' * len(chunk))})"
+                        chunk_params.extend(chunk)
+                    cursor.execute(query + " ORDER BY start_date, id", chunk_params)
+                    rows.extend(cursor.fetchall())
+
+                deltas: Counter[tuple[int, int, int, str]] = Counter()
+                changed: list[tuple[int, int]] = []
+                for appointment_id, offering_id, start, end, current, company_id in rows:
+                    was_blocking = AppointmentStatus(current) in BLOCKING_STATUSES
+                    if status in BLOCKING_STATUSES and not was_blocking:
+                        # Re-activating a booking must not steal a slot that
+                        # has been given to someone else in the meantime.
+                        if self._overlaps_booking(
+                            connection, intervals, offering_id, start, end
+                        ):
+                            conflicting.append(appointment_id)
+                            continue
+                        intervals.add(offering_id, start, end)
+                    elif was_blocking and status not in BLOCKING_STATUSES:
+                        touched_offerings.add(offering_id)
+                    updated.append(appointment_id)
+                    changed.append((company_id, appointment_id))
+                    deltas[_count_key(company_id, offering_id, start, current)] -= 1
+                    deltas[_count_key(company_id, offering_id, start, status.value)] += 1
+
+                for start in range(0, len(updated), _MAX_IN_PARAMS):
+                    chunk = updated[start:start + _MAX_IN_PARAMS]
+                    cursor.execute(
+                        f"""
+                        UPDATE appointments SET status = ?, version = version + 1
+                        WHERE {where} AND id IN ({', '.join('?' * len(chunk))})
+                        """,
+                        [status.value, *params, *chunk],
+                    )
+                self._apply_daily_counts(cursor, deltas)
+                record_changes(
+                    cursor, ChangeEntity.APPOINTMENT, ChangeOperation.UPDATED, changed
+                )
+                self._bump_company_versions(
+                    cursor, (company_id for company_id, _ in changed)
+                )
+                connection.commit()
+            except Exception:
+                intervals.invalidate(*(row[1] for row in rows))
+                raise
+            # Still holding the writer: the next writer must not see the
+            # freed intervals.
+            intervals.invalidate(*touched_offerings)
+        if changed:
+            change_notifier.publish(company_id for company_id, _ in changed)
+        return updated, conflicting
 
     def delete(self, appointment_id: int) -> bool:
-        connection = get_connection()
-        try:
+        shard = shard_for_id(appointment_id)
+        with write_connection(shard) as connection:
             cursor = connection.cursor()
+            cursor.execute(
+                """
+                SELECT offering_id, company_id, start_date, status
+                FROM appointments WHERE id = ?
+                """,
+                (appointment_id,),
+            )
+            row = cursor.fetchone()
             cursor.execute(
                 "DELETE FROM appointments WHERE id = ?", (appointment_id,)
             )
+            deleted = cursor.rowcount > 0
+            if row is not None:
+                self._apply_daily_counts(
+                    cursor, Counter({_count_key(row[1], row[0], row[2], row[3]): -1})
+                )
+                record_changes(
+                    cursor,
+                    ChangeEntity.APPOINTMENT,
+                    ChangeOperation.DELETED,
+                    [(row[1], appointment_id)],
+                )
+                self._bump_company_versions(cursor, (row[1],))
             connection.commit()
-            return cursor.rowcount > 0
-        finally:
-            connection.close()
+            if row is not None:
+                booking_intervals(shard).invalidate(row[0])
+                change_notifier.publish((row[1],))
+            return deleted
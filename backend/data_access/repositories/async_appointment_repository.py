@@ -0,0 +1,132 @@
+from datetime import datetime
+from typing import AsyncIterator
+
+from backend.data_access.booking_commit_queue import (
+    BookingCommitQueue,
+    booking_commits,
+)
+from backend.data_access.db_context import shard_for_company, shard_for_id
+from backend.data_access.db_executor import db_executor
+from backend.data_access.exceptions import BookingConflictError
+from backend.data_access.repositories.appointment_repository import (
+    AppointmentRepository,
+)
+from backend.data_access.row_types import AppointmentRow
+from backend.models.dtos.appointment_dto import AppointmentFilter
+from backend.models.entities.appointment import Appointment
+from backend.models.entities.idempotency_key import IdempotencyKey
+from backend.models.enums.appointment_status import AppointmentStatus
+
+
+class AsyncAppointmentRepository:
+
+    def __init__(self, repository: AppointmentRepository | None = None) -> None:
+        self._repository = repository or AppointmentRepository()
+        self._commits = (
+            booking_commits if repository is None else BookingCommitQueue(repository)
+        )
+
+    async def create(
+        self, appointment: Appointment, idempotency_key: IdempotencyKey | None = None
+    ) -> Appointment:
+        return await self._commits.submit(appointment, idempotency_key)
+
+    async def create_many(
+        self, appointments: list[Appointment]
+    ) -> list[Appointment | BookingConflictError]:
+        # Batches that span several tenants run on the default lane.
+        shards = {shard_for_company(a.company_id) for a in appointments}
+        return await db_executor.write(
+            self._repository.create_many,
+            appointments,
+            shard=shards.pop() if len(shards) == 1 else None,
+        )
+
+    async def get_by_id(self, appointment_id: int) -> Appointment | None:
+        return await db_executor.read(self._repository.get_by_id, appointment_id)
+
+    async def get_idempotency_key(
+        self, company_id: int, key: str
+    ) -> IdempotencyKey | None:
+        return await db_executor.read(
+            self._repository.get_idempotency_key, company_id, key
+        )
+
+    async def get_row_by_id(self, appointment_id: int) -> AppointmentRow | None:
+        return await db_executor.read(self._repository.get_row_by_id, appointment_id)
+
+    async def get_version(self, appointment_id: int) -> tuple[int, int] | None:
+        return await db_executor.read(self._repository.get_version, appointment_id)
+
+    async def get_company_version(self, company_id: int) -> int:
+        return await db_executor.read(self._repository.get_company_version, company_id)
+
+    async def get_page_rows(
+        self,
+        filters: AppointmentFilter,
+        limit: int,
+        after: tuple[datetime, int] | None = None,
+    ) -> list[AppointmentRow]:
+        return await db_executor.read(
+            self._repository.get_page_rows, filters, limit, after
+        )
+
+    async def iter_batches(
+        self, filters: AppointmentFilter, batch_size: int
+    ) -> AsyncIterator[list[Appointment]]:
+        batches = self._repository.iter_batches(filters, batch_size)
+        try:
+            while True:
+                batch = await db_executor.read(next, batches, None)
+                if batch is None:
+                    return
+                yield batch
+        finally:
+            await db_executor.read(batches.close)
+
+    async def get_booked_intervals(
+        self, offering_id: int, date_from: datetime, date_to: datetime
+    ) -> list[tuple[datetime, datetime]]:
+        return await db_executor.read(
+            self._repository.get_booked_intervals, offering_id, date_from, date_to
+        )
+
+    async def get_daily_counts(
+        self,
+        company_id: int | None,
+        offering_id: int | None,
+        day_from: int,
+        day_to: int,
+    ) -> list[tuple[int, str, int]]:
+        return await db_executor.read(
+            self._repository.get_daily_counts, company_id, offering_id, day_from, day_to
+        )
+
+    async def update(self, appointment: Appointment) -> Appointment:
+        return await db_executor.write(
+            self._repository.update,
+            appointment,
+            shard=shard_for_company(appointment.company_id),
+        )
+
+    async def update_status_many(
+        self,
+        status: AppointmentStatus,
+        filters: AppointmentFilter,
+        appointment_ids: list[int] | None = None,
+    ) -> tuple[list[int], list[int]]:
+        shard = None
+        if filters.company_id is not None:
+            shard = shard_for_company(filters.company_id)
+        return await db_executor.write(
+            self._repository.update_status_many,
+            status,
+            filters,
+            appointment_ids,
+            shard=shard,
+        )
+
+    async def delete(self, appointment_id: int) -> bool:
+        return await db_executor.write(
+            self._repository.delete, appointment_id, shard=shard_for_id(appointment_id)
+        )
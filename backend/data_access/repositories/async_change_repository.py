@@ -0,0 +1,15 @@
+from backend.data_access.db_executor import db_executor
+from backend.data_access.repositories.change_repository import ChangeRepository
+from backend.models.entities.change import Change
+
+
+class AsyncChangeRepository:
+
+    def __init__(self, repository: ChangeRepository | None = None) -> None:
+        self._repository = repository or ChangeRepository()
+
+    async def get_since(self, company_id: int, since: int, limit: int) -> list[Change]:
+        return await db_executor.read(self._repository.get_since, company_id, since, limit)
+
+    async def get_last_seq(self, company_id: int) -> int:
+        return await db_executor.read(self._repository.get_last_seq, company_id)
@@ -0,0 +1,45 @@
+from backend.data_access.db_context import shard_for_company
+from backend.data_access.db_executor import db_executor
+from backend.data_access.offering_cache import CachedOfferingRepository
+from backend.data_access.repositories.offering_repository import OfferingRepository
+from backend.models.entities.offering import Offering
+
+
+class AsyncOfferingRepository:
+
+    def __init__(self, repository: OfferingRepository | None = None) -> None:
+        self._repository = repository or CachedOfferingRepository()
+
+    async def create(self, offering: Offering) -> Offering:
+        return await db_executor.write(
+            self._repository.create,
+            offering,
+            shard=shard_for_company(offering.company_id),
+        )
+
+    async def get_by_id(self, offering_id: int) -> Offering | None:
+        return await db_executor.read(self._repository.get_by_id, offering_id)
+
+    async def get_by_ids(self, offering_ids: list[int]) -> dict[int, Offering]:
+        return await db_executor.read(self._repository.get_by_ids, offering_ids)
+
+    async def get_by_company_id(self, company_id: int) -> list[Offering]:
+        return await db_executor.read(self._repository.get_by_company_id, company_id)
+
+    async def get_open_by_company_id(self, company_id: int) -> list[Offering]:
+        return await db_executor.read(
+            self._repository.get_open_by_company_id, company_id
+        )
+
+    async def get_company_version(self, company_id: int) -> int:
+        return await db_executor.read(self._repository.get_company_version, company_id)
+
+    async def get_current_version(self, company_id: int) -> int:
+        return await db_executor.read(self._repository.get_current_version, company_id)
+
+    async def update(self, offering: Offering) -> Offering:
+        return await db_executor.write(
+            self._repository.update,
+            offering,
+            shard=shard_for_company(offering.company_id),
+        )
@@ -0,0 +1,25 @@
+from backend.data_access.db_executor import db_executor
+from backend.data_access.repositories.user_repository import UserRepository
+from backend.data_access.row_types import UserRow
+from backend.models.entities.user import User
+
+
+class AsyncUserRepository:
+
+    def __init__(self, repository: UserRepository | None = None) -> None:
+        self._repository = repository or UserRepository()
+
+    async def create(self, user: User) -> User:
+        return await db_executor.write(self._repository.create, user)
+
+    async def get_by_username(self, username: str) -> User | None:
+        return await db_executor.read(self._repository.get_by_username, username)
+
+    async def get_by_id(self, user_id: int) -> User | None:
+        return await db_executor.read(self._repository.get_by_id, user_id)
+
+    async def get_row_by_id(self, user_id: int) -> UserRow | None:
+        return await db_executor.read(self._repository.get_row_by_id, user_id)
+
+    async def get_by_email(self, email: str) -> User | None:
+        return await db_executor.read(self._repository.get_by_email, email)
@@ -0,0 +1,91 @@
+import sqlite3
+from datetime import datetime, timezone
+from typing import Iterable
+
+from backend.data_access.db_context import read_connection, shard_for_company
+from backend.data_access.timestamps import from_epoch_us, to_epoch_us
+from backend.models.entities.change import Change
+from backend.models.enums.change_entity import ChangeEntity
+from backend.models.enums.change_operation import ChangeOperation
+
+CHANGE_RETENTION_DAYS = 30
+CHANGES_PURGE_INTERVAL_US = 60 * 1_000_000
+
+_next_changes_purge: dict[int | None, int] = {}
+
+
+def record_changes(
+    cursor: sqlite3.Cursor,
+    entity: ChangeEntity,
+    operation: ChangeOperation,
+    items: Iterable[tuple[int, int]],
+) -> None:
+    # items are (company_id, entity_id) pairs; call inside the write
+    # transaction so the feed never misses or invents a change.
+    items = list(items)
+    if not items:
+        return
+    changed_at = to_epoch_us(datetime.now(timezone.utc))
+    _purge_old_changes(cursor, shard_for_company(items[0][0]), changed_at)
+    cursor.executemany(
+        """
+        INSERT INTO changes (company_id, entity, entity_id, operation, changed_at)
+        VALUES (?, ?, ?, ?, ?)
+        """,
+        [
+            (company_id, entity.value, entity_id, operation.value, changed_at)
+            for company_id, entity_id in items
+        ],
+    )
+
+
+def _purge_old_changes(cursor: sqlite3.Cursor, shard: int | None, now: int) -> None:
+    if _next_changes_purge.get(shard, 0) > now:
+        return
+    _next_changes_purge[shard] = now + CHANGES_PURGE_INTERVAL_US
+    # changed_at grows with seq, so the scan for the oldest row to keep stops
+    # right after the rows that have just expired.
+    cursor.execute(
+        """
+        DELETE FROM changes
+        WHERE seq < COALESCE(
+            (SELECT seq FROM changes WHERE changed_at >= ? ORDER BY seq LIMIT 1),
+            (SELECT MAX(seq) + 1 FROM changes)
+        )
+        """,
+        (now - CHANGE_RETENTION_DAYS * 86_400_000_000,),
+    )
+
+
+class ChangeRepository:
+
+    def get_since(self, company_id: int, since: int, limit: int) -> list[Change]:
+        with read_connection(shard_for_company(company_id)) as connection:
+            cursor = connection.execute(
+                """
+                SELECT seq, company_id, entity, entity_id, operation, changed_at
+                FROM changes
+                WHERE company_id = ? AND seq > ?
+                ORDER BY seq
+                LIMIT ?
+                """,
+                (company_id, since, limit),
+            )
+            return [
+                Change(
+                    seq=row[0],
+                    company_id=row[1],
+                    entity=ChangeEntity(row[2]),
+                    entity_id=row[3],
+                    operation=ChangeOperation(row[4]),
+                    changed_at=from_epoch_us(row[5]),
+                )
+                for row in cursor.fetchall()
+            ]
+
+    def get_last_seq(self, company_id: int) -> int:
+        with read_connection(shard_for_company(company_id)) as connection:
+            row = connection.execute(
+                "SELECT MAX(seq) FROM changes WHERE company_id = ?", (company_id,)
+            ).fetchone()
+            return row[0] or 0
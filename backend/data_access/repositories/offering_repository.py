@@ -1,12 +1,37 @@
-from backend.data_access.db_context import get_connection
+import sqlite3
+
+from backend.data_access.change_notifier import change_notifier
+from backend.data_access.db_context import (
+    group_ids_by_shard,
+    read_connection,
+    shard_for_company,
+    shard_for_id,
+    write_connection,
+)
+from backend.data_access.repositories.change_repository import record_changes
 from backend.models.entities.offering import Offering
+from backend.models.enums.change_entity import ChangeEntity
+from backend.models.enums.change_operation import ChangeOperation
+
+_MAX_IN_PARAMS = 900
 
 
 class OfferingRepository:
 
+    @staticmethod
+    def _bump_company_version(cursor: sqlite3.Cursor, company_id: int) -> None:
+        cursor.execute(
+            """
+            INSERT INTO company_versions (company_id, offerings_version)
+            VALUES (?, 1)
+            ON CONFLICT (company_id)
+            DO UPDATE SET offerings_version = offerings_version + 1
+            """,
+            (company_id,),
+        )
+
     def create(self, offering: Offering) -> Offering:
-        connection = get_connection()
-        try:
+        with write_connection(shard_for_company(offering.company_id)) as connection:
             cursor = connection.cursor()
             cursor.execute(
                 """
@@ -21,15 +46,20 @@ class OfferingRepository:
                     offering.created_date.isoformat(),
                 ),
             )
-            connection.commit()
             offering.id = cursor.lastrowid
-            return offering
-        finally:
-            connection.close()
+            self._bump_company_version(cursor, offering.company_id)
+            record_changes(
+                cursor,
+                ChangeEntity.OFFERING,
+                ChangeOperation.CREATED,
+                [(offering.company_id, offering.id)],
+            )
+            connection.commit()
+        change_notifier.publish((offering.company_id,))
+        return offering
 
     def get_by_id(self, offering_id: int) -> Offering | None:
-        connection = get_connection()
-        try:
+        with read_connection(shard_for_id(offering_id)) as connection:
             cursor = connection.cursor()
             cursor.execute(
                 "SELECT * FROM offerings WHERE id = ?", (offering_id,)
@@ -38,24 +68,61 @@ class OfferingRepository:
             if row is None:
                 return None
             return Offering.from_row(row)
-        finally:
-            connection.close()
+
+    def get_by_ids(self, offering_ids: list[int]) -> dict[int, Offering]:
+        unique_ids = list(dict.fromkeys(offering_ids))
+        offerings = {}
+        for shard, shard_ids in group_ids_by_shard(unique_ids).items():
+            with read_connection(shard) as connection:
+                cursor = connection.cursor()
+                for start in range(0, len(shard_ids), _MAX_IN_PARAMS):
+                    chunk = shard_ids[start:start + _MAX_IN_PARAMS]
+                    placeholders = ", ".join("?" * len(chunk))
+                    cursor.execute(
+                        f"SELECT * FROM offerings WHERE id IN ({placeholders})", chunk
+                    )
+                    for row in cursor.fetchall():
+                        offering = Offering.from_row(row)
+                        offerings[offering.id] = offering
+        return offerings
+
+    def get_by_ids_with_versions(
+        self, offering_ids: list[int]
+    ) -> list[tuple[Offering, int]]:
+        unique_ids = list(dict.fromkeys(offering_ids))
+        results = []
+        for shard, shard_ids in group_ids_by_shard(unique_ids).items():
+            with read_connection(shard) as connection:
+                cursor = connection.cursor()
+                for start in range(0, len(shard_ids), _MAX_IN_PARAMS):
+                    chunk = shard_ids[start:start + _MAX_IN_PARAMS]
+                    placeholders = ", ".join("?" * len(chunk))
+                    cursor.execute(
+                        f"""
+                        SELECT offerings.*,
+                            COALESCE(company_versions.offerings_version, 0)
+                        FROM offerings
+                        LEFT JOIN company_versions USING (company_id)
+                        WHERE offerings.id IN ({placeholders})
+                        """,
+                        chunk,
+                    )
+                    results.extend(
+                        (Offering.from_row(row), row[-1]) for row in cursor.fetchall()
+                    )
+        return results
 
     def get_by_company_id(self, company_id: int) -> list[Offering]:
-        connection = get_connection()
-        try:
+        with read_connection(shard_for_company(company_id)) as connection:
             cursor = connection.cursor()
             cursor.execute(
                 "SELECT * FROM offerings WHERE company_id = ?", (company_id,)
             )
             rows = cursor.fetchall()
             return [Offering.from_row(row) for row in rows]
-        finally:
-            connection.close()
 
     def get_open_by_company_id(self, company_id: int) -> list[Offering]:
-        connection = get_connection()
-        try:
+        with read_connection(shard_for_company(company_id)) as connection:
             cursor = connection.cursor()
             cursor.execute(
                 "SELECT * FROM offerings WHERE company_id = ? AND is_open = 1",
@@ -63,18 +130,29 @@ class OfferingRepository:
             )
             rows = cursor.fetchall()
             return [Offering.from_row(row) for row in rows]
-        finally:
-            connection.close()
+
+    def get_company_version(self, company_id: int) -> int:
+        with read_connection(shard_for_company(company_id)) as connection:
+            cursor = connection.cursor()
+            cursor.execute(
+                "SELECT offerings_version FROM company_versions WHERE company_id = ?",
+                (company_id,),
+            )
+            row = cursor.fetchone()
+            return 0 if row is None else row[0]
+
+    def get_current_version(self, company_id: int) -> int:
+        return self.get_company_version(company_id)
 
     def update(self, offering: Offering) -> Offering:
-        connection = get_connection()
-        try:
+        with write_connection(shard_for_company(offering.company_id)) as connection:
             cursor = connection.cursor()
             cursor.execute(
                 """
                 UPDATE offerings
-                SET description = ?, is_open = ?
+                SET description = ?, is_open = ?, version = version + 1
                 WHERE id = ?
+                RETURNING version
                 """,
                 (
                     offering.description,
@@ -82,7 +160,14 @@ class OfferingRepository:
                     offering.id,
                 ),
             )
+            offering.version = cursor.fetchone()[0]
+            self._bump_company_version(cursor, offering.company_id)
+            record_changes(
+                cursor,
+                ChangeEntity.OFFERING,
+                ChangeOperation.UPDATED,
+                [(offering.company_id, offering.id)],
+            )
             connection.commit()
-            return offering
-        finally:
-            connection.close()
+        change_notifier.publish((offering.company_id,))
+        return offering
@@ -1,12 +1,17 @@
-from backend.data_access.db_context import get_connection
+from backend.data_access.db_context import (
+    read_connection,
+    write_connection,
+)
+from backend.data_access.row_types import UserRow, row_factory
 from backend.models.entities.user import User
 
+_user_row = row_factory(UserRow)
+
 
 class UserRepository:
 
     def create(self, user: User) -> User:
-        connection = get_connection()
-        try:
+        with write_connection() as connection:
             cursor = connection.cursor()
             cursor.execute(
                 """
@@ -26,12 +31,9 @@ class UserRepository:
             connection.commit()
             user.id = cursor.lastrowid
             return user
-        finally:
-            connection.close()
 
     def get_by_username(self, username: str) -> User | None:
-        connection = get_connection()
-        try:
+        with read_connection() as connection:
             cursor = connection.cursor()
             cursor.execute(
                 "SELECT * FROM users WHERE username = ?", (username,)
@@ -40,29 +42,34 @@ class UserRepository:
             if row is None:
                 return None
             return User.from_row(row)
-        finally:
-            connection.close()
 
     def get_by_id(self, user_id: int) -> User | None:
-        connection = get_connection()
-        try:
+        with read_connection() as connection:
             cursor = connection.cursor()
             cursor.execute("SELECT * FROM users WHERE id = ?", (user_id,))
             row = cursor.fetchone()
             if row is None:
                 return None
             return User.from_row(row)
-        finally:
-            connection.close()
+
+    def get_row_by_id(self, user_id: int) -> UserRow | None:
+        with read_connection() as connection:
+            cursor = connection.cursor()
+            cursor.row_factory = _user_row
+            cursor.execute(
+                """
+                SELECT id, username, email, role, company_id, created_date
+                FROM users WHERE id = ?
+                """,
+                (user_id,),
+            )
+            return cursor.fetchone()
 
     def get_by_email(self, email: str) -> User | None:
-        connection = get_connection()
-        try:
+        with read_connection() as connection:
             cursor = connection.cursor()
             cursor.execute("SELECT * FROM users WHERE email = ?", (email,))
             row = cursor.fetchone()
             if row is None:
                 return None
             return User.from_row(row)
-        finally:
-            connection.close()
@@ -0,0 +1,36 @@
+import sqlite3
+from typing import Callable, NamedTuple
+
+
+class AppointmentRow(NamedTuple):
+    id: int
+    company_id: int
+    offering_id: int
+    customer_name: str
+    customer_phone: str
+    customer_email: str
+    start_date: int
+    end_date: int
+    created_date: int
+    status: str
+    version: int
+
+
+class UserRow(NamedTuple):
+    id: int
+    username: str
+    email: str
+    role: str
+    company_id: int | None
+    created_date: str
+
+
+def row_factory(
+    row_type: type[NamedTuple],
+) -> Callable[[sqlite3.Cursor, tuple], NamedTuple]:
+    make = row_type._make
+
+    def factory(cursor: sqlite3.Cursor, row: tuple) -> NamedTuple:
+        return make(row)
+
+    return factory
@@ -0,0 +1,126 @@
+import importlib
+import pkgutil
+import re
+import sqlite3
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from types import ModuleType
+
+MIGRATIONS_PACKAGE = "backend.data_access.migrations"
+
+_MODULE_NAME_PATTERN = re.compile(r"^m(\d+)_\w+$")
+
+
+@dataclass
+class Migration:
+    version: int
+    name: str
+    description: str
+    module: ModuleType
+
+    def up(self, connection: sqlite3.Connection) -> None:
+        self.module.up(connection)
+
+    def down(self, connection: sqlite3.Connection) -> None:
+        self.module.down(connection)
+
+
+def load_migrations() -> list[Migration]:
+    package = importlib.import_module(MIGRATIONS_PACKAGE)
+    migrations = []
+    for module_info in pkgutil.iter_modules(package.__path__):
+        match = _MODULE_NAME_PATTERN.match(module_info.name)
+        if match is None:
+            continue
+        module = importlib.import_module(f"{MIGRATIONS_PACKAGE}.{module_info.name}")
+        migrations.append(
+            Migration(
+                version=int(match.group(1)),
+                name=module_info.name,
+                description=module.DESCRIPTION,
+                module=module,
+            )
+        )
+    migrations.sort(key=lambda m: m.version)
+    versions = [m.version for m in migrations]
+    if len(set(versions)) != len(versions):
+        raise ValueError("Duplicate migration versions found")
+    return migrations
+
+
+def get_schema_version(connection: sqlite3.Connection) -> int:
+    table = connection.execute(
+        "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'schema_version'"
+    ).fetchone()
+    if table is None:
+        return 0
+    row = connection.execute("SELECT MAX(version) FROM schema_version").fetchone()
+    return row[0] or 0
+
+
+def _next_step(
+    migrations: list[Migration], current: int, target: int
+) -> tuple[Migration, bool] | None:
+    if current < target:
+        for migration in migrations:
+            if current < migration.version <= target:
+                return migration, True
+    elif current > target:
+        for migration in migrations:
+            if migration.version == current:
+                return migration, False
+        raise ValueError(f"No migration script found for schema version {current}")
+    return None
+
+
+def migrate(
+    connection: sqlite3.Connection, target: int | None = None
+) -> list[Migration]:
+    migrations = load_migrations()
+    if target is None:
+        target = migrations[-1].version if migrations else 0
+    if target < 0:
+        raise ValueError("Target schema version must not be negative")
+
+    applied = []
+    while True:
+        # BEGIN IMMEDIATE takes the database write lock up front, so workers
+        # starting at the same time apply each step exactly once.
+        connection.execute("BEGIN IMMEDIATE")
+        try:
+            connection.execute(
+                """
+                CREATE TABLE IF NOT EXISTS schema_version (
+                    version INTEGER PRIMARY KEY,
+                    name TEXT NOT NULL,
+                    applied_date TEXT NOT NULL
+                )
+                """
+            )
+            step = _next_step(migrations, get_schema_version(connection), target)
+            if step is None:
+                connection.commit()
+                return applied
+
+            migration, upgrade = step
+            if upgrade:
+                migration.up(connection)
+                connection.execute(
+                    "INSERT INTO schema_version (version, name, applied_date) VALUES (?, ?, ?)",
+                    (
+                        migration.version,
+                        migration.name,
+                        datetime.now(timezone.utc).isoformat(),
+                    ),
+                )
+            else:
+                migration.down(connection)
+                connection.execute(
+                    "DELETE FROM schema_version WHERE version = ?",
+                    (migration.version,),
+                )
+            connection.commit()
+            applied.append(migration)
+        except Exception:
+            connection.rollback()
+            raise
@@ -0,0 +1,19 @@
+from datetime import datetime, timedelta, timezone
+
+_EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+_NAIVE_EPOCH = datetime(1970, 1, 1)
+
+
+def to_epoch_us(value: datetime) -> int:
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    delta = value - _EPOCH
+    return (delta.days * 86_400 + delta.seconds) * 1_000_000 + delta.microseconds
+
+
+def from_epoch_us(value: int) -> datetime:
+    return _EPOCH + timedelta(0, 0, value)
+
+
+def format_epoch_us(value: int) -> str:
+    return (_NAIVE_EPOCH + timedelta(0, 0, value)).isoformat() + "Z"
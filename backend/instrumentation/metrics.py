@@ -0,0 +1,186 @@
+import bisect
+import dataclasses
+import threading
+from typing import Any, Callable
+
+LATENCY_BUCKETS = (
+    0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0,
+)
+STATEMENT_COUNT_BUCKETS = (0, 1, 2, 3, 5, 10, 20, 50, 100, 500, 1000)
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _format_labels(names: tuple[str, ...], values: tuple, extra: str = "") -> str:
+    pairs = [f'{name}="{_escape(str(value))}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _format_value(value: float) -> str:
+    if isinstance(value, float) and value.is_integer():
+        return str(int(value))
+    return repr(value)
+
+
+class Counter:
+
+    def __init__(self, name: str, documentation: str, labels: tuple[str, ...] = ()) -> None:
+        self.name = name
+        self._documentation = documentation
+        self._labels = labels
+        self._values: dict[tuple, float] = {}
+        self._lock = threading.Lock()
+
+    def inc(self, *label_values: Any, amount: float = 1) -> None:
+        with self._lock:
+            self._values[label_values] = self._values.get(label_values, 0) + amount
+
+    def render(self) -> list[str]:
+        lines = [f"# HELP {self.name} {self._documentation}", f"# TYPE {self.name} counter"]
+        with self._lock:
+            values = sorted(self._values.items())
+        for label_values, value in values:
+            labels = _format_labels(self._labels, label_values)
+            lines.append(f"{self.name}{labels} {_format_value(value)}")
+        return lines
+
+
+class Histogram:
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labels: tuple[str, ...] = (),
+        buckets: tuple[float, ...] = LATENCY_BUCKETS,
+    ) -> None:
+        self.name = name
+        self._documentation = documentation
+        self._labels = labels
+        self._buckets = buckets
+        # Per label set: one count per bucket, one for +Inf, then the sum.
+        self._series: dict[tuple, list] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, value: float, *label_values: Any) -> None:
+        index = bisect.bisect_left(self._buckets, value)
+        with self._lock:
+            series = self._series.get(label_values)
+            if series is None:
+                series = self._series[label_values] = [0] * (len(self._buckets) + 1) + [0.0]
+            series[index] += 1
+            series[-1] += value
+
+    def render(self) -> list[str]:
+        lines = [f"# HELP {self.name} {self._documentation}", f"# TYPE {self.name} histogram"]
+        with self._lock:
+            series = sorted((labels, list(values)) for labels, values in self._series.items())
+        for label_values, values in series:
+            cumulative = 0
+            for bound, count in zip(self._buckets, values):
+                cumulative += count
+                labels = _format_labels(self._labels, label_values, f'le="{bound}"')
+                lines.append(f"{self.name}_bucket{labels} {cumulative}")
+            cumulative += values[len(self._buckets)]
+            labels = _format_labels(self._labels, label_values, 'le="+Inf"')
+            lines.append(f"{self.name}_bucket{labels} {cumulative}")
+            labels = _format_labels(self._labels, label_values)
+            lines.append(f"{self.name}_sum{labels} {_format_value(values[-1])}")
+            lines.append(f"{self.name}_count{labels} {cumulative}")
+        return lines
+
+
+class MetricsRegistry:
+
+    def __init__(self) -> None:
+        self._metrics: list[Counter | Histogram] = []
+        self._stats: list[tuple[str, str, Callable[[], Any]]] = []
+
+    def counter(
+        self, name: str, documentation: str, labels: tuple[str, ...] = ()
+    ) -> Counter:
+        counter = Counter(name, documentation, labels)
+        self._metrics.append(counter)
+        return counter
+
+    def histogram(
+        self,
+        name: str,
+        documentation: str,
+        labels: tuple[str, ...] = (),
+        buckets: tuple[float, ...] = LATENCY_BUCKETS,
+    ) -> Histogram:
+        histogram = Histogram(name, documentation, labels, buckets)
+        self._metrics.append(histogram)
+        return histogram
+
+    def register_stats(
+        self, prefix: str, documentation: str, read_stats: Callable[[], Any]
+    ) -> None:
+        # read_stats returns one of the *Stats dataclasses; each numeric field
+        # is exported as a gauge read at scrape time.
+        self._stats.append((prefix, documentation, read_stats))
+
+    def render(self) -> str:
+        lines = []
+        for metric in self._metrics:
+            lines.extend(metric.render())
+        for prefix, documentation, read_stats in self._stats:
+            stats = read_stats()
+            if stats is None:
+                continue
+            for field in dataclasses.fields(stats):
+                value = getattr(stats, field.name)
+                if isinstance(value, bool) or not isinstance(value, (int, float)):
+                    continue
+                name = f"{prefix}_{field.name}"
+                lines.append(f"# HELP {name} {documentation}: {field.name.replace('_', ' ')}")
+                lines.append(f"# TYPE {name} gauge")
+                lines.append(f"{name} {_format_value(value)}")
+        return "\n".join(lines) + "\n"
+
+
+registry = MetricsRegistry()
+
+request_duration = registry.histogram(
+    "http_request_duration_seconds",
+    "HTTP request latency by route template",
+    ("method", "route", "status"),
+)
+sql_statement_duration = registry.histogram(
+    "sqlite_statement_duration_seconds",
+    "Time from a traced statement starting to the next statement or connection release",
+    ("verb",),
+)
+sql_statements_per_request = registry.histogram(
+    "sqlite_statements_per_request",
+    "SQL statements run by a traced request",
+    ("route",),
+    STATEMENT_COUNT_BUCKETS,
+)
+sql_seconds_per_request = registry.histogram(
+    "sqlite_seconds_per_request",
+    "Time a traced request spent holding database connections",
+    ("route",),
+)
+sql_traced_requests = registry.counter(
+    "sqlite_traced_requests_total", "Requests sampled for SQL tracing"
+)
+rejected_requests = registry.counter(
+    "http_rejected_requests_total",
+    "Requests refused by rate limits (429) or load shedding (503)",
+    ("route", "reason"),
+)
+password_hash_duration = registry.histogram(
+    "password_hash_duration_seconds",
+    "bcrypt hash/verify time on the password hasher pool",
+    ("operation",),
+    (0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0),
+)
+jwt_decode_duration = registry.histogram(
+    "jwt_decode_duration_seconds", "JWT signature verification and decode time"
+)
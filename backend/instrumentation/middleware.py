@@ -0,0 +1,57 @@
+import random
+import time
+
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from backend.instrumentation.metrics import (
+    request_duration,
+    sql_seconds_per_request,
+    sql_statements_per_request,
+    sql_traced_requests,
+)
+from backend.instrumentation.sql_trace import tracing
+
+# Fraction of requests whose SQL statements are traced. Route latency is always
+# recorded; statement tracing installs a sqlite3 callback per connection, so it
+# is off by default.
+SQL_TRACE_SAMPLE_RATE = 0.0
+
+
+class RequestMetricsMiddleware:
+
+    def __init__(self, app: ASGIApp, sql_trace_sample_rate: float = SQL_TRACE_SAMPLE_RATE) -> None:
+        self._app = app
+        self._sample_rate = sql_trace_sample_rate
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self._app(scope, receive, send)
+            return
+
+        status = 500
+
+        async def send_with_status(message: Message) -> None:
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        started = time.perf_counter()
+        trace = None
+        try:
+            if self._sample_rate and random.random() < self._sample_rate:
+                with tracing() as trace:
+                    await self._app(scope, receive, send_with_status)
+            else:
+                await self._app(scope, receive, send_with_status)
+        finally:
+            elapsed = time.perf_counter() - started
+            # The router stores the matched route in the scope; label by its
+            # path template so /api/appointments/{appointment_id} is one series.
+            route = scope.get("route")
+            path = getattr(route, "path", "unmatched")
+            request_duration.observe(elapsed, scope["method"], path, status)
+            if trace is not None:
+                sql_traced_requests.inc()
+                sql_statements_per_request.observe(trace.statements, path)
+                sql_seconds_per_request.observe(trace.seconds, path)
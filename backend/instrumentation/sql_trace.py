@@ -0,0 +1,64 @@
+import sqlite3
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Iterator
+
+from backend.instrumentation.metrics import sql_statement_duration
+
+_VERBS = frozenset(
+    {"SELECT", "INSERT", "UPDATE", "DELETE", "BEGIN", "COMMIT", "ROLLBACK", "PRAGMA"}
+)
+
+_current: ContextVar["SqlTrace | None"] = ContextVar("sql_trace", default=None)
+
+
+class SqlTrace:
+    # sqlite3 only reports when a statement starts, so a statement is timed
+    # until the next one starts on the same connection or the connection is
+    # released. That includes fetching its rows, which is what a request waits on.
+
+    def __init__(self) -> None:
+        self.statements = 0
+        self.seconds = 0.0
+        self._verb: str | None = None
+        self._started = 0.0
+
+    def _finish(self, now: float) -> None:
+        if self._verb is not None:
+            sql_statement_duration.observe(now - self._started, self._verb)
+            self._verb = None
+
+    def _on_statement(self, statement: str) -> None:
+        now = time.perf_counter()
+        self._finish(now)
+        verb = statement.lstrip().split(None, 1)[0].upper() if statement.strip() else ""
+        self._verb = verb if verb in _VERBS else "OTHER"
+        self._started = now
+        self.statements += 1
+
+    @contextmanager
+    def attached(self, connection: sqlite3.Connection) -> Iterator[sqlite3.Connection]:
+        acquired = time.perf_counter()
+        connection.set_trace_callback(self._on_statement)
+        try:
+            yield connection
+        finally:
+            connection.set_trace_callback(None)
+            now = time.perf_counter()
+            self._finish(now)
+            self.seconds += now - acquired
+
+
+def current_trace() -> SqlTrace | None:
+    return _current.get()
+
+
+@contextmanager
+def tracing() -> Iterator[SqlTrace]:
+    trace = SqlTrace()
+    token = _current.set(trace)
+    try:
+        yield trace
+    finally:
+        _current.reset(token)
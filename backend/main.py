@@ -2,28 +2,42 @@ from fastapi import FastAPI
 
 from backend.api.controllers.appointment_controller import router as appointment_router
 from backend.api.controllers.auth_controller import router as auth_router
+from backend.api.controllers.metrics_controller import router as metrics_router
 from backend.api.controllers.offering_controller import router as offering_router
+from backend.api.responses import PydanticJSONResponse
 from backend.business.services.auth_service import AuthService
-from backend.data_access.db_context import initialize_database
+from backend.data_access.booking_commit_queue import booking_commits
+from backend.data_access.db_context import close_connections, initialize_database
+from backend.instrumentation.middleware import RequestMetricsMiddleware
 
 app = FastAPI(
     title="Appointment System API",
     description="A multi-tenant appointment management system with role-based access",
     version="1.0.0",
+    default_response_class=PydanticJSONResponse,
 )
 
 app.include_router(auth_router)
 app.include_router(offering_router)
 app.include_router(appointment_router)
+app.include_router(metrics_router)
+
+app.add_middleware(RequestMetricsMiddleware)
 
 
 @app.on_event("startup")
-def on_startup() -> None:
+async def on_startup() -> None:
     initialize_database()
     auth_service = AuthService()
-    auth_service.seed_default_admin()
+    await auth_service.seed_default_admin()
+
+
+@app.on_event("shutdown")
+def on_shutdown() -> None:
+    booking_commits.close()
+    close_connections()
 
 
 @app.get("/health")
-def health_check() -> dict:
+async def health_check() -> dict:
     return {"status": "healthy"}
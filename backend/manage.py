@@ -0,0 +1,65 @@
+import argparse
+
+from backend.data_access.db_context import (
+    close_connections,
+    shard_keys,
+    write_connection,
+)
+from backend.data_access.repositories.appointment_repository import (
+    rebuild_daily_counts,
+)
+from backend.data_access.schema_migrator import get_schema_version, migrate
+
+
+def _migrate(args: argparse.Namespace) -> None:
+    shards = [None] + [shard for shard in shard_keys() if shard is not None]
+    for shard in shards:
+        if shard is not None:
+            print(f"Shard company_{shard}:")
+        with write_connection(shard) as connection:
+            applied = migrate(connection, args.target)
+            for migration in applied:
+                print(f"Ran {migration.name}")
+            print(f"Schema version: {get_schema_version(connection)}")
+
+
+def _rebuild_stats(args: argparse.Namespace) -> None:
+    for shard in shard_keys():
+        with write_connection(shard) as connection:
+            connection.execute("BEGIN IMMEDIATE")
+            rows = rebuild_daily_counts(connection)
+            connection.commit()
+        label = "main database" if shard is None else f"shard company_{shard}"
+        print(f"Rebuilt {rows} daily count rows in the {label}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Appointment System management commands")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    migrate_parser = subparsers.add_parser(
+        "migrate", help="Upgrade or roll back the database schema"
+    )
+    migrate_parser.add_argument(
+        "--target",
+        type=int,
+        default=None,
+        help="Schema version to migrate to (defaults to the latest version)",
+    )
+    migrate_parser.set_defaults(handler=_migrate)
+
+    rebuild_parser = subparsers.add_parser(
+        "rebuild-stats",
+        help="Recompute the appointment_daily_counts summary from appointments",
+    )
+    rebuild_parser.set_defaults(handler=_rebuild_stats)
+
+    args = parser.parse_args()
+    try:
+        args.handler(args)
+    finally:
+        close_connections()
+
+
+if __name__ == "__main__":
+    main()
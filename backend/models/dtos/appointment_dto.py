@@ -1,6 +1,6 @@
-from datetime import datetime
+from datetime import date, datetime
 
-from pydantic import BaseModel, EmailStr
+from pydantic import BaseModel, EmailStr, Field
 
 from backend.models.enums.appointment_status import AppointmentStatus
 
@@ -36,3 +36,61 @@ class AppointmentResponse(BaseModel):
     end_date: datetime
     created_date: datetime
     status: AppointmentStatus
+
+
+class AppointmentFilter(BaseModel):
+    company_id: int | None = None
+    offering_id: int | None = None
+    status: AppointmentStatus | None = None
+    customer_email: str | None = None
+    date_from: datetime | None = None
+    date_to: datetime | None = None
+
+
+class AppointmentPageResponse(BaseModel):
+    items: list[AppointmentResponse]
+    next_cursor: str | None = None
+
+
+class BulkCreateAppointmentsRequest(BaseModel):
+    items: list[CreateAppointmentRequest] = Field(min_length=1, max_length=5000)
+
+
+class BulkAppointmentResult(BaseModel):
+    index: int
+    appointment: AppointmentResponse | None = None
+    error: str | None = None
+
+
+class BulkCreateAppointmentsResponse(BaseModel):
+    created: int
+    failed: int
+    results: list[BulkAppointmentResult]
+
+
+class BatchStatusUpdateRequest(BaseModel):
+    status: AppointmentStatus
+    ids: list[int] | None = Field(default=None, min_length=1, max_length=10000)
+    filter: AppointmentFilter | None = None
+
+
+class BatchStatusUpdateResponse(BaseModel):
+    updated: int
+    updated_ids: list[int]
+    conflicting_ids: list[int]
+
+
+class AppointmentDayStats(BaseModel):
+    day: date
+    total: int
+    by_status: dict[AppointmentStatus, int]
+
+
+class AppointmentStatsResponse(BaseModel):
+    company_id: int | None
+    offering_id: int | None
+    date_from: date
+    date_to: date
+    total: int
+    by_status: dict[AppointmentStatus, int]
+    days: list[AppointmentDayStats]
@@ -0,0 +1,20 @@
+from datetime import datetime
+
+from pydantic import BaseModel
+
+from backend.models.enums.change_entity import ChangeEntity
+from backend.models.enums.change_operation import ChangeOperation
+
+
+class ChangeResponse(BaseModel):
+    seq: int
+    entity: ChangeEntity
+    entity_id: int
+    operation: ChangeOperation
+    changed_at: datetime
+
+
+class ChangeFeedResponse(BaseModel):
+    changes: list[ChangeResponse]
+    last_seq: int
+    has_more: bool
@@ -18,3 +18,15 @@ class OfferingResponse(BaseModel):
     description: str
     is_open: bool
     created_date: datetime
+
+
+class TimeSlot(BaseModel):
+    start: datetime
+    end: datetime
+
+
+class AvailabilityResponse(BaseModel):
+    offering_id: int
+    slot_minutes: int
+    free_windows: list[TimeSlot]
+    slots: list[TimeSlot]
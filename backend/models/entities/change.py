@@ -0,0 +1,15 @@
+from dataclasses import dataclass
+from datetime import datetime
+
+from backend.models.enums.change_entity import ChangeEntity
+from backend.models.enums.change_operation import ChangeOperation
+
+
+@dataclass
+class Change:
+    seq: int
+    company_id: int
+    entity: ChangeEntity
+    entity_id: int
+    operation: ChangeOperation
+    changed_at: datetime
@@ -0,0 +1,13 @@
+from dataclasses import dataclass
+
+from backend.models.entities.appointment import Appointment
+
+
+@dataclass
+class IdempotencyKey:
+    company_id: int
+    key: str
+    request_hash: str
+    expires_at: int
+    appointment_id: int | None = None
+    appointment: Appointment | None = None
@@ -9,6 +9,7 @@ class Offering:
     description: str
     is_open: bool
     created_date: datetime
+    version: int = 1
 
     @staticmethod
     def from_row(row: tuple) -> "Offering":
@@ -18,4 +19,5 @@ class Offering:
             description=row[2],
             is_open=bool(row[3]),
             created_date=datetime.fromisoformat(row[4]),
+            version=row[5],
         )
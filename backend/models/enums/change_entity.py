@@ -0,0 +1,6 @@
+from enum import Enum
+
+
+class ChangeEntity(str, Enum):
+    APPOINTMENT = "appointment"
+    OFFERING = "offering"